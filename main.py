@@ -1,5 +1,6 @@
 from PyQt6.QtWidgets import QApplication
 import sys
+import multiprocessing
 
 from src.config import Config
 from src.game import Game
@@ -11,6 +12,8 @@ from views.menu import MenuView
 import i18n
 
 if __name__ == '__main__':
+    # Necessário para o pool de processos do HashMap no executável congelado (cx_Freeze)
+    multiprocessing.freeze_support()
     conf = Config()
     conf.load()
     app = QApplication(sys.argv)
@@ -51,6 +51,8 @@ class Config:
         self.set_default_game()
         self.set_default_svmg()
         self.set_default_steam()
+        self.set_default_hash()
+        self.set_default_store()
         
         self.configure_logger(self.get('CONSOLE', 'loglevel'))
         
@@ -71,7 +73,49 @@ class Config:
         self.ensure_config_field('SYNCAPI', 'host', 'svmgapi.marcosbrendon.com:3000')
         self.ensure_config_field('SYNCAPI', 'protocol', 'http')
         self.ensure_config_field('SYNCAPI', 'max_connections', '20')
-    
+        self.ensure_config_field('SYNCAPI', 'retries', '3')
+        self.ensure_config_field('SYNCAPI', 'backoff_factor', '0.5')
+        self.ensure_config_field('SYNCAPI', 'connect_timeout', '5')
+        self.ensure_config_field('SYNCAPI', 'read_timeout', '60')
+        # Arquivos menores que batch_threshold são enviados juntos em ZIPs de até batch_size bytes (0 desativa)
+        self.ensure_config_field('SYNCAPI', 'batch_threshold', str(256 * 1024))
+        self.ensure_config_field('SYNCAPI', 'batch_size', str(8 * 1024 * 1024))
+        # Arquivos modificados a partir de delta_min_size bytes trafegam só os blocos alterados (0 desativa)
+        self.ensure_config_field('SYNCAPI', 'delta_min_size', str(1024 * 1024))
+        self.ensure_config_field('SYNCAPI', 'delta_block_size', str(64 * 1024))
+        # compression = auto (zstd se o pacote opcional zstandard estiver instalado, senão gzip), zstd, gzip ou off; compression_skip lista extensões já comprimidas
+        self.ensure_config_field('SYNCAPI', 'compression', 'auto')
+        self.ensure_config_field('SYNCAPI', 'zstd_level', '3')
+        self.ensure_config_field('SYNCAPI', 'gzip_level', '6')
+        self.ensure_config_field('SYNCAPI', 'compression_skip', '.png,.jpg,.jpeg,.gif,.webp,.zip,.rar,.7z,.gz,.zst,.xz,.ogg,.mp3')
+        # engine = async usa um único event loop (requer aiohttp); threads usa um pool de threads
+        self.ensure_config_field('SYNCAPI', 'engine', 'threads')
+        self.ensure_config_field('SYNCAPI', 'async_connections', '100')
+        # Limite global de banda em bytes por segundo (0 = ilimitado)
+        self.ensure_config_field('SYNCAPI', 'rate_limit', '0')
+        # Ajusta o número de transferências simultâneas (até max_connections) pela vazão medida
+        self.ensure_config_field('SYNCAPI', 'adaptive_concurrency', 'true')
+        # Monta a atualização em uma nova geração da pasta e troca as duas de uma vez (a anterior é mantida)
+        self.ensure_config_field('SYNCAPI', 'staged_update', 'false')
+        # Novas tentativas de um download cujo conteúdo não confere com o hash remoto
+        self.ensure_config_field('SYNCAPI', 'verify_retries', '2')
+
+    def set_default_hash(self):
+        # 0 = usa todos os núcleos disponíveis
+        self.ensure_config_field('HASH', 'workers', '0')
+        self.ensure_config_field('HASH', 'large_file_threshold', str(8 * 1024 * 1024))
+        # Mantém o hashmap da modpack aberta atualizado em segundo plano (usa o watchdog se instalado)
+        self.ensure_config_field('HASH', 'watch', 'false')
+        self.ensure_config_field('HASH', 'watch_debounce', '0.5')
+        self.ensure_config_field('HASH', 'watch_interval', '2')
+
+    def set_default_store(self):
+        # Repositório compartilhado entre as modpacks, por hardlinks: uma alteração no lugar aparece em todas as
+        # modpacks, então include lista só formatos que os mods não reescrevem e exclude retira nomes específicos
+        self.ensure_config_field('STORE', 'enabled', 'true')
+        self.ensure_config_field('STORE', 'include', '*.dll,*.pdb,*.xnb,*.png,*.jpg,*.ogg,*.wav,*.mp3,*.tbin')
+        self.ensure_config_field('STORE', 'exclude', '*.json')
+
     def set_default_steam(self):
         STEAM_PATH = Steam.get_installation_path()
         if STEAM_PATH:
@@ -35,4 +35,5 @@ class Infos():
     ]
     about = i18n.t('about.text')
     limit_connections = 50
+    limit_async_connections = 500
     pass
\ No newline at end of file
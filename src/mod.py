@@ -1,118 +1,138 @@
-import os
-import json , re
+import os, sys
 
 from src.tools import (JasonAutoFix)
-# Classe personalizada para decodificação JSON
-class CustomJSONDecoder(json.JSONDecoder):
+
+def intern_value(value):
     """
-    Uma classe personalizada que estende json.JSONDecoder para fornecer decodificação JSON com modificações específicas.
+    Compartilha strings repetidas entre os mods (autores, UniqueIDs de dependências, chaves dos
+    manifestos) usando a tabela de internação do Python, para que centenas de mods não guardem
+    centenas de cópias do mesmo texto.
+
+    Args:
+        value: Uma string (internada) ou qualquer outro valor (devolvido sem alterações).
+
+    Returns:
+        O valor, com strings substituídas pela cópia compartilhada.
     """
-    def decode(self, s, _w=json.decoder.WHITESPACE.match):
-        """
-        Decodifica uma string JSON com a remoção de vírgulas inválidas.
-        
-        Args:
-            s (str): A string JSON para decodificar.
-        
-        Returns:
-            dict: O objeto Python correspondente aos dados JSON decodificados.
-        """
-        s = self._remove_comments(s)
-        s = self._remove_invalid_commas(s)
-        return super().decode(s, _w)
-    
-    def _remove_comments(self, s):
+    return sys.intern(value) if isinstance(value, str) else value
+
+class ManifestField:
+    """
+    Campo do manifest.json lido sob demanda: o manifesto só é carregado quando um campo é acessado.
+    """
+    def __init__(self, index, key, default):
         """
-        Remove comentários do formato /* ... */ de uma string JSON.
-        
         Args:
-            s (str): A string JSON contendo comentários.
-        
-        Returns:
-            str: A string JSON com comentários removidos.
+            index (int): Posição do campo na lista de valores do Mod.
+            key (str): Chave do campo no manifest.json.
+            default: Valor usado quando o manifesto não tem o campo.
         """
-        return re.sub(r'/\*.*?\*/', '', s, flags=re.DOTALL)
-    
-    def _remove_invalid_commas(self, s):
-        # Remove espaços desnecessários após vírgulas
-        s = re.sub(r',\s+', ',', s)
-        # Coloca as vírgulas após chaves e colchetes na próxima linha
-        s = re.sub(r',(?=\s*[\}\]])', ',\n', s)
-        # Remove vírgulas extras dentro de objetos
-        s = re.sub(r',(\s*\})', r'\1', s)
-        # Remove vírgulas extras após o último elemento
-        s = re.sub(r',(\s*[\}\]])', r'\1', s)
-        return s
+        self.index = index
+        self.key = key
+        self.default = default
+        self.attribute = None
+
+    def __set_name__(self, owner, name):
+        self.attribute = name
+
+    def __get__(self, mod, owner=None):
+        if mod is None:
+            return self
+        if mod._values is None:
+            mod._load()
+        return mod._values[self.index]
+
+    def __set__(self, mod, value):
+        if mod._values is None:
+            mod._load()
+        mod._values[self.index] = value
 
 # Classe que representa um mod
 class Mod:
     """
     Uma classe que representa um mod de jogo e lida com as informações relacionadas ao mod.
+
+    Os campos do manifesto são lidos apenas no primeiro acesso; listar mods pelo nome da pasta não faz I/O.
     """
-    def __init__(self, mod_folder_path, base_mods_directory) -> None:
+    name = ManifestField(0, "Name", "")
+    author = ManifestField(1, "Author", "")
+    version = ManifestField(2, "Version", "")
+    description = ManifestField(3, "Description", "")
+    unique_id = ManifestField(4, "UniqueID", "")
+    entry_dll = ManifestField(5, "EntryDll", "")
+    minimum_api_version = ManifestField(6, "MinimumApiVersion", "")
+    update_keys = ManifestField(7, "UpdateKeys", [])
+    dependencies = ManifestField(8, "Dependencies", [])
+    FIELDS = [name, author, version, description, unique_id, entry_dll, minimum_api_version, update_keys, dependencies]
+    INTERNED_FIELDS = {"Author", "UniqueID"}
+
+    __slots__ = ("mod_folder_path", "manifest_path", "base_mods_directory", "parent_folder_name", "_source", "_values")
+
+    def __init__(self, mod_folder_path, base_mods_directory, manifest_data=None) -> None:
         """
-        Inicializa um objeto Mod com informações padrão e carrega informações do arquivo "manifest.json".
-        
+        Inicializa um objeto Mod. O arquivo "manifest.json" só é lido quando um de seus campos for acessado.
+
         Args:
             mod_folder_path (str): O caminho para a pasta do mod.
             base_mods_directory (str): O diretório base onde os mods estão localizados.
+            manifest_data (dict): Dados do manifesto já conhecidos (ex.: do ModCatalog); evita ler o arquivo.
         """
         self.mod_folder_path = mod_folder_path
         self.manifest_path = os.path.join(mod_folder_path, 'manifest.json')
-        self.name = ""
-        self.author = ""
-        self.version = ""
-        self.description = ""
-        self.unique_id = ""
-        self.entry_dll = ""
-        self.minimum_api_version = ""
-        self.update_keys = []
-        self.dependencies = []
-
         self.base_mods_directory = base_mods_directory
         self.parent_folder_name = os.path.basename(mod_folder_path)
-        # Carrega as informações do mod a partir do arquivo "manifest.json"
-        self.load_manifest()
-    
+        self._source = manifest_data  # Manifesto ainda não aplicado
+        self._values = None  # Valores dos campos, na ordem de FIELDS, depois de carregados
+
+    def _load(self):
+        """
+        Carrega os campos a partir dos dados recebidos ou do arquivo "manifest.json".
+        """
+        source, self._source = self._source, None
+        if source is not None:
+            self.apply_manifest(source)
+        else:
+            self.load_manifest()
+
     def load_manifest(self):
         """
         Carrega informações do arquivo "manifest.json" e popula os atributos do objeto Mod.
         """
-        if os.path.exists(self.manifest_path):
-            manifest_data = JasonAutoFix.load(self.manifest_path)
-            
-            # Extrai informações do arquivo JSON carregado
-            self.name = manifest_data.get("Name", "")
-            self.author = manifest_data.get("Author", "")
-            self.version = manifest_data.get("Version", "")
-            self.description = manifest_data.get("Description", "")
-            self.unique_id = manifest_data.get("UniqueID", "")
-            self.entry_dll = manifest_data.get("EntryDll", "")
-            self.minimum_api_version = manifest_data.get("MinimumApiVersion", "")
-            self.update_keys = manifest_data.get("UpdateKeys", [])
-            self.dependencies = manifest_data.get("Dependencies", [])
-            
-            # Cria instâncias da classe Mod para cada dependência
-            for dependency in self.dependencies:
-                if "UniqueId" in dependency:
-                    dependency["UniqueID"] = dependency["UniqueId"]
-                    del dependency["UniqueId"]
+        manifest_data = JasonAutoFix.load(self.manifest_path) if os.path.exists(self.manifest_path) else {}
+        self.apply_manifest(manifest_data)
+
+    def apply_manifest(self, manifest_data):
+        """
+        Popula os atributos do objeto Mod a partir dos dados de um manifest.json.
+
+        Args:
+            manifest_data (dict): O conteúdo do manifest.json.
+        """
+        manifest_data = manifest_data or {}
+        values = []
+        for field in Mod.FIELDS:
+            value = manifest_data.get(field.key, field.default)
+            if field.key in Mod.INTERNED_FIELDS:
+                value = intern_value(value)
+            elif value is field.default and isinstance(value, list):
+                value = []  # Cada mod tem sua própria lista
+            values.append(value)
+
+        # Normaliza "UniqueId" e compartilha as chaves e os IDs repetidos entre os mods
+        dependencies = values[Mod.dependencies.index]
+        if isinstance(dependencies, list):
+            values[Mod.dependencies.index] = [
+                {intern_value("UniqueID" if key == "UniqueId" else key): intern_value(value) for key, value in dependency.items()}
+                if isinstance(dependency, dict) else dependency
+                for dependency in dependencies
+            ]
+        self._values = values
 
     def to_dict(self):
         """
         Converte as informações do objeto Mod em um dicionário.
-        
+
         Returns:
             dict: Um dicionário contendo as informações do objeto Mod.
         """
-        return {
-            "name": self.name,
-            "author": self.author,
-            "version": self.version,
-            "description": self.description,
-            "unique_id": self.unique_id,
-            "entry_dll": self.entry_dll,
-            "minimum_api_version": self.minimum_api_version,
-            "update_keys": self.update_keys,
-            "dependencies": self.dependencies
-        }
\ No newline at end of file
+        return {field.attribute: getattr(self, field.attribute) for field in Mod.FIELDS}
@@ -1,12 +1,12 @@
 from typing import List
-import concurrent.futures, base64, os, json, shutil, uuid, secrets, re
-import threading
+import concurrent.futures, asyncio, base64, os, json, shutil, uuid, secrets, re, sqlite3
+import threading, time
 
 from pathlib import Path
 from src.mod import Mod
 from src.config import Config
 from src.infos import Infos
-from src.tools import JasonAutoFix,HashMap,ModpackApi,Extractor
+from src.tools import JasonAutoFix,HashMap,ModpackApi,AsyncModpackApi,ProgressBridge,RemoteIndex,Extractor,Digest,Delta,ContentStore,Compression,SyncPlan,TokenBucket,TransferScheduler,ThroughputHistory,Watcher,ModCatalog,DependencyResolver
 import logging
 
 from tqdm import tqdm
@@ -18,6 +18,14 @@ class Modpack(QObject):
     uploadSignal = pyqtSignal(dict)
     downloadSignal = pyqtSignal(dict)
     """Classe para representar e gerenciar modpacks do jogo."""
+
+    REQUIRED_FOLDERS = ("mods_enabled", "mods_disabled")
+    # Gerações da pasta ficam ao lado dela, como pastas ocultas ignoradas na listagem das modpacks
+    GENERATION_NEXT = "next"
+    GENERATION_PREVIOUS = "previous"
+    GENERATION_SWAP = "swap"  # Nome temporário usado ao trocar a pasta pela geração anterior
+    # Arquivos fora do hashmap que acompanham a pasta para a nova geração
+    GENERATION_FILES = (HashMap.CACHE_FILE_NAME, HashMap.CATALOG_FILE_NAME)
     
     def __init__(self, name, image="", _uuid="", token="", version="0.0.0", base_directory=""):
         """Inicializa uma instância da classe Modpack."""
@@ -39,6 +47,7 @@ class Modpack(QObject):
         self.token   = token
         self.version = version
         
+        self.base_directory = base_directory
         self.folder_path = os.path.join(base_directory, 'modpacks', _uuid)
 
         self.mods_enabled_path = os.path.join(self.folder_path, 'mods_enabled')
@@ -48,6 +57,8 @@ class Modpack(QObject):
         os.makedirs(self.mods_enabled_path, exist_ok=True)
         os.makedirs(self.mods_disabled_path, exist_ok=True)
         os.makedirs(self.saves_path, exist_ok=True)
+        self.catalog = ModCatalog(self.folder_path)
+        self.resolver = DependencyResolver()
 
         # Load default image as base64 if no image is provided
         if not self.image:
@@ -61,10 +72,9 @@ class Modpack(QObject):
             self.save()
         if f_save:
             self.save()
-        conf = Config()
-        server_host = f"{conf.get('SYNCAPI','protocol')}://{conf.get('SYNCAPI','host')}"
-        self.api = ModpackApi(server_host)
+        self.api = self.create_api()
         self.is_owner = self.api.is_owner(self._uuid,self.token)
+        self.watcher = None
         
     def to_dict(self):
         """Converte a modpack em um dicionário."""
@@ -79,6 +89,319 @@ class Modpack(QObject):
     def mods_folder(self):
         return self.mods_enabled_path
 
+    @staticmethod
+    def get_max_connections():
+        """
+        Lê o número de transferências simultâneas do settings.ini, limitado por Infos.limit_connections.
+
+        Returns:
+            int: O número máximo de conexões.
+        """
+        try:
+            max_connections = int(Config().get('SYNCAPI', 'max_connections'))
+        except (TypeError, ValueError):
+            return 25
+        return max(1, min(max_connections, Infos.limit_connections))
+
+    @staticmethod
+    def create_scheduler():
+        """
+        Cria o executor das transferências, com fila de prioridade e, se [SYNCAPI] adaptive_concurrency
+        estiver ativo, concorrência ajustada pela vazão até max_connections.
+
+        Returns:
+            TransferScheduler: O executor das transferências.
+        """
+        adaptive = Config().get('SYNCAPI', 'adaptive_concurrency') != 'false'
+        return TransferScheduler(Modpack.get_max_connections(), adaptive)
+
+    @staticmethod
+    def get_batch_options():
+        """
+        Lê as opções de envio em lote do settings.ini.
+
+        Returns:
+            tuple: (batch_threshold, batch_size) em bytes; batch_threshold 0 desativa os lotes.
+        """
+        conf = Config()
+        try:
+            return int(conf.get('SYNCAPI', 'batch_threshold')), int(conf.get('SYNCAPI', 'batch_size'))
+        except (TypeError, ValueError):
+            return 256 * 1024, 8 * 1024 * 1024
+
+    @staticmethod
+    def get_delta_options():
+        """
+        Lê as opções de transferência delta do settings.ini.
+
+        Returns:
+            tuple: (delta_min_size, delta_block_size) em bytes; delta_min_size 0 desativa o delta.
+        """
+        conf = Config()
+        try:
+            return int(conf.get('SYNCAPI', 'delta_min_size')), int(conf.get('SYNCAPI', 'delta_block_size'))
+        except (TypeError, ValueError):
+            return Delta.MIN_SIZE, Delta.BLOCK_SIZE
+
+    @staticmethod
+    def get_verify_retries():
+        """
+        Lê quantas vezes um download corrompido (hash diferente do remoto) é repetido ([SYNCAPI] verify_retries).
+        """
+        try:
+            return max(0, int(Config().get('SYNCAPI', 'verify_retries')))
+        except (TypeError, ValueError):
+            return 2
+
+    @staticmethod
+    def group_batches(files, batch_threshold, batch_size):
+        """
+        Separa os arquivos pequenos em lotes para envio compactado.
+
+        Args:
+            files (list[Path]): Arquivos a serem enviados.
+            batch_threshold (int): Tamanho abaixo do qual o arquivo vai para um lote.
+            batch_size (int): Soma máxima dos tamanhos dos arquivos de um lote.
+
+        Returns:
+            tuple: (lista de lotes com mais de um arquivo, lista de arquivos enviados individualmente).
+        """
+        batches = []
+        single = []
+        current = []
+        current_size = 0
+        for file in sorted(files):
+            size = file.stat().st_size
+            if not batch_threshold or size >= batch_threshold:
+                single.append(file)
+                continue
+            if current and current_size + size > batch_size:
+                batches.append(current)
+                current, current_size = [], 0
+            current.append(file)
+            current_size += size
+        if current:
+            batches.append(current)
+
+        # Um lote com um único arquivo não compensa o ZIP
+        single.extend(batch[0] for batch in batches if len(batch) == 1)
+        return [batch for batch in batches if len(batch) > 1], single
+
+    @staticmethod
+    def get_compression():
+        """
+        Monta a política de compressão das transferências a partir do settings.ini.
+
+        Returns:
+            Compression: A política de compressão.
+        """
+        conf = Config()
+        mode = (conf.get('SYNCAPI', 'compression') or 'auto').lower()
+        encodings = {'auto': None, 'off': [], 'zstd': [Compression.ZSTD], 'gzip': [Compression.GZIP]}.get(mode)
+        try:
+            levels = {Compression.ZSTD: int(conf.get('SYNCAPI', 'zstd_level')), Compression.GZIP: int(conf.get('SYNCAPI', 'gzip_level'))}
+        except (TypeError, ValueError):
+            levels = None
+        skip = conf.get('SYNCAPI', 'compression_skip')
+        skip_extensions = [extension.strip() for extension in skip.split(',') if extension.strip()] if skip is not None else None
+        return Compression(encodings, levels, skip_extensions)
+
+    def create_api(self):
+        """
+        Cria o cliente da API de sincronização com o pool de conexões, tentativas e timeouts do settings.ini.
+
+        Returns:
+            ModpackApi: O cliente da API.
+        """
+        conf = Config()
+        server_host = f"{conf.get('SYNCAPI','protocol')}://{conf.get('SYNCAPI','host')}"
+        try:
+            retries = int(conf.get('SYNCAPI', 'retries'))
+            backoff_factor = float(conf.get('SYNCAPI', 'backoff_factor'))
+            timeout = (float(conf.get('SYNCAPI', 'connect_timeout')), float(conf.get('SYNCAPI', 'read_timeout')))
+        except (TypeError, ValueError):
+            retries, backoff_factor, timeout = 3, 0.5, (5, 60)
+        try:
+            rate_limit = max(0, int(conf.get('SYNCAPI', 'rate_limit')))
+        except (TypeError, ValueError):
+            rate_limit = 0
+        return ModpackApi(server_host, Modpack.get_max_connections(), retries, backoff_factor, timeout, Modpack.get_compression(), TokenBucket(rate_limit))
+
+    @staticmethod
+    def use_staged_update():
+        """
+        Verifica se as atualizações devem ser montadas em uma nova geração da pasta ([SYNCAPI] staged_update).
+        """
+        return Config().get('SYNCAPI', 'staged_update') == 'true'
+
+    @staticmethod
+    def use_async_engine():
+        """
+        Verifica se as transferências devem usar o motor assíncrono ([SYNCAPI] engine = async).
+
+        Returns:
+            bool: True se o motor assíncrono foi escolhido e o aiohttp está instalado.
+        """
+        if Config().get('SYNCAPI', 'engine') != 'async':
+            return False
+        if not AsyncModpackApi.is_available():
+            logging.getLogger('Modpack').warning("SYNCAPI engine is 'async' but aiohttp is not installed, using threads")
+            return False
+        return True
+
+    def create_async_api(self):
+        """
+        Cria o cliente assíncrono da API com as mesmas tentativas e timeouts do cliente síncrono.
+
+        Returns:
+            AsyncModpackApi: O cliente assíncrono, a ser usado com "async with".
+        """
+        conf = Config()
+        try:
+            max_connections = int(conf.get('SYNCAPI', 'async_connections'))
+        except (TypeError, ValueError):
+            max_connections = 100
+        max_connections = max(1, min(max_connections, Infos.limit_async_connections))
+        return AsyncModpackApi(self.api.base_url, max_connections, self.api.retries, self.api.backoff_factor, self.api.timeout, self.api.compression, self.api.bucket)
+
+    def create_hashmap(self, load_existing=False, algorithm=None, files=None, show_progress=True, persist=True):
+        """
+        Cria o HashMap da modpack usando as opções de paralelismo da seção [HASH] do settings.ini.
+
+        Args:
+            load_existing (bool): Carrega o hashmap.json existente em vez de recalcular.
+            algorithm (str): Algoritmo de hash (ver Digest) negociado com o servidor.
+            files (dict): Hashes já conhecidos; quando informado, a pasta não é varrida.
+            show_progress (bool): Exibe a barra de progresso no console.
+            persist (bool): Grava o hashmap.json e o cache de hashes depois de varrer a pasta.
+
+        Returns:
+            HashMap: O mapa de hashes da pasta da modpack.
+        """
+        conf = Config()
+        try:
+            workers = int(conf.get('HASH', 'workers'))
+            large_file_threshold = int(conf.get('HASH', 'large_file_threshold'))
+        except (TypeError, ValueError):
+            workers = 0
+            large_file_threshold = None
+        return HashMap(self.folder_path, load_existing, show_progress, workers=workers, large_file_threshold=large_file_threshold, algorithm=algorithm, files=files, persist=persist)
+
+    def create_store(self, algorithm):
+        """
+        Cria o acesso ao repositório de conteúdo compartilhado entre as modpacks ([STORE] do settings.ini).
+
+        Args:
+            algorithm (str): Algoritmo de hash (ver Digest) dos endereços do repositório.
+
+        Returns:
+            ContentStore: O repositório, ou None se estiver desativado.
+        """
+        conf = Config()
+        if conf.get('STORE', 'enabled') == 'false':
+            return None
+        def patterns(key):
+            value = conf.get('STORE', key)
+            return [pattern.strip().lower() for pattern in value.split(',') if pattern.strip()] if value is not None else None
+
+        return ContentStore(os.path.join(self.base_directory, 'store'), algorithm, patterns('exclude'), patterns('include'))
+
+    def start_watcher(self):
+        """
+        Começa a manter o hashmap da modpack atualizado em segundo plano, se [HASH] watch estiver ativo.
+        Enquanto o watcher estiver rodando, a sincronização usa o hashmap dele em vez de varrer a pasta.
+        """
+        conf = Config()
+        if self.watcher is not None or conf.get('HASH', 'watch') != 'true':
+            return
+        try:
+            workers = int(conf.get('HASH', 'workers'))
+            debounce = float(conf.get('HASH', 'watch_debounce'))
+            poll_interval = float(conf.get('HASH', 'watch_interval'))
+        except (TypeError, ValueError):
+            workers, debounce, poll_interval = 0, 0.5, 2.0
+        self.watcher = Watcher(self.folder_path, self.local_algorithm(), workers, debounce, poll_interval)
+        self.watcher.start()
+
+    def stop_watcher(self):
+        """
+        Para o watcher da modpack, gravando as mudanças ainda pendentes.
+        """
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+    def watched_hashmap(self, algorithm):
+        """
+        Retorna o hashmap mantido pelo watcher, já com as mudanças pendentes processadas.
+
+        Args:
+            algorithm (str): Algoritmo de hash negociado com o servidor.
+
+        Returns:
+            dict: {caminho relativo: hash}, ou None se o watcher não estiver rodando.
+        """
+        if getattr(self, 'watcher', None) is None:
+            return None
+        return self.watcher.snapshot(algorithm)
+
+    def local_algorithm(self):
+        """
+        Retorna o algoritmo de hash do hashmap.json local, ou o padrão se ele ainda não existir.
+        """
+        try:
+            with open(os.path.join(self.folder_path, HashMap.HASHMAP_FILE_NAME), 'r') as file:
+                return HashMap.parse_document(json.load(file))[0]
+        except (OSError, ValueError):
+            return Digest.DEFAULT
+
+    def throughput_history(self):
+        """
+        Retorna o histórico de vazão das sincronizações, compartilhado entre as modpacks.
+        """
+        return ThroughputHistory(os.path.join(self.base_directory, 'throughput.json'))
+
+    @staticmethod
+    def total_size(folder, relative_paths):
+        """
+        Soma o tamanho dos arquivos de uma pasta, ignorando os que não existem.
+
+        Args:
+            folder (str): A pasta base.
+            relative_paths (list[str]): Caminhos relativos com '/' como separador.
+
+        Returns:
+            int: O total em bytes.
+        """
+        total = 0
+        for relative_path in relative_paths:
+            try:
+                total += os.path.getsize(os.path.join(folder, relative_path.replace('/', os.path.sep)))
+            except OSError:
+                continue
+        return total
+
+    def store_files(self, digests, algorithm):
+        """
+        Liga os arquivos dos mods ao repositório compartilhado, liberando as cópias duplicadas
+        entre modpacks. Saves e arquivos da raiz da modpack ficam de fora.
+
+        Args:
+            digests (dict): {caminho relativo: hash} dos arquivos a guardar.
+            algorithm (str): Algoritmo dos hashes.
+        """
+        store = self.create_store(algorithm)
+        if store is None:
+            return
+        stored = {}
+        for relative_path, digest in digests.items():
+            if digest is None or relative_path.split('/', 1)[0] not in ('mods_enabled', 'mods_disabled'):
+                continue
+            if store.add(os.path.join(self.folder_path, relative_path.replace('/', os.path.sep)), digest):
+                stored[relative_path] = digest
+        # Arquivos trocados por links mudam de inode: o cache de hashes é atualizado sem reler o conteúdo
+        self.create_hashmap(algorithm=algorithm, files={}, show_progress=False).remember(stored)
+
     def save(self):
         """
         Salva os dados da modpack em um arquivo JSON no diretório da modpack.
@@ -89,6 +412,46 @@ class Modpack(QObject):
         with open(filename, 'w') as json_file:
             json.dump(modpack_data, json_file, indent=4)
 
+    def set_enabled(self, mods):
+        """
+        Habilita e desabilita vários mods de uma vez, gravando o modpack.json uma única vez no final.
+
+        A operação é atômica: se uma das renomeações (ou a gravação) falhar, as pastas já movidas
+        voltam para onde estavam e o erro é repassado. Mods que já estão no estado pedido ou que não
+        existem são ignorados.
+
+        Args:
+            mods (dict): {nome da pasta do mod: True para habilitar, False para desabilitar}.
+
+        Returns:
+            list[str]: Os mods que mudaram de pasta. Se nenhum mudou, o modpack.json não é gravado.
+        """
+        moves = []
+        for mod_name, enabled in mods.items():
+            source_folder, destination_folder = ((self.mods_disabled_path, self.mods_enabled_path) if enabled
+                                                 else (self.mods_enabled_path, self.mods_disabled_path))
+            source_path = os.path.join(source_folder, mod_name)
+            if os.path.exists(source_path):
+                moves.append((mod_name, source_path, os.path.join(destination_folder, mod_name)))
+        if not moves:
+            return []
+
+        done = []
+        try:
+            for _, source_path, destination_path in moves:
+                os.rename(source_path, destination_path)
+                done.append((source_path, destination_path))
+            self.save()
+        except OSError:
+            # Desfaz na ordem inversa para deixar as duas pastas como estavam antes da chamada
+            for source_path, destination_path in reversed(done):
+                try:
+                    os.rename(destination_path, source_path)
+                except OSError as e:
+                    self.logger.error(f"Could not restore {source_path}: {e}")
+            raise
+        return [mod_name for mod_name, _, _ in moves]
+
     def enable_mod(self, mod_name):
         """
         Habilita um mod, movendo-o da pasta 'mods_disabled' para 'mods_enabled'.
@@ -96,29 +459,22 @@ class Modpack(QObject):
         Args:
             mod_name (str): Nome do mod a ser habilitado.
         """
-        source_path = os.path.join(self.mods_disabled_path, mod_name)
-        destination_path = os.path.join(self.mods_enabled_path, mod_name)
-        
-        if os.path.exists(source_path):
-            os.rename(source_path, destination_path)
-            self.save()
+        self.set_enabled({mod_name: True})
 
     def enable_all_mods(self):
         """
         Habilita todos os mods desabilitados, movendo-os para a pasta 'mods_enabled'.
         """
-        for mod in self.list_disabled_mods():
-            self.enable_mod(mod)
+        self.set_enabled(dict.fromkeys(self.list_disabled_mods(), True))
 
     def disable_all_mods(self):
         """
         Desabilita todos os mods habilitados, movendo-os para a pasta 'mods_disabled'.
         """
-        for mod in self.list_enabled_mods():
-            self.disable_mod(mod)
+        self.set_enabled(dict.fromkeys(self.list_enabled_mods(), False))
 
     def delete_mod(self, mod:Mod):
-        shutil.rmtree(mod.mod_folder_path)
+        ContentStore.remove_tree(mod.mod_folder_path)
     
     def disable_mod(self, mod_name):
         """
@@ -128,11 +484,7 @@ class Modpack(QObject):
             mod_name (str): Nome do mod a ser desabilitado.
         """
         try:
-            source_path = os.path.join(self.mods_enabled_path, mod_name)
-            destination_path = os.path.join(self.mods_disabled_path, mod_name)
-            if os.path.exists(source_path):
-                os.rename(source_path, destination_path)
-                self.save()
+            self.set_enabled({mod_name: False})
         except:
             return "FUDEO"
 
@@ -143,8 +495,7 @@ class Modpack(QObject):
         Args:
             mods_to_enable (list[str]): Lista de nomes de mods a serem habilitados.
         """
-        for mod in mods_to_enable:
-            self.enable_mod(mod)
+        self.set_enabled(dict.fromkeys(mods_to_enable, True))
 
     def list_enabled_mods(self):
         """
@@ -197,30 +548,38 @@ class Modpack(QObject):
         Args:
             mods_to_disable (list[str]): Lista de nomes de mods a serem desabilitados.
         """
-        for mod in mods_to_disable:
-            self.disable_mod(mod)
+        self.set_enabled(dict.fromkeys(mods_to_disable, False))
+
+    def load_mods(self, mods_path, enabled):
+        """
+        Cria os objetos Mod de uma pasta de mods a partir do catálogo, que só relê os manifestos alterados.
+
+        Args:
+            mods_path (str): A pasta dos mods (mods_enabled ou mods_disabled).
+            enabled (bool): Se a pasta é a dos mods habilitados.
+
+        Returns:
+            list[Mod]: Os mods da pasta.
+        """
+        try:
+            entries = self.catalog.list_mods(mods_path, enabled)
+        except sqlite3.Error as e:
+            self.logger.warning(f"Mod catalog unavailable, reading manifests directly: {e}")
+            folders = os.listdir(mods_path) if os.path.exists(mods_path) else []
+            return [Mod(os.path.join(mods_path, mod_name), mods_path) for mod_name in folders]
+        return [Mod(os.path.join(mods_path, mod_name), mods_path, manifest_data) for mod_name, manifest_data in entries]
 
     def get_enabled_mods(self):
         """
         Retorna uma lista de objetos da classe Mod para os mods habilitados.
         """
-        enabled_mods = []
-        for mod_name in self.list_enabled_mods():
-            mod_folder_path = os.path.join(self.mods_enabled_path, mod_name)
-            mod = Mod(mod_folder_path, self.mods_enabled_path)
-            enabled_mods.append(mod)
-        return enabled_mods
+        return self.load_mods(self.mods_enabled_path, True)
     
     def get_disabled_mods(self):
         """
         Retorna uma lista de objetos da classe Mod para os mods desabilitados.
         """
-        disabled_mods = []
-        for mod_name in self.list_disabled_mods():
-            mod_folder_path = os.path.join(self.mods_disabled_path, mod_name)
-            mod = Mod(mod_folder_path, self.mods_disabled_path)
-            disabled_mods.append(mod)
-        return disabled_mods
+        return self.load_mods(self.mods_disabled_path, False)
 
     def rename_modpack(self, new_name):
         """
@@ -252,15 +611,32 @@ class Modpack(QObject):
         mods = self.find_installed_mods(temp_dir)
         destination_folder = self.mods_enabled_path
         
+        installed = []
         for mod_path in mods:
             mod_name = os.path.basename(mod_path)
             mod_destination = os.path.join(destination_folder, mod_name)
             
             if not os.path.exists(mod_destination):
                 shutil.move(mod_path, mod_destination)
+                installed.append(mod_destination)
             else:
                 self.logger.info(f"The mod '{mod_name}' is already installed.")
         
+        # Mods que outra modpack já tem viram links para o repositório compartilhado
+        algorithm = self.local_algorithm()
+        store = self.create_store(algorithm)
+        if installed and store is not None:
+            digests = {}
+            for mod_destination in installed:
+                for root, _, files in os.walk(mod_destination):
+                    for file_name in files:
+                        file_path = os.path.join(root, file_name)
+                        if not store.accepts(file_path):
+                            continue
+                        relative_path = os.path.relpath(file_path, self.folder_path).replace('\\', '/')
+                        digests[relative_path] = HashMap.hash_file(file_path, algorithm)
+            self.store_files(digests, algorithm)
+        
         # Remover a pasta pai onde os mods estavam originalmente
         try:
             shutil.rmtree(temp_dir)
@@ -306,57 +682,144 @@ class Modpack(QObject):
         return installed_mods
     #auto instalador de mods zip e rar --------------------------
     
-    def mod_dependencies_complete(self, mod: Mod):
+    def compute_differences(self, remote_root=None, hash_json=None, dry_run=False):
+        """
+        Compara a pasta local com a remota, trocando primeiro os hashes das pastas (árvore de Merkle)
+        e descendo apenas nas subárvores que diferem. Se o servidor não suportar a árvore,
+        compara com o hashmap completo.
+
+        Args:
+            remote_root (dict): Nó raiz já obtido de getModpackHashTree, se houver.
+            hash_json (dict): Hashmap já obtido de getModpackHashMap, se houver.
+            dry_run (bool): Varre a pasta sem gravar o hashmap.json nem o cache de hashes.
+
+        Returns:
+            tuple: (algoritmo, HashMap local, {caminho relativo: (hash local, hash remoto)}).
+        """
+        remote = RemoteIndex.open(self.api, self._uuid, remote_root, hash_json)
+        watched = self.watched_hashmap(remote.algorithm)
+        if watched is not None:
+            local = self.create_hashmap(algorithm=remote.algorithm, files=watched, show_progress=False)
+        else:
+            local = self.create_hashmap(algorithm=remote.algorithm, persist=not dry_run)
+        differences = remote.diff("", local.hashmap)
+        if remote.uses_tree:
+            self.logger.info(f"Merkle diff visited {len(local.parent_changes)} folders, {len(differences)} files differ")
+        return remote.algorithm, local, differences
+
+    def check_dependencies(self, mods_enabled=None):
+        """Verifica as dependências de todos os mods habilitados de uma só vez.
+
+        Parameters
+        ----------
+            mods_enabled (list[Mod]): Os mods habilitados, se já carregados.
+
+        Returns
+        -------
+            DependencyReport: Dependências ausentes, versões abaixo da mínima e ciclos, por pasta de mod.
+        """
+        if mods_enabled is None:
+            mods_enabled = self.get_enabled_mods()
+        return self.resolver.resolve(mods_enabled)
+
+    def mod_dependencies_complete(self, mod: Mod, report=None):
         """Verifica se as dependências do mod estão completas na lista de mods da modpack.
 
         Parameters
         ----------
             mod (Mod): O objeto Mod cujas dependências devem ser verificadas.
+            report (DependencyReport): Resultado de check_dependencies, para não verificar a modpack de novo.
 
         Returns
         -------
             bool: True se todas as dependências estiverem completas, False caso contrário.
         """
-        mods_enabled = self.get_enabled_mods()
-        missing_dependencies = []
-        
-        for dependency in mod.dependencies:
-            dependency_unique_id = dependency.get("UniqueID")
-            is_required = dependency.get("IsRequired", False)
-            
-            if dependency_unique_id:
-                found_dependency = False
-                for _mod in mods_enabled:
-                    if _mod.unique_id.lower() == dependency_unique_id.lower():
-                        found_dependency = True
-                        break
-                
-                if is_required and not found_dependency:
-                    missing_dependencies.append(dependency_unique_id)
-        
-        if missing_dependencies:
-            self.logger.error(f"Missing dependencies for mod '{mod.name}': {', '.join(missing_dependencies)}")
+        if report is None:
+            report = self.check_dependencies()
+        problems = report.problems(mod.parent_folder_name)
+        if problems:
+            self.logger.error(f"Dependency problems for mod '{mod.name}': {', '.join(problems)}")
             return False
             
         return True
 
-    def sync(self):
+    def sync(self, dry_run=False):
         """Mateus documentar**
+
+        Args:
+            dry_run (bool): Apenas simula o envio (ver dry_run_sync); nada é enviado nem criado no servidor.
+
+        Returns:
+            dict: O resumo da simulação, se dry_run; senão None.
         """
+        if dry_run:
+            return self.dry_run_sync()
         info = self.api.get_modpack_info(self._uuid)
         # se a modpack não existir crie ela no servidor
         if info['status'] == 404:
             self.api.create_modpack_directory(self._uuid, self.token)
             with open(Path(self.folder_path) / "modpack.json", 'rb') as file:
                 self.api.upload_file(self._uuid, self.token, "modpack.json", file)
-            self.send_all_files()
+        if Modpack.use_async_engine():
+            asyncio.run(self.send_all_files_async())
         else:
             self.send_all_files()
     
+    @staticmethod
+    def split_units(files, units):
+        """
+        Distribui um hashmap já calculado pelas unidades de sincronização de list_sync_units.
+
+        Args:
+            files (dict): {caminho relativo: hash}.
+            units (list[tuple]): Lista de (pasta relativa, recursivo).
+
+        Returns:
+            dict: {(pasta relativa, recursivo): {caminho relativo: hash}}; os arquivos da raiz ficam em ("", False).
+        """
+        recursive_units = {unit for unit, recursive in units if recursive}
+        split = {}
+        for relative_path, digest in files.items():
+            parts = relative_path.split('/')
+            key = ('/'.join(parts[:-1]), False)
+            for depth in range(1, len(parts)):
+                candidate = '/'.join(parts[:depth])
+                if candidate in recursive_units:
+                    key = (candidate, True)
+                    break
+            split.setdefault(key, {})[relative_path] = digest
+        return split
+
+    def list_sync_units(self, remote:RemoteIndex):
+        """
+        Divide a modpack em unidades de sincronização: cada pasta de mod (ou de save) é uma unidade
+        recursiva, e os arquivos soltos de cada pasta de primeiro nível formam uma unidade própria.
+
+        Args:
+            remote (RemoteIndex): Índice remoto, para incluir pastas que só existem no servidor.
+
+        Returns:
+            list[tuple]: Lista de (pasta relativa, recursivo).
+        """
+        folder = Path(self.folder_path)
+        local_top = {entry.name for entry in folder.iterdir() if entry.is_dir()}
+        units = []
+        for top in sorted(local_top | remote.directory_names("")):
+            units.append((top, False))
+            top_path = folder / top
+            local_children = {entry.name for entry in top_path.iterdir() if entry.is_dir()} if top_path.is_dir() else set()
+            for child in sorted(local_children | remote.directory_names(top)):
+                units.append((f"{top}/{child}", True))
+        return units
+
     def send_all_files(self):
-        """Mateus documentar**
         """
-        
+        Envia para o servidor as mudanças da pasta local em um pipeline: cada unidade (pasta de mod)
+        é mapeada, comparada com o servidor e tem seus envios e remoções enfileirados assim que
+        termina, enquanto as próximas unidades ainda estão sendo mapeadas.
+
+        O uploadSignal informa, além do progresso geral, o andamento de cada etapa em "stages".
+        """
         self.uploadSignal.emit({
             "runing": 1,
             "progress": 0,
@@ -364,103 +827,164 @@ class Modpack(QObject):
             "done" : False
         })
         
-        HashMap(self.folder_path)
-        info = self.api.get_modpack_info(self._uuid)
+        remote = RemoteIndex.open(self.api, self._uuid)
+        local = self.create_hashmap(algorithm=remote.algorithm, files={}, show_progress=False)
+        watched = self.watched_hashmap(remote.algorithm)
         folder = Path(self.folder_path)
+        batch_threshold, batch_size = Modpack.get_batch_options()
+        
+        delta_min_size, delta_block_size = Modpack.get_delta_options()
         
-        def _upload_file(mod_file:Path):
+        def _upload_file(mod_file:Path, remote_hash=None):
             if mod_file.is_file():
+                relative_path = str(mod_file.relative_to(self.folder_path)).replace('\\', '/')
+                if remote_hash is not None and delta_min_size and mod_file.stat().st_size >= delta_min_size:
+                    # Arquivo grande que já existe no servidor: tenta enviar só os blocos alterados
+                    res = self.api.upload_file_delta(self._uuid, self.token, relative_path, str(mod_file), remote.algorithm, delta_block_size, batch_size)
+                    if res is not None:
+                        return res
                 with open(mod_file, 'rb') as file:
-                    relative_path = mod_file.relative_to(self.folder_path)
-                    return self.api.upload_file(self._uuid, self.token, str(relative_path).replace('\\', '/'), file)
+                    return self.api.upload_file(self._uuid, self.token, relative_path, file)
             return None
         
-        def _delete_remote_file(mod_file:Path):
-            relative_path = str(mod_file.relative_to(self.folder_path)).replace('\\', '/')
-            self.api.remove_modpack_file(self._uuid, relative_path)
-
-        hashmap_remoto = self.api.get_modpack_hash_map(self._uuid)['json']
-        upload_files = set()  # Conjunto para armazenar os arquivos que precisam ser carregados
-        delete_files = set()  # Conjunto para armazenar os arquivos que precisam ser deletados
+        def _upload_batch(batch):
+            entries = [(str(mod_file), str(mod_file.relative_to(self.folder_path)).replace('\\', '/')) for mod_file in batch]
+            res = self.api.upload_files_batch(self._uuid, self.token, entries, batch_size)
+            if res['status'] not in (200, 201):
+                # Servidor sem suporte ou falha no lote: envia os arquivos individualmente
+                self.logger.warning(f"Batch upload failed with status {res['status']}, uploading {len(batch)} files one by one")
+                for mod_file in batch:
+                    _upload_file(mod_file)
+            return res
+        
+        def _delete_remote_directory(directory, relative_paths):
+            return self.api.remove_modpack_directory(self._uuid, self.token, directory, relative_paths)
 
-        # Iterar pelos arquivos para determinar quais precisam ser carregados ou deletados
-        mod_file:Path
-        for mod_file in folder.glob('**/*'):
-            if mod_file.is_file():
-                local_hash = HashMap.hash_file(mod_file)
-                remote_hash = hashmap_remoto.get(str(mod_file.relative_to(folder)).replace('\\', '/'))
-                if remote_hash is None:
-                    upload_files.add(mod_file)
-                elif remote_hash != local_hash:
-                    upload_files.add(mod_file)
-        
-        # Iterar pelo hashmap remoto para verificar arquivos que precisam ser removidos remotamente
-        for key in hashmap_remoto:
-            file_path = key.replace('/', os.path.sep)
-            local_file_path = Path(self.folder_path) / file_path
-            if local_file_path.exists() == False:
-                delete_files.add(local_file_path)
-        
-        max_connections = 20
-        total_files = len(upload_files)
-        total_exclusions = len(delete_files)
-        processed = 0
-        all_tasks = total_files + total_exclusions
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_connections) as executor:
-            # Criação de futures para as remoções
-            delete_futures = [executor.submit(_delete_remote_file, mod_file) for mod_file in delete_files]
+        def _delete_remote_files(relative_paths):
+            return self.api.remove_modpack_files(self._uuid, self.token, relative_paths)
 
+        units = self.list_sync_units(remote)
+        # Com o watcher rodando o hashmap já está pronto: as unidades só recebem sua parte dele
+        watched_units = Modpack.split_units(watched, units) if watched is not None else None
+        
+        def scan(unit, recursive):
+            if watched_units is None:
+                return local.scan(unit, recursive)
+            return dict(watched_units.get((unit, recursive), {}))
+        
+        stages = {"scan": [0, len(units) + 1], "delete": [0, 0], "upload": [0, 0]}  # [concluídos, total]
+        futures = {}  # future -> (etapa, quantidade de arquivos)
+        pending_small = []
+        pending_small_size = 0
+        step = 0
+        last_progress = 0
+        uploaded_bytes = 0
+        started = None
+        
+        def emit():
+            nonlocal last_progress
+            done = sum(stage[0] for stage in stages.values())
+            total = sum(stage[1] for stage in stages.values())
+            # O total cresce conforme as unidades são comparadas; a barra nunca volta
+            last_progress = max(last_progress, math.floor(done / total * 100))
             self.uploadSignal.emit({
                 "runing": 1,
-                "progress": 0,
-                "step" : 1,
-                "done" : False
+                "progress": last_progress,
+                "step": step,
+                "done": False,
+                "stages": {name: {"done": stage[0], "total": stage[1]} for name, stage in stages.items()}
             })
+        
+        def submit(stage, count, fn, *args, priority=TransferScheduler.PRIORITY_SMALL, size=None):
+            nonlocal step, uploaded_bytes, started
+            if started is None:
+                started = time.monotonic()  # A vazão é medida a partir da primeira transferência
+            if stage == "upload" and size:
+                uploaded_bytes += size
+            futures[executor.submit(fn, *args, priority=priority, size=size)] = (stage, count)
+            stages[stage][1] += count
+            pbar.total = stages["delete"][1] + stages["upload"][1]
+            pbar.refresh()
+            step = max(step, 1)
+        
+        def collect(future):
+            stage, count = futures.pop(future)
+            future.result()
+            stages[stage][0] += count
+            pbar.update(count)
+        
+        def flush_small():
+            nonlocal pending_small, pending_small_size
+            batches, single_files = Modpack.group_batches(pending_small, batch_threshold, batch_size)
+            for batch in batches:
+                sizes = [mod_file.stat().st_size for mod_file in batch]
+                # Um manifesto dentro do lote faz o lote inteiro sair antes
+                priority = min(TransferScheduler.priority(mod_file, size) for mod_file, size in zip(batch, sizes))
+                submit("upload", len(batch), _upload_batch, batch, priority=priority, size=sum(sizes))
+            for mod_file in single_files:
+                size = mod_file.stat().st_size
+                submit("upload", 1, _upload_file, mod_file, priority=TransferScheduler.priority(mod_file, size), size=size)
+            pending_small, pending_small_size = [], 0
+        
+        def directory_exists(relative_dir):
+            return (folder / relative_dir.replace('/', os.path.sep)).is_dir()
+
+        def execute(plan:SyncPlan):
+            nonlocal pending_small_size
+            for action in plan.of(SyncPlan.UPLOAD):
+                mod_file = folder / action.path.replace('/', os.path.sep)
+                size = mod_file.stat().st_size
+                if batch_threshold and size < batch_threshold:
+                    pending_small.append(mod_file)
+                    pending_small_size += size
+                else:
+                    submit("upload", 1, _upload_file, mod_file, action.remote_hash, priority=TransferScheduler.priority(mod_file, size), size=size)
+            if pending_small_size >= batch_size:
+                flush_small()
+
+            # Remoções rodam junto com os envios: uma chamada por pasta removida e uma para os arquivos avulsos
+            for action in plan.of(SyncPlan.RMDIR):
+                submit("delete", len(action.contents), _delete_remote_directory, action.path, list(action.contents))
+            loose_files = plan.paths(SyncPlan.DELETE)
+            if loose_files:
+                submit("delete", len(loose_files), _delete_remote_files, loose_files)
+        
+        if watched is None:
+            local.begin_scan()
+        with Modpack.create_scheduler() as executor, tqdm(total=0, desc="Uploading files") as pbar:
+            # Os arquivos da raiz entram no hashmap.json, mas só são comparados no fim
+            local.hashmap.update(scan("", recursive=False))
             
-            # Cria uma barra de progresso para as remoções
-            with tqdm(total=total_exclusions, desc="Deleting files") as delete_pbar:
-                for future in concurrent.futures.as_completed(delete_futures):
-                    res = future.result()
-                    if res is not None:
-                        # Handle the result if needed
-                        pass
-                    delete_pbar.update(1)  # Atualiza a barra de progresso a cada arquivo concluído
-                    processed += 1
-                    progress_percent = (processed / all_tasks) * 100
-                    self.uploadSignal.emit({
-                        "runing": 1,
-                        "progress": math.floor(progress_percent),
-                        "step": 1,
-                        "done": False
-                    })
-
-            # Criação de futures para os envios
-            upload_futures = [executor.submit(_upload_file, mod_file) for mod_file in upload_files]
+            for unit, recursive in units:
+                local_files = scan(unit, recursive)
+                local.hashmap.update(local_files)
+                execute(SyncPlan.for_upload(local_files, remote.diff(unit, local_files, recursive), directory_exists))
+                stages["scan"][0] += 1
+                
+                for future in [future for future in futures if future.done()]:
+                    collect(future)
+                emit()
             
-            self.uploadSignal.emit({
-                "runing": 1,
-                "progress": 0,
-                "step" : 2,
-                "done" : False
-            })
+            # Com o mapeamento completo, grava o hashmap.json e compara os arquivos da raiz
+            local.save_to_file(local.hashmap_file_path)
+            root_files = scan("", recursive=False)
+            if watched is not None:
+                root_files[HashMap.HASHMAP_FILE_NAME] = HashMap.hash_file(local.hashmap_file_path, local.algorithm)
+            local.hashmap.update(root_files)
+            execute(SyncPlan.for_upload(root_files, remote.diff("", root_files, recursive=False), directory_exists))
+            flush_small()
+            stages["scan"][0] += 1
+            step = 2
+            emit()
             
-            # Cria uma barra de progresso para os envios
-            with tqdm(total=total_files, desc="Uploading files") as upload_pbar:
-                for future in concurrent.futures.as_completed(upload_futures):
-                    res = future.result()
-                    if res is not None:
-                        # Handle the result if needed
-                        pass
-                    processed += 1
-                    upload_pbar.update(1)  # Atualiza a barra de progresso a cada arquivo concluído
-                    
-                    progress_percent = (processed / all_tasks) * 100
-                    self.uploadSignal.emit({
-                        "runing": 1,
-                        "progress": math.floor(progress_percent),
-                        "step": 2,
-                        "done": False
-                    })
+            for future in concurrent.futures.as_completed(list(futures)):
+                collect(future)
+                emit()
+        if started is not None:
+            self.throughput_history().record(ThroughputHistory.UPLOAD, uploaded_bytes, stages["upload"][1], time.monotonic() - started)
+        if watched is None:
+            local.end_scan()
+        self.store_files(local.hashmap, local.algorithm)
         
         self.uploadSignal.emit({
             "runing": 0,
@@ -469,48 +993,569 @@ class Modpack(QObject):
             "done" : True
         })
         
-    def update_modpack(self):
-        res = self.api.get_modpack_hash_map(self._uuid)
+    async def run_async_jobs(self, jobs, bridge:ProgressBridge, connections, desc):
+        """
+        Executa trabalhos assíncronos com uma fila limitada consumida por um número fixo de corrotinas.
+        A fila segura o produtor, então a memória não cresce com o tamanho da modpack.
+
+        Args:
+            jobs (iterable): Tuplas (quantidade de arquivos, função assíncrona, *argumentos).
+            bridge (ProgressBridge): Repasse do progresso para a interface.
+            connections (int): Número de corrotinas consumidoras.
+            desc (str): Descrição da barra de progresso do console.
+        """
+        queue = asyncio.Queue(maxsize=connections * 2)
+        errors = []
+
+        async def consume(pbar):
+            while True:
+                job = await queue.get()
+                try:
+                    if job is None:
+                        return
+                    count, fn, *args = job
+                    try:
+                        await fn(*args)
+                    except Exception as e:
+                        # Guarda o erro e continua consumindo, senão o produtor ficaria preso na fila cheia
+                        errors.append(e)
+                    bridge.advance(count)
+                    pbar.update(count)
+                finally:
+                    queue.task_done()
+
+        with tqdm(total=bridge.total, desc=desc) as pbar:
+            consumers = [asyncio.create_task(consume(pbar)) for _ in range(connections)]
+            for job in jobs:
+                await queue.put(job)
+            for _ in consumers:
+                await queue.put(None)
+            await asyncio.gather(*consumers)
+        bridge.flush()
+        if errors:
+            raise errors[0]
+
+    async def send_all_files_async(self):
+        """
+        Variante de send_all_files para o motor assíncrono ([SYNCAPI] engine = async): compara a pasta
+        com o servidor e envia as mudanças por um único event loop, sem uma thread por conexão.
+        """
+        self.uploadSignal.emit({
+            "runing": 1,
+            "progress": 0,
+            "step" : 0,
+            "done" : False
+        })
+
+        _, local, differences = self.compute_differences()
+        folder = Path(self.folder_path)
+        batch_threshold, batch_size = Modpack.get_batch_options()
+
+        plan = SyncPlan.for_upload(local.hashmap, differences, lambda relative_dir: (folder / relative_dir.replace('/', os.path.sep)).is_dir())
+        uploads = plan.paths(SyncPlan.UPLOAD)
+        if differences and HashMap.HASHMAP_FILE_NAME not in uploads:
+            # O hashmap.json em memória é o de antes da gravação; o do disco reflete as mudanças
+            uploads.append(HashMap.HASHMAP_FILE_NAME)
+        upload_files = [folder / relative_path.replace('/', os.path.sep) for relative_path in uploads]
+        batches, single_files = Modpack.group_batches([file for file in upload_files if file.is_file()], batch_threshold, batch_size)
+        delete_directories = {action.path: list(action.contents) for action in plan.of(SyncPlan.RMDIR)}
+        loose_files = plan.paths(SyncPlan.DELETE)
+
+        def relative(mod_file:Path):
+            return str(mod_file.relative_to(self.folder_path)).replace('\\', '/')
+
+        async with self.create_async_api() as api:
+            async def upload_file(mod_file:Path):
+                return await api.upload_file(self._uuid, self.token, relative(mod_file), str(mod_file))
+
+            async def upload_batch(batch):
+                entries = [(str(mod_file), relative(mod_file)) for mod_file in batch]
+                res = await api.upload_files_batch(self._uuid, self.token, entries, batch_size)
+                if res['status'] not in (200, 201):
+                    self.logger.warning(f"Batch upload failed with status {res['status']}, uploading {len(batch)} files one by one")
+                    await asyncio.gather(*(upload_file(mod_file) for mod_file in batch))
+                return res
+
+            async def delete_directory(directory, relative_paths):
+                return await api.remove_modpack_directory(self._uuid, self.token, directory, relative_paths)
+
+            async def delete_files(relative_paths):
+                return await api.remove_modpack_files(self._uuid, self.token, relative_paths)
+
+            def jobs():
+                # A fila do event loop é FIFO: os trabalhos saem na ordem de prioridade do TransferScheduler
+                scheduled = []
+                for directory, paths in delete_directories.items():
+                    scheduled.append((TransferScheduler.PRIORITY_SMALL, (len(paths), delete_directory, directory, paths)))
+                if loose_files:
+                    scheduled.append((TransferScheduler.PRIORITY_SMALL, (len(loose_files), delete_files, loose_files)))
+                for batch in batches:
+                    priority = min(TransferScheduler.priority(mod_file, mod_file.stat().st_size) for mod_file in batch)
+                    scheduled.append((priority, (len(batch), upload_batch, batch)))
+                for mod_file in single_files:
+                    scheduled.append((TransferScheduler.priority(mod_file, mod_file.stat().st_size), (1, upload_file, mod_file)))
+                scheduled.sort(key=lambda item: item[0])
+                for _, job in scheduled:
+                    yield job
+
+            bridge = ProgressBridge(self.uploadSignal, 1, len(loose_files) + sum(len(paths) for paths in delete_directories.values()) + len(upload_files))
+            bridge.flush()
+            started = time.monotonic()
+            await self.run_async_jobs(jobs(), bridge, api.max_connections, "Uploading files")
+            self.throughput_history().record(ThroughputHistory.UPLOAD, Modpack.total_size(self.folder_path, uploads), len(upload_files), time.monotonic() - started)
+
+        self.uploadSignal.emit({
+            "runing": 0,
+            "progress": 100,
+            "step" : None,
+            "done" : True
+        })
+
+    def summarize_plan(self, direction, plan:SyncPlan, sizes):
+        """
+        Resume um plano de sincronização para ser exibido antes de executá-lo.
+
+        Args:
+            direction (str): ThroughputHistory.UPLOAD ou ThroughputHistory.DOWNLOAD.
+            plan (SyncPlan): O plano.
+            sizes (dict): {caminho relativo: bytes ou None} dos arquivos transferidos.
+
+        Returns:
+            dict: Resumo serializável em JSON (ver SyncPlan.summary) com "direction", a vazão medida nas
+            sincronizações anteriores ("bytes_per_second") e a duração estimada ("eta_seconds"),
+            None enquanto não houver medições.
+        """
+        summary = plan.summary(sizes)
+        eta, bytes_per_second = self.throughput_history().estimate(direction, summary["bytes"], summary[direction])
+        summary.update({"direction": direction, "eta_seconds": eta, "bytes_per_second": bytes_per_second})
+        return summary
+
+    def dry_run_sync(self):
+        """
+        Simula o envio da modpack: compara a pasta com o servidor e conta o que seria enviado e removido.
+
+        Returns:
+            dict: O resumo do plano (ver summarize_plan).
+        """
+        _, local, differences = self.compute_differences(dry_run=True)
+        folder = Path(self.folder_path)
+        plan = SyncPlan.for_upload(local.hashmap, differences, lambda relative_dir: (folder / relative_dir.replace('/', os.path.sep)).is_dir())
+        sizes = {}
+        for relative_path in plan.paths(SyncPlan.UPLOAD):
+            try:
+                sizes[relative_path] = (folder / relative_path.replace('/', os.path.sep)).stat().st_size
+            except OSError:
+                sizes[relative_path] = None
+        return self.summarize_plan(ThroughputHistory.UPLOAD, plan, sizes)
+
+    def dry_run_update(self, remote_root=None, hash_json=None):
+        """
+        Simula a atualização da modpack: compara a pasta com o servidor e conta o que seria baixado e removido.
+
+        O servidor não informa o tamanho dos arquivos: arquivos alterados são estimados pelo tamanho da
+        versão local ("estimated_size"), os que já estão no repositório compartilhado não são transferidos
+        ("linked") e os novos ficam fora do total ("unknown_size").
+
+        Args:
+            remote_root (dict): Nó raiz já obtido de getModpackHashTree, se houver.
+            hash_json (dict): Hashmap já obtido de getModpackHashMap, se houver.
+
+        Returns:
+            dict: O resumo do plano (ver summarize_plan).
+        """
+        remote_algorithm, plan, _ = self.plan_download(remote_root, hash_json, dry_run=True)
+        store = self.create_store(remote_algorithm)
+        sizes = {}
+        linked = estimated = 0
+        for action in plan.of(SyncPlan.DOWNLOAD):
+            if store is not None and store.accepts(action.path) and store.contains(action.remote_hash):
+                sizes[action.path] = 0
+                linked += 1
+            elif action.local_hash is not None:
+                sizes[action.path] = Modpack.total_size(self.folder_path, [action.path])
+                estimated += 1
+            else:
+                sizes[action.path] = None
+        summary = self.summarize_plan(ThroughputHistory.DOWNLOAD, plan, sizes)
+        summary.update({"linked": linked, "estimated_size": estimated})
+        return summary
+
+    def update_modpack(self, dry_run=False):
+        """
+        Atualiza a modpack a partir do servidor em segundo plano.
+
+        Args:
+            dry_run (bool): Apenas simula a atualização (ver dry_run_update), sem baixar nem remover nada.
+
+        Returns:
+            dict: O resumo da simulação, se dry_run; senão None.
+        """
+        if dry_run:
+            return self.dry_run_update()
+        res = self.api.get_modpack_hash_tree(self._uuid, "", Digest.available())
+        if res['status'] == 200:
+            thread = threading.Thread(target=self.download_files, kwargs={'remote_root': res['json']})
+            thread.start()
+            return
+        res = self.api.get_modpack_hash_map(self._uuid, Digest.available())
         if res['status'] == 200:
             thread = threading.Thread(target=self.download_files, args=(res['json'],))
             thread.start()
     
-    def download_files(self, hash_json: dict):
+    def plan_download(self, remote_root=None, hash_json=None, dry_run=False):
+        """
+        Compara a pasta local com o servidor e planeja a atualização, sem alterar os arquivos da modpack.
+
+        Args:
+            remote_root (dict): Nó raiz já obtido de getModpackHashTree, se houver.
+            hash_json (dict): Hashmap já obtido de getModpackHashMap, se houver.
+            dry_run (bool): Não grava o hashmap.json nem o cache de hashes (ver compute_differences).
+
+        Returns:
+            tuple: (algoritmo remoto, SyncPlan, caminhos absolutos dos downloads parciais encontrados).
+        """
+        remote_algorithm, local, differences = self.compute_differences(remote_root, hash_json, dry_run)
+
+        # Pastas existentes e downloads parciais; os hashes vêm da comparação, nenhum arquivo é relido
+        directories = set()
+        partial_files = []
+        for root, dirs, files in os.walk(self.folder_path):
+            for dir_name in dirs:
+                directories.add(os.path.relpath(os.path.join(root, dir_name), self.folder_path).replace('\\', '/'))
+            partial_files.extend(os.path.join(root, file_name) for file_name in files
+                                 if file_name.endswith((HashMap.PART_SUFFIX, HashMap.PART_META_SUFFIX)))
+
+        plan = SyncPlan.for_download(local.hashmap, differences, directories,
+                                     required=Modpack.REQUIRED_FOLDERS, protected=("modpack.json",), skipped=("desktop.ini",))
+        return remote_algorithm, plan, partial_files
+
+    def generation_path(self, generation):
+        """
+        Retorna o caminho de uma geração da pasta da modpack (GENERATION_NEXT, GENERATION_PREVIOUS ou GENERATION_SWAP).
+        """
+        return os.path.join(os.path.dirname(self.folder_path), f".{self._uuid}.{generation}")
+
+    @staticmethod
+    def link_or_copy(source, destination):
+        """
+        Cria um hardlink do arquivo (ou uma cópia, se o sistema de arquivos não suportar links).
+        """
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        try:
+            os.link(source, destination)
+        except OSError:
+            shutil.copy2(source, destination)
+
+    def prepare_generation(self, plan:SyncPlan, algorithm, partial_files=()):
+        """
+        Monta a próxima geração da pasta ao lado da atual: os arquivos mantidos pelo plano são ligados
+        por hardlink, então só os downloads ocupam espaço novo. Versões antigas de arquivos alterados
+        também são ligadas, como base da transferência delta; o download as substitui sem tocar na
+        geração atual.
+
+        A geração deixada por uma tentativa anterior (interrompida ou recusada por commit_generation) é
+        reaproveitada: arquivos cujo hash confere com o plano ficam, downloads parciais continuam de onde
+        pararam e o que o plano não usa mais é removido.
+
+        Args:
+            plan (SyncPlan): O plano de atualização (ver plan_download).
+            algorithm (str): Algoritmo dos hashes do plano.
+            partial_files (list[str]): Downloads parciais encontrados na pasta atual (ver plan_download).
+                Os de arquivos ainda pendentes são movidos para a nova geração; os demais são removidos.
+
+        Returns:
+            tuple: (caminho da nova geração, {caminho relativo: hash} dos downloads que já estão nela).
+        """
+        staging = self.generation_path(Modpack.GENERATION_NEXT)
+        os.makedirs(staging, exist_ok=True)
+        for file_name in Modpack.GENERATION_FILES:
+            # A geração nova recebe uma cópia na primeira tentativa, e o cache continua válido porque os links mantêm o inode
+            if not os.path.isfile(os.path.join(staging, file_name)) and os.path.isfile(os.path.join(self.folder_path, file_name)):
+                shutil.copy2(os.path.join(self.folder_path, file_name), os.path.join(staging, file_name))
+
+        wanted = {action.path: action.local_hash for action in plan.of(SyncPlan.KEEP)}
+        wanted.update({action.path: action.remote_hash for action in plan.of(SyncPlan.DOWNLOAD)})
+        bases = {action.path: action.local_hash for action in plan.of(SyncPlan.DOWNLOAD) if action.local_hash is not None}
+        downloads = {action.path for action in plan.of(SyncPlan.DOWNLOAD)}
+
+        # O que já está na geração é conferido pelo cache de hashes dela; só arquivos novos ou alterados são relidos
+        snapshot = HashMap(staging, show_progress=False, algorithm=algorithm, files={})
+        snapshot.begin_scan()
+        existing = snapshot.scan()
+        snapshot.end_scan()
+        present = set()
+        ready = {}
+        for relative_path, digest in existing.items():
+            if digest == wanted.get(relative_path):
+                present.add(relative_path)
+                if relative_path in downloads:
+                    ready[relative_path] = digest
+            elif digest == bases.get(relative_path):
+                present.add(relative_path)
+            else:
+                ContentStore.remove(os.path.join(staging, relative_path.replace("/", os.path.sep)))
+
+        pending = downloads - ready.keys()
+        for root, dirs, files in os.walk(staging):
+            for file_name in files:
+                for suffix in (HashMap.PART_SUFFIX, HashMap.PART_META_SUFFIX):
+                    if file_name.endswith(suffix):
+                        relative_path = os.path.relpath(os.path.join(root, file_name[:-len(suffix)]), staging).replace('\\', '/')
+                        if relative_path not in pending:
+                            os.remove(os.path.join(root, file_name))
+                        break
+
+        occupied = set(Modpack.REQUIRED_FOLDERS)
+        for relative_path in wanted:
+            occupied.update(SyncPlan.parents(relative_path))
+        for root, dirs, files in os.walk(staging, topdown=False):
+            relative_dir = os.path.relpath(root, staging).replace('\\', '/')
+            if relative_dir != '.' and relative_dir not in occupied and not os.listdir(root):
+                os.rmdir(root)
+
+        for folder in Modpack.REQUIRED_FOLDERS:
+            os.makedirs(os.path.join(staging, folder), exist_ok=True)
+        for action in plan:
+            relative_path = action.path.replace("/", os.path.sep)
+            if action.path in present:
+                continue
+            if action.kind == SyncPlan.KEEP or (action.kind == SyncPlan.DOWNLOAD and action.local_hash is not None):
+                Modpack.link_or_copy(os.path.join(self.folder_path, relative_path), os.path.join(staging, relative_path))
+            elif action.kind == SyncPlan.DOWNLOAD:
+                os.makedirs(os.path.dirname(os.path.join(staging, relative_path)), exist_ok=True)
+
+        # Downloads parciais deixados na pasta atual por uma atualização no lugar continuam na nova geração
+        for partial_file in partial_files:
+            for suffix in (HashMap.PART_SUFFIX, HashMap.PART_META_SUFFIX):
+                if partial_file.endswith(suffix):
+                    relative_path = os.path.relpath(partial_file[:-len(suffix)], self.folder_path).replace('\\', '/')
+                    destination = os.path.join(staging, os.path.relpath(partial_file, self.folder_path))
+                    if relative_path in pending and not os.path.exists(destination):
+                        os.makedirs(os.path.dirname(destination), exist_ok=True)
+                        os.replace(partial_file, destination)
+                    else:
+                        os.remove(partial_file)
+                    break
+        return staging, ready
+
+    def commit_generation(self, staging, plan:SyncPlan, fetched):
+        """
+        Confere a nova geração e a coloca no lugar da pasta atual com duas renomeações. A geração
+        atual passa a ser a anterior (ver rollback_generation). Se algo falhar, a pasta atual fica intacta
+        e a nova geração é mantida para a próxima tentativa (ver prepare_generation).
+
+        Args:
+            staging (str): O caminho da nova geração (ver prepare_generation).
+            plan (SyncPlan): O plano de atualização.
+            fetched (dict): Arquivos baixados e conferidos, {caminho relativo: hash}.
+
+        Returns:
+            bool: True se a nova geração foi colocada no lugar.
+        """
+        # Os downloads já foram conferidos pelo hash; os demais arquivos precisam apenas existir
+        missing = [action.path for action in plan.of(SyncPlan.DOWNLOAD) if action.path not in fetched]
+        missing += [action.path for action in plan.of(SyncPlan.KEEP)
+                    if not os.path.isfile(os.path.join(staging, action.path.replace("/", os.path.sep)))]
+        if missing:
+            self.logger.error(f"Update aborted, {len(missing)} files are missing or corrupt (e.g. {missing[0]}); the current folder was kept")
+            return False
+
+        watching = self.watcher is not None
+        self.stop_watcher()
+        previous = self.generation_path(Modpack.GENERATION_PREVIOUS)
+        try:
+            ContentStore.remove_tree(previous, ignore_errors=True)
+            os.rename(self.folder_path, previous)
+            try:
+                os.rename(staging, self.folder_path)
+            except OSError:
+                os.rename(previous, self.folder_path)
+                raise
+        except OSError as e:
+            self.logger.error(f"Could not switch to the updated folder, the current folder was kept: {e}")
+            return False
+        finally:
+            if watching:
+                self.start_watcher()
+        return True
+
+    def rollback_generation(self):
+        """
+        Volta a pasta da modpack para a geração anterior à última atualização em etapas. A geração
+        trocada passa a ser a anterior, então chamar de novo desfaz a volta.
+
+        Returns:
+            bool: True se havia uma geração anterior.
+        """
+        previous = self.generation_path(Modpack.GENERATION_PREVIOUS)
+        if not os.path.isdir(previous):
+            return False
+        watching = self.watcher is not None
+        self.stop_watcher()
+        swap = self.generation_path(Modpack.GENERATION_SWAP)
+        try:
+            ContentStore.remove_tree(swap, ignore_errors=True)
+            os.rename(self.folder_path, swap)
+            os.rename(previous, self.folder_path)
+            os.rename(swap, previous)
+        finally:
+            if watching:
+                self.start_watcher()
+        self.reload()
+        return True
+
+    def download_verified(self, file_path, destination, algorithm, digest, retries=0):
+        """
+        Baixa um arquivo conferindo o hash durante a escrita; conteúdo que não confere não substitui o
+        destino e é baixado de novo, até "retries" vezes.
+
+        Args:
+            file_path (str): Caminho relativo do arquivo na modpack.
+            destination (str): Caminho local onde o arquivo é gravado.
+            algorithm (str): Algoritmo do hash esperado.
+            digest (str): Hash esperado.
+            retries (int): Novas tentativas depois de um download corrompido.
+
+        Returns:
+            bool: True se o arquivo gravado confere com o hash.
+        """
+        for attempt in range(retries + 1):
+            # Grava em streaming no disco, sem manter o arquivo inteiro em memória
+            res = self.api.download_modpack_file_to(self._uuid, file_path, destination, algorithm, digest)
+            if res['status'] != 200:
+                return False
+            if res['digest'] == digest:
+                return True
+            self.logger.warning(f"Downloaded {file_path} does not match the remote hash (attempt {attempt + 1} of {retries + 1})")
+        return False
+
+    def verify(self, repair=True):
+        """
+        Confere a integridade da pasta da modpack: relê em paralelo os arquivos do hashmap.json e
+        compara os hashes, sem confiar no cache de hashes. O progresso é informado pelo uploadSignal.
+
+        Arquivos alterados depois do último mapeamento (mais novos que o hashmap.json, ou com tamanho,
+        mtime ou inode diferentes do cache) são mudanças do usuário, não danos, e ficam apenas listados.
+
+        Args:
+            repair (bool): Baixa de novo do servidor os arquivos danificados ou ausentes.
+
+        Returns:
+            dict: Relatório serializável em JSON com as listas "damaged", "missing", "modified" e
+            "repaired" (caminhos relativos) e a quantidade de arquivos conferidos em "checked".
+        """
         self.uploadSignal.emit({
             "runing": 1,
             "progress": 0,
             "step" : 0,
             "done" : False
         })
-        
-        dictRemoto = hash_json
-        dictLocal = HashMap(self.folder_path, True).hashmap
-        
-        def download_file(file_path):
-            if file_path.lower().endswith("desktop.ini"):
-                self.logger.info(f"Ignoring {file_path}...")
-                return
+        expected = self.create_hashmap(load_existing=True, show_progress=False)
+        cache = expected.load_cache()
+        try:
+            mapped_at = os.stat(expected.hashmap_file_path).st_mtime_ns
+        except OSError:
+            mapped_at = None
+        report = {"checked": 0, "damaged": [], "missing": [], "modified": [], "repaired": []}
+
+        pending = []
+        keys = {}
+        for relative_path, digest in sorted(expected.hashmap.items()):
+            if (relative_path == HashMap.HASHMAP_FILE_NAME or HashMap.is_ignored(relative_path) or digest is None
+                    or relative_path.lower().endswith("desktop.ini")):
+                continue
+            file_path = os.path.join(self.folder_path, relative_path.replace('/', os.path.sep))
+            try:
+                stat_result = os.stat(file_path)
+            except OSError:
+                report["missing"].append(relative_path)
+                continue
+            key = HashMap.stat_key(stat_result)
+            cached = cache.get(relative_path)
+            if (mapped_at is not None and stat_result.st_mtime_ns > mapped_at) or (cached is not None and cached[:3] != key):
+                report["modified"].append(relative_path)
+                continue
+            keys[relative_path] = key
+            pending.append((relative_path, file_path, stat_result.st_size))
 
-            res = self.api.download_modpack_file(self._uuid, file_path)
-            if res['status'] == 200:
-                content = res['content']
-                local_file_path = Path(self.folder_path) / file_path.replace("/", os.path.sep)
-                local_file_path.parent.mkdir(parents=True, exist_ok=True)
+        bridge = ProgressBridge(self.uploadSignal, 1, len(pending))
+        bridge.flush()
+        actual = expected.hash_pending(pending, bridge)
+        report["checked"] = len(actual)
+        report["damaged"] = sorted(relative_path for relative_path, digest in actual.items() if digest != expected.hashmap[relative_path])
+        # O cache passa a guardar o hash real, para a próxima varredura não repetir o hash esperado
+        expected.remember({relative_path: actual[relative_path] for relative_path in report["damaged"]})
 
-                with local_file_path.open('wb') as local_file:
-                    local_file.write(content)
-       
-        max_connections = 25
-        try:
-            conf = Config()
-            max_connections = int(conf.get('SYNCAPI', 'max_connections'))
-            if max_connections > Infos.limit_connections:
-                max_connections = Infos.limit_connections
-        except:
-            max_connections = 25
+        broken = report["damaged"] + report["missing"]
+        if repair and broken:
+            retries = Modpack.get_verify_retries()
+            store = self.create_store(expected.algorithm)
+            repaired = {}
+
+            def repair_file(relative_path):
+                digest = expected.hashmap[relative_path]
+                file_path = os.path.join(self.folder_path, relative_path.replace('/', os.path.sep))
+                if store is not None and os.path.isfile(file_path) and store.contains(digest) and os.path.samefile(file_path, store.path(digest)):
+                    # O conteúdo danificado é o próprio arquivo do repositório compartilhado: sai do repositório
+                    ContentStore.remove(store.path(digest))
+                if self.download_verified(relative_path, file_path, expected.algorithm, digest, retries):
+                    if mapped_at is not None:
+                        # O conteúdo volta a ser o do mapeamento: com o mtime dele, o arquivo não parece uma mudança do usuário
+                        os.utime(file_path, ns=(time.time_ns(), mapped_at))
+                    repaired[relative_path] = digest
+
+            bridge = ProgressBridge(self.uploadSignal, 2, len(broken))
+            bridge.flush()
+            with Modpack.create_scheduler() as executor:
+                futures = [executor.submit(repair_file, relative_path, priority=TransferScheduler.priority(relative_path)) for relative_path in broken]
+                for future in concurrent.futures.as_completed(futures):
+                    future.result()
+                    bridge.advance()
+            report["repaired"] = sorted(repaired)
+            expected.remember(repaired)
+            self.store_files(repaired, expected.algorithm)
+
+        if broken:
+            self.logger.warning(f"Verification: {len(report['damaged'])} damaged, {len(report['missing'])} missing, {len(report['repaired'])} repaired")
+        self.uploadSignal.emit({
+            "runing": 0,
+            "progress": 100,
+            "step" : None,
+            "done" : True
+        })
+        return report
+
+    def download_files(self, hash_json: dict = None, remote_root: dict = None):
+        self.uploadSignal.emit({
+            "runing": 1,
+            "progress": 0,
+            "step" : 0,
+            "done" : False
+        })
         
-        download_tasks = []
-        local_hash_map = HashMap(self.folder_path).hashmap
+        remote_algorithm, plan, partial_files = self.plan_download(remote_root, hash_json)
+        self.logger.info(f"Update plan: {plan.counts()}")
+        delta_min_size, delta_block_size = Modpack.get_delta_options()
+        verify_retries = Modpack.get_verify_retries()
+        store = self.create_store(remote_algorithm)
+        fetched = {}  # Arquivos obtidos e conferidos: {caminho relativo: hash}
+        downloads = plan.of(SyncPlan.DOWNLOAD)
+        # Em etapas, os arquivos vão para uma nova geração da pasta; senão, a pasta é atualizada no lugar
+        staged = Modpack.use_staged_update() and not plan.is_empty()
+        target, ready = self.prepare_generation(plan, remote_algorithm, partial_files) if staged else (self.folder_path, {})
+        fetched.update(ready)
+        
+        def download_file(action):
+            file_path, remote_hash = action.path, action.remote_hash
+            local_file_path = Path(target) / file_path.replace("/", os.path.sep)
+            if action.local_hash is not None and delta_min_size and local_file_path.stat().st_size >= delta_min_size:
+                # Versão antiga grande no disco: tenta baixar só os blocos alterados
+                res = self.api.download_modpack_file_delta(self._uuid, file_path, str(local_file_path), remote_algorithm, remote_hash, delta_block_size)
+                if res is not None:
+                    fetched[file_path] = remote_hash
+                    return
+            if self.download_verified(file_path, str(local_file_path), remote_algorithm, remote_hash, verify_retries):
+                fetched[file_path] = remote_hash
         
         self.uploadSignal.emit({
             "runing": 1,
@@ -519,63 +1564,105 @@ class Modpack(QObject):
             "done" : False
         })
         
-        for file_path in local_hash_map.keys():
-            if file_path.lower() == "modpack.json":
-                continue
-            full_path = Path(self.folder_path) / file_path
-            if file_path not in dictRemoto or dictRemoto.get(file_path) != HashMap.hash_file(Path(full_path)):
-                Path(full_path).unlink()
+        if not staged:
+            # Remove os arquivos locais que não existem no servidor; os que diferem são substituídos
+            # atomicamente no download e servem de base para a transferência delta
+            for action in plan.of(SyncPlan.DELETE):
+                file_path = os.path.join(self.folder_path, action.path.replace("/", os.path.sep))
+                if os.path.isfile(file_path):
+                    ContentStore.remove(file_path)
 
+            # Downloads parciais de arquivos que não serão mais baixados não podem ser retomados
+            pending_downloads = {os.path.normpath(os.path.join(self.folder_path, action.path)) for action in downloads}
+            for partial_file in partial_files:
+                for suffix in (HashMap.PART_SUFFIX, HashMap.PART_META_SUFFIX):
+                    if partial_file.endswith(suffix) and os.path.normpath(partial_file[:-len(suffix)]) not in pending_downloads:
+                        os.remove(partial_file)
+                        break
 
-        for root, dirs, files in os.walk(self.folder_path, topdown=False):
-            for dir_name in dirs:
-                dir_path = os.path.join(root, dir_name)
-                if not os.listdir(dir_path):  # Check if directory is empty
-                    os.rmdir(dir_path)
-        
-        folder = Path(self.folder_path) / "mods_enabled"
-        folder.mkdir(parents=True, exist_ok=True)
-        
-        folder = Path(self.folder_path) / "mods_disabled"
-        folder.mkdir(parents=True, exist_ok=True)
+            for action in plan.of(SyncPlan.RMDIR):
+                try:
+                    os.rmdir(os.path.join(self.folder_path, action.path.replace("/", os.path.sep)))
+                except OSError:
+                    # Ainda tem arquivos fora do hashmap (ignorados ou criados durante a atualização)
+                    self.logger.debug(f"Keeping non-empty folder {action.path}")
+
+            for action in plan.of(SyncPlan.MKDIR):
+                (Path(self.folder_path) / action.path.replace("/", os.path.sep)).mkdir(parents=True, exist_ok=True)
 
-        for file_path in hash_json.keys():
-            if file_path.lower().endswith("desktop.ini"):
+        # Conteúdo já baixado por outra modpack é ligado ao repositório compartilhado, sem transferência;
+        # um conteúdo que não confere com o hash sai do repositório e é baixado de novo
+        transfers = []
+        for action in downloads:
+            if action.path in ready:
                 continue
-            local_file_path = Path(self.folder_path) / file_path.replace("/", os.path.sep)
-            try:
-                localHash = HashMap.hash_file(local_file_path)
-            except:
-                localHash = None
-
-            # Verifique se o arquivo não existe localmente, ou se os hashes são diferentes
-            if localHash is None or localHash != hash_json[file_path]:
-                download_tasks.append(file_path)
-            elif localHash is not None and hash_json.get(file_path) is None:
-                # Se o arquivo existe localmente mas não remotamente, apague-o localmente
-                local_file_path.unlink()
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_connections) as executor:
-            futures = [executor.submit(download_file, file_path) for file_path in download_tasks]
-            
-            completed_tasks = 0
-            total_tasks = len(download_tasks)
-            
-            with tqdm(total=len(download_tasks), desc="Downloading files") as pbar:
-                for future in concurrent.futures.as_completed(futures):
-                    future.result()
+            local_file_path = os.path.join(target, action.path.replace("/", os.path.sep))
+            if (store is not None and store.accepts(action.path) and store.contains(action.remote_hash)
+                    and store.check(action.remote_hash) and store.link(action.remote_hash, local_file_path)):
+                fetched[action.path] = action.remote_hash
+            else:
+                transfers.append(action)
+
+        started = time.monotonic()
+        if Modpack.use_async_engine():
+            fetched.update(asyncio.run(self.download_files_async(transfers, remote_algorithm, target)))
+        else:
+            with Modpack.create_scheduler() as executor:
+                # O tamanho dos downloads só é conhecido no fim; a prioridade vem do nome do arquivo
+                def downloaded_size(file_path):
+                    local_file_path = Path(target) / file_path.replace("/", os.path.sep)
+                    return lambda: local_file_path.stat().st_size if local_file_path.is_file() else None
+
+                futures = [executor.submit(download_file, action, priority=TransferScheduler.priority(action.path), size=downloaded_size(action.path))
+                           for action in transfers]
+
+                completed_tasks = 0
+                total_tasks = len(transfers)
+
+                with tqdm(total=len(transfers), desc="Downloading files") as pbar:
+                    for future in concurrent.futures.as_completed(futures):
+                        future.result()
+
+                        completed_tasks += 1
+                        progress = completed_tasks / total_tasks * 100
+
+                        self.uploadSignal.emit({
+                            "runing": 1,
+                            "progress": math.floor(progress),
+                            "step": 2,
+                            "done": False
+                        })
+                        pbar.update(1)
+        transferred = [action.path for action in transfers if action.path in fetched]
+        self.throughput_history().record(ThroughputHistory.DOWNLOAD, Modpack.total_size(target, transferred), len(transfers), time.monotonic() - started)
+
+        # Arquivos baixados já foram conferidos: o cache da pasta onde foram gravados esquece as versões
+        # antigas (em etapas, uma nova tentativa reaproveita os downloads sem relê-los)
+        HashMap(target, show_progress=False, algorithm=remote_algorithm, files={}).remember(fetched)
+        applied = not staged or self.commit_generation(target, plan, fetched)
+        if not applied:
+            fetched = {}
+        else:
+            # Uma geração deixada por outra tentativa fica obsoleta; o hashmap.json passa a descrever o
+            # que foi instalado e a marcar o fim da atualização (ver verify)
+            ContentStore.remove_tree(self.generation_path(Modpack.GENERATION_NEXT), ignore_errors=True)
+            installed = {action.path: action.local_hash for action in plan.of(SyncPlan.KEEP)}
+            if not staged:
+                # Downloads que falharam no lugar deixam a versão antiga, se havia uma
+                installed.update({action.path: action.local_hash for action in downloads
+                                  if action.local_hash is not None and action.path not in fetched
+                                  and os.path.isfile(os.path.join(self.folder_path, action.path.replace("/", os.path.sep)))})
+            installed.update(fetched)
+            local = self.create_hashmap(algorithm=remote_algorithm, files=installed, show_progress=False)
+            local.save_to_file(local.hashmap_file_path)
+
+        # Guarda o que foi baixado no repositório compartilhado e libera o que nenhuma modpack usa mais
+        self.store_files(fetched, remote_algorithm)
+        if store is not None:
+            freed = store.prune()
+            if freed:
+                self.logger.info(f"Released {freed} bytes from the content store")
 
-                    completed_tasks += 1
-                    progress = completed_tasks / total_tasks * 100
-
-                    self.uploadSignal.emit({
-                        "runing": 1,
-                        "progress": math.floor(progress),
-                        "step": 2,
-                        "done": False
-                    })
-                    pbar.update(1)
-                    
         self.uploadSignal.emit({
             "runing": 0,
             "progress": 100,
@@ -583,6 +1670,39 @@ class Modpack(QObject):
             "done" : True
         })
     
+    async def download_files_async(self, downloads, remote_algorithm, target=None):
+        """
+        Baixa os arquivos pelo motor assíncrono, com o mesmo streaming, retomada e verificação de hash
+        dos downloads em threads.
+
+        Args:
+            downloads (list[SyncAction]): Ações DOWNLOAD do plano de atualização.
+            remote_algorithm (str): Algoritmo de hash do servidor.
+            target (str): Pasta onde os arquivos são gravados (a da modpack ou uma nova geração dela).
+
+        Returns:
+            dict: Arquivos obtidos e conferidos, {caminho relativo: hash}.
+        """
+        target = target or self.folder_path
+        verify_retries = Modpack.get_verify_retries()
+        fetched = {}
+        async with self.create_async_api() as api:
+            async def download_file(action):
+                file_path, remote_hash = action.path, action.remote_hash
+                local_file_path = Path(target) / file_path.replace("/", os.path.sep)
+                for attempt in range(verify_retries + 1):
+                    res = await api.download_modpack_file_to(self._uuid, file_path, str(local_file_path), remote_algorithm, remote_hash)
+                    if res['status'] != 200 or res['digest'] == remote_hash:
+                        break
+                    self.logger.warning(f"Downloaded {file_path} does not match the remote hash (attempt {attempt + 1} of {verify_retries + 1})")
+                if res['status'] == 200 and res['digest'] == remote_hash:
+                    fetched[file_path] = remote_hash
+
+            bridge = ProgressBridge(self.uploadSignal, 2, len(downloads))
+            jobs = ((1, download_file, action) for action in sorted(downloads, key=lambda action: TransferScheduler.priority(action.path)))
+            await self.run_async_jobs(jobs, bridge, api.max_connections, "Downloading files")
+        return fetched
+
     def reload(self):
         json_filename = os.path.join(self.folder_path, 'modpack.json')
         if os.path.exists(json_filename):
@@ -645,6 +1765,8 @@ class Modpack(QObject):
         
         if os.path.exists(modpacks_directory):
             for modpack_name in os.listdir(modpacks_directory):
+                if modpack_name.startswith('.'):
+                    continue  # Gerações de uma modpack (ver prepare_generation)
                 modpack = Modpack.load_from_json(modpack_name, base_directory)
                 if modpack:
                     modpacks.append(modpack)
@@ -666,6 +1788,8 @@ class Modpack(QObject):
         
         if os.path.exists(modpacks_directory):
             for modpack_name in os.listdir(modpacks_directory):
+                if modpack_name.startswith('.'):
+                    continue
                 modpack_path = os.path.join(modpacks_directory, modpack_name)
                 modpack_json_path = os.path.join(modpack_path, 'modpack.json')
                 
@@ -1,8 +1,21 @@
 from src.tools.extractor import Extractor
 from src.tools.converter import Converter
 from src.tools.jsonAutoFix import JasonAutoFix
+from src.tools.digest import Digest
 from src.tools.hashmap import HashMap
+from src.tools.delta import Delta
+from src.tools.contentstore import ContentStore
+from src.tools.compression import Compression
+from src.tools.syncplan import SyncPlan, SyncAction
+from src.tools.scheduler import TokenBucket, ThrottledReader, TransferScheduler, ThroughputHistory
+from src.tools.watcher import Watcher
+from src.tools.modcatalog import ModCatalog
+from src.tools.dependencyresolver import DependencyResolver, DependencyReport
+from src.tools.multipart import MultipartBody
 from src.tools.modpackapi import ModpackApi
+from src.tools.remoteindex import RemoteIndex
+from src.tools.asyncmodpackapi import AsyncModpackApi
+from src.tools.progressbridge import ProgressBridge
 from src.tools.resources import Resources
 from src.tools.steam import Steam
 
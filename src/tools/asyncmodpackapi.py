@@ -0,0 +1,323 @@
+import asyncio, logging, os, json, tempfile, zipfile
+
+try:
+    import aiohttp
+except ImportError:  # Dependência opcional
+    aiohttp = None
+
+from src.tools import Digest, HashMap, ModpackApi, Compression, TokenBucket, ContentStore
+
+class AsyncModpackApi:
+    """
+    Versão assíncrona (asyncio + aiohttp) das operações de transferência da ModpackApi.
+
+    Uma única sessão e um único event loop mantêm centenas de transferências em andamento
+    sem criar uma thread por conexão. O número de requisições simultâneas é limitado por um
+    semáforo e pelo limite do conector.
+
+    :param base_url: A URL base da API.
+    """
+
+    # Mesmas regras de retomada dos downloads síncronos
+    _resume_offset = ModpackApi._resume_offset
+    _discard_part = staticmethod(ModpackApi._discard_part)
+
+    def __init__(self, base_url, max_connections=100, retries=3, backoff_factor=0.5, timeout=(5, 60), compression=None, bucket=None):
+        """
+        Inicializa uma nova instância da classe AsyncModpackApi. Deve ser usada com "async with".
+
+        :param base_url: A URL base da API.
+        :param max_connections: Número máximo de requisições simultâneas.
+        :param retries: Número de novas tentativas em erros de conexão e respostas transitórias.
+        :param backoff_factor: Fator do intervalo exponencial entre as tentativas, em segundos.
+        :param timeout: Tupla (conexão, leitura) de timeouts em segundos.
+        :param compression: Política de compressão dos downloads (Compression); None usa a padrão.
+        :param bucket: Limite global de banda (TokenBucket), compartilhado com a ModpackApi; None não limita.
+        """
+        if aiohttp is None:
+            raise RuntimeError("The async transfer engine requires the 'aiohttp' package")
+        self.base_url = base_url
+        self.logger = logging.getLogger(f'Sync-Api-Async')
+        self.max_connections = max_connections
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.timeout = aiohttp.ClientTimeout(sock_connect=timeout[0], sock_read=timeout[1])
+        self.compression = compression if compression is not None else Compression()
+        self.bucket = bucket if bucket is not None else TokenBucket()
+        self.semaphore = None
+        self.session = None
+
+    @staticmethod
+    def is_available():
+        """
+        Verifica se o pacote aiohttp está instalado.
+        """
+        return aiohttp is not None
+
+    async def __aenter__(self):
+        self.semaphore = asyncio.Semaphore(self.max_connections)
+        connector = aiohttp.TCPConnector(limit=self.max_connections)
+        # A decodificação (zstd/gzip) é feita por Compression, como na ModpackApi
+        self.session = aiohttp.ClientSession(connector=connector, timeout=self.timeout, auto_decompress=False)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.session.close()
+
+    async def _retry(self, operation, description):
+        """
+        Executa uma operação com novas tentativas e intervalo exponencial.
+
+        :param operation: Função assíncrona sem argumentos que retorna o dicionário de resposta.
+        :param description: Descrição usada no log.
+        :return: O dicionário retornado pela operação.
+        """
+        attempt = 0
+        while True:
+            try:
+                async with self.semaphore:
+                    res = await operation()
+                if res['status'] not in ModpackApi.RETRY_STATUS or attempt >= self.retries:
+                    return res
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if attempt >= self.retries:
+                    raise
+                self.logger.debug(f'{description} failed ({e}), retrying')
+            await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+            attempt += 1
+
+    async def _throttle(self, amount):
+        """
+        Consome tokens do limite de banda sem bloquear o event loop.
+        """
+        wait = self.bucket.reserve(amount)
+        if wait:
+            await asyncio.sleep(wait)
+
+    async def _stream(self, file):
+        """
+        Lê um arquivo aberto em blocos fora do event loop, consumindo tokens do limite de banda a cada
+        bloco, para que o corpo de um upload saia a uma taxa constante.
+
+        :param file: Arquivo binário aberto, lido a partir da posição atual.
+        :return: Gerador assíncrono com os blocos do arquivo.
+        """
+        while True:
+            chunk = await asyncio.to_thread(file.read, ModpackApi.CHUNK_SIZE)
+            if not chunk:
+                return
+            await self._throttle(len(chunk))
+            yield chunk
+
+    @staticmethod
+    async def _json(response):
+        try:
+            return await response.json(content_type=None)
+        except (ValueError, aiohttp.ContentTypeError):
+            return {}
+
+    async def upload_file(self, uuid, token, remoteDirfile, local_path):
+        """
+        Faz upload de um arquivo para a pasta da modpack, lendo-o do disco em streaming.
+
+        :param uuid: O UUID da modpack.
+        :param token: O token de autenticação.
+        :param remoteDirfile: O caminho do arquivo relativo à pasta da modpack.
+        :param local_path: O caminho local do arquivo.
+        :return: Um dicionário contendo o status e o JSON da resposta.
+        """
+        url = f"{self.base_url}/uploadFile/{uuid}/{remoteDirfile}"
+
+        async def operation():
+            with open(local_path, 'rb') as file:
+                form = aiohttp.FormData()
+                form.add_field('file', self._stream(file), filename=os.path.basename(local_path), content_type='application/octet-stream')
+                async with self.session.post(url, data=form, headers={"token": f"{token}"}) as response:
+                    return {'status': response.status, 'json': await self._json(response)}
+
+        return await self._retry(operation, f'Upload of {remoteDirfile}')
+
+    async def upload_files_batch(self, uuid, token, entries, spool_size=8 * 1024 * 1024):
+        """
+        Envia vários arquivos pequenos em um único ZIP para o endpoint uploadAndUnzip.
+
+        :param uuid: O UUID da modpack.
+        :param token: O token de autenticação.
+        :param entries: Lista de tuplas (caminho local, caminho relativo na modpack com '/').
+        :param spool_size: Tamanho máximo do ZIP mantido em memória, em bytes.
+        :return: Um dicionário contendo o status e o JSON da resposta.
+        """
+        url = f"{self.base_url}/uploadAndUnzip/{uuid}"
+
+        def build(spool):
+            with zipfile.ZipFile(spool, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                for local_path, remote_path in entries:
+                    archive.write(local_path, remote_path)
+
+        with tempfile.SpooledTemporaryFile(max_size=spool_size) as spool:
+            # A compactação roda em uma thread para não parar as outras transferências do event loop
+            await asyncio.to_thread(build, spool)
+
+            async def operation():
+                spool.seek(0)
+                form = aiohttp.FormData()
+                form.add_field('file', self._stream(spool), filename='batch.zip', content_type='application/zip')
+                async with self.session.post(url, data=form, headers={"token": f"{token}"}) as response:
+                    return {'status': response.status, 'json': await self._json(response)}
+
+            return await self._retry(operation, f'Batch upload of {len(entries)} files')
+
+    async def download_modpack_file_to(self, uuid, file_path, destination, algorithm=None, expected_digest=None):
+        """
+        Baixa um arquivo em blocos para um parcial na pasta de destino e o renomeia atomicamente.
+        Segue as mesmas regras de retomada (Range) de ModpackApi.download_modpack_file_to.
+
+        :param uuid: O UUID da modpack.
+        :param file_path: O caminho do arquivo na modpack.
+        :param destination: O caminho local onde o arquivo deve ser gravado.
+        :param algorithm: Algoritmo de hash (ver Digest) calculado durante a escrita, ou None.
+        :param expected_digest: Hash do arquivo no hashmap remoto; habilita a retomada e a conferência.
+        :return: Um dicionário com o status e o hash do conteúdo recebido (ou None). Se o hash não
+            confere com expected_digest, o destino não é alterado.
+        """
+        url = f"{self.base_url}/getModpackFile/{uuid}/{file_path}"
+        part_path = f"{destination}{HashMap.PART_SUFFIX}"
+        meta_path = f"{destination}{HashMap.PART_META_SUFFIX}"
+        resumable = expected_digest is not None
+
+        def rehash_part(hasher):
+            with open(part_path, 'rb') as part_file:
+                for chunk in iter(lambda: part_file.read(HashMap.CHUNK_SIZE), b""):
+                    hasher.update(chunk)
+
+        def open_part(mode):
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            if resumable and mode == 'wb':
+                with open(meta_path, 'w') as meta_file:
+                    json.dump({'algorithm': algorithm, 'digest': expected_digest}, meta_file)
+            return open(part_path, mode)
+
+        def write(part_file, hasher, decoder, chunk):
+            if decoder:
+                chunk = decoder.decompress(chunk)
+            part_file.write(chunk)
+            if hasher:
+                hasher.update(chunk)
+
+        def finish(part_file, hasher, decoder):
+            if decoder:
+                tail = decoder.flush()
+                part_file.write(tail)
+                if hasher:
+                    hasher.update(tail)
+            part_file.close()
+            digest = hasher.hexdigest() if hasher else None
+            if digest is not None and expected_digest is not None and digest != expected_digest:
+                self._discard_part(part_path, meta_path)
+                return {'status': 200, 'digest': digest}
+            ContentStore.release(destination)
+            os.replace(part_path, destination)
+            if resumable and os.path.exists(meta_path):
+                os.remove(meta_path)
+            return {'status': 200, 'digest': digest}
+
+        # Leitura, escrita e hash de disco rodam fora do event loop; cada bloco é gravado antes do próximo ser lido
+        async def operation():
+            hasher = Digest.new(algorithm) if algorithm else None
+            offset = await asyncio.to_thread(self._resume_offset, part_path, meta_path, expected_digest, algorithm) if resumable else 0
+            if offset:
+                headers = {"Range": f"bytes={offset}-", "Accept-Encoding": Compression.IDENTITY}
+            else:
+                headers = {"Accept-Encoding": self.compression.accept_encoding()}
+            async with self.session.get(url, headers=headers) as response:
+                if offset and response.status == 416:
+                    await asyncio.to_thread(self._discard_part, part_path, meta_path)
+                    return {'status': 416, 'digest': None}
+                if response.status not in (200, 206):
+                    return {'status': response.status, 'digest': None}
+
+                if response.status == 206:
+                    if hasher:
+                        await asyncio.to_thread(rehash_part, hasher)
+                    mode = 'ab'
+                else:
+                    mode = 'wb'
+
+                decoder = Compression.decoder(response.headers.get('Content-Encoding'))
+                part_file = await asyncio.to_thread(open_part, mode)
+                try:
+                    async for chunk in response.content.iter_chunked(ModpackApi.CHUNK_SIZE):
+                        await self._throttle(len(chunk))
+                        await asyncio.to_thread(write, part_file, hasher, decoder, chunk)
+                    return await asyncio.to_thread(finish, part_file, hasher, decoder)
+                except BaseException:
+                    part_file.close()
+                    if not resumable:
+                        self._discard_part(part_path, meta_path)
+                    raise
+
+        res = await self._retry(operation, f'Download of {file_path}')
+        if res['status'] == 416:
+            # O parcial não corresponde mais ao arquivo remoto: recomeça do zero
+            res = await self._retry(operation, f'Download of {file_path}')
+        return res
+
+    async def remove_modpack_files(self, uuid, token, file_paths):
+        """
+        Remove vários arquivos da pasta da modpack com uma única requisição,
+        ou um a um se o servidor não tiver o endpoint de remoção em lote.
+
+        :param uuid: O UUID da modpack.
+        :param token: O token de autenticação.
+        :param file_paths: Lista de caminhos dos arquivos a serem removidos.
+        :return: Um dicionário contendo o status e o JSON da resposta.
+        """
+        url = f"{self.base_url}/removeModpackFiles/{uuid}"
+
+        async def bulk():
+            async with self.session.post(url, json={"paths": list(file_paths)}, headers={"token": f"{token}"}) as response:
+                return {'status': response.status, 'json': await self._json(response)}
+
+        res = await self._retry(bulk, f'Bulk delete of {len(file_paths)} files')
+        if res['status'] not in ModpackApi.UNSUPPORTED_STATUS:
+            return res
+
+        results = await asyncio.gather(*(self.remove_modpack_file(uuid, file_path) for file_path in file_paths))
+        return results[-1] if results else res
+
+    async def remove_modpack_file(self, uuid, file_path):
+        """
+        Remove um arquivo da pasta da modpack.
+
+        :param uuid: O UUID da modpack.
+        :param file_path: O caminho do arquivo a ser removido.
+        :return: Um dicionário contendo o status e o JSON da resposta.
+        """
+        url = f"{self.base_url}/removeModpackFile/{uuid}/{file_path}"
+
+        async def operation():
+            async with self.session.delete(url) as response:
+                return {'status': response.status, 'json': await self._json(response)}
+
+        return await self._retry(operation, f'Delete of {file_path}')
+
+    async def remove_modpack_directory(self, uuid, token, directory, file_paths):
+        """
+        Remove uma pasta inteira da modpack, ou os arquivos informados se o servidor não tiver o endpoint.
+
+        :param uuid: O UUID da modpack.
+        :param token: O token de autenticação.
+        :param directory: O caminho relativo da pasta a ser removida.
+        :param file_paths: Os arquivos remotos contidos na pasta, usados no fallback.
+        :return: Um dicionário contendo o status e o JSON da resposta.
+        """
+        url = f"{self.base_url}/removeModpackDirectory/{uuid}/{directory}"
+
+        async def operation():
+            async with self.session.delete(url, headers={"token": f"{token}"}) as response:
+                return {'status': response.status, 'json': await self._json(response)}
+
+        res = await self._retry(operation, f'Delete of directory {directory}')
+        if res['status'] not in ModpackApi.UNSUPPORTED_STATUS:
+            return res
+        return await self.remove_modpack_files(uuid, token, file_paths)
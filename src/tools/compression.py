@@ -0,0 +1,111 @@
+import os, zlib
+
+try:
+    import zstandard
+except ImportError:  # Dependência opcional
+    zstandard = None
+
+class Compression:
+    """
+    Política de compressão das transferências com o servidor.
+
+    Downloads anunciam as codificações aceitas em Accept-Encoding e decodificam a resposta conforme
+    o Content-Encoding. Uploads são comprimidos com a codificação preferida e enviados com
+    Content-Encoding; se o servidor recusar o corpo comprimido (400, 411, 413, 415, 5xx ou a conexão
+    cair) e aceitar o mesmo upload sem compressão, os próximos uploads vão sem compressão.
+    Formatos já comprimidos (imagens, arquivos compactados, áudio) nunca são recomprimidos.
+    """
+
+    ZSTD = "zstd"
+    GZIP = "gzip"
+    IDENTITY = "identity"
+
+    PREFERENCE = [ZSTD, GZIP]
+    DEFAULT_LEVELS = {ZSTD: 3, GZIP: 6}
+    SKIP_EXTENSIONS = [".png", ".jpg", ".jpeg", ".gif", ".webp", ".zip", ".rar", ".7z", ".gz", ".zst", ".xz", ".ogg", ".mp3"]
+    MIN_SIZE = 1024  # Abaixo disso o ganho não paga o custo da compressão
+    MIN_RATIO = 0.9  # Corpo comprimido maior que isso (em relação ao original) é enviado sem compressão
+
+    def __init__(self, encodings=None, levels=None, skip_extensions=None, min_size=MIN_SIZE):
+        """
+        :param encodings: Codificações permitidas, em ordem de preferência (padrão: zstd e gzip).
+        :param levels: Níveis de compressão por codificação, ex.: {"zstd": 3, "gzip": 6}.
+        :param skip_extensions: Extensões de arquivos que nunca são comprimidos.
+        :param min_size: Tamanho mínimo, em bytes, para comprimir um upload.
+        """
+        available = Compression.available()
+        self.encodings = [encoding for encoding in (Compression.PREFERENCE if encodings is None else encodings) if encoding in available]
+        self.levels = dict(Compression.DEFAULT_LEVELS, **(levels or {}))
+        self.skip_extensions = {extension.lower() for extension in (Compression.SKIP_EXTENSIONS if skip_extensions is None else skip_extensions)}
+        self.min_size = min_size
+        self.upload_enabled = bool(self.encodings)
+
+    @staticmethod
+    def available():
+        """
+        Lista as codificações suportadas nesta instalação, em ordem de preferência.
+        """
+        return [encoding for encoding in Compression.PREFERENCE if encoding != Compression.ZSTD or zstandard is not None]
+
+    def accept_encoding(self):
+        """
+        Monta o valor do cabeçalho Accept-Encoding dos downloads.
+        """
+        return ", ".join(self.encodings + [Compression.IDENTITY])
+
+    def choose(self, file_name, size=None):
+        """
+        Escolhe a codificação de um upload.
+
+        :param file_name: Nome ou caminho do arquivo enviado.
+        :param size: Tamanho do arquivo em bytes, se conhecido.
+        :return: A codificação, ou None para enviar sem compressão.
+        """
+        if not self.upload_enabled:
+            return None
+        if os.path.splitext(file_name)[1].lower() in self.skip_extensions:
+            return None
+        if size is not None and size < self.min_size:
+            return None
+        return self.encodings[0]
+
+    def compress(self, data, encoding):
+        """
+        Comprime um corpo inteiro.
+
+        :param data: Os bytes a comprimir.
+        :param encoding: A codificação (zstd ou gzip).
+        :return: Os bytes comprimidos.
+        """
+        compressor = self.compressor(encoding)
+        return compressor.compress(data) + compressor.flush()
+
+    def compressor(self, encoding):
+        """
+        Cria um compressor incremental, para corpos comprimidos em blocos.
+
+        :param encoding: A codificação (zstd ou gzip).
+        :return: Objeto com compress(bytes) e flush().
+        """
+        if encoding == Compression.ZSTD:
+            return zstandard.ZstdCompressor(level=self.levels[Compression.ZSTD]).compressobj()
+        if encoding == Compression.GZIP:
+            return zlib.compressobj(self.levels[Compression.GZIP], zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        raise ValueError(f"Unsupported content encoding: {encoding}")
+
+    @staticmethod
+    def decoder(encoding):
+        """
+        Cria um decodificador incremental para o Content-Encoding de uma resposta.
+
+        :param encoding: O valor do cabeçalho Content-Encoding (ou None).
+        :return: Objeto com decompress(bytes) e flush(), ou None se a resposta não está comprimida.
+        """
+        encoding = (encoding or Compression.IDENTITY).strip().lower()
+        if encoding == Compression.IDENTITY:
+            return None
+        if encoding == Compression.GZIP:
+            return zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if encoding == Compression.ZSTD and zstandard is not None:
+            return zstandard.ZstdDecompressor().decompressobj()
+        raise ValueError(f"Unsupported content encoding: {encoding}")
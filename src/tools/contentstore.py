@@ -0,0 +1,211 @@
+import os, stat, shutil, fnmatch, logging, uuid
+from src.tools import HashMap
+
+class ContentStore:
+    """
+    Repositório local de arquivos endereçados pelo hash do conteúdo, compartilhado entre as modpacks.
+
+    Cada conteúdo é guardado uma única vez em store/<algoritmo>/<2 primeiros caracteres>/<hash> e
+    as pastas das modpacks recebem hardlinks dele. O número de links indica se alguma modpack ainda
+    usa o conteúdo (ver prune); sem suporte a hardlinks o arquivo simplesmente não entra no repositório.
+
+    Limitação: um hardlink compartilha o arquivo, então qualquer alteração feita no lugar (por um mod,
+    um editor ou um atualizador de mods) apareceria em todas as modpacks que usam o mesmo conteúdo. Por
+    isso só entram no repositório formatos que os mods não reescrevem (ver include), exclude ainda
+    pode retirar nomes específicos, os conteúdos ficam somente leitura (ver protect) e são conferidos
+    (ver check) antes de serem ligados a uma modpack.
+    """
+
+    # Binários e assets que o jogo só lê; configurações (.json, .txt, .ini) ficam de fora
+    DEFAULT_INCLUDE = ["*.dll", "*.pdb", "*.xnb", "*.png", "*.jpg", "*.ogg", "*.wav", "*.mp3", "*.tbin"]
+    DEFAULT_EXCLUDE = ["*.json"]  # config.json e data/*.json são reescritos pelos mods
+    WRITE_BITS = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+
+    def __init__(self, root, algorithm, exclude=None, include=None):
+        """
+        :param root: Pasta raiz do repositório.
+        :param algorithm: Algoritmo de hash (ver Digest) dos endereços.
+        :param exclude: Padrões (fnmatch) de nomes de arquivos que não entram no repositório.
+        :param include: Padrões (fnmatch) dos únicos nomes de arquivos que podem entrar no repositório.
+        """
+        self.logger = logging.getLogger('ContentStore')
+        self.root = os.path.join(root, algorithm)
+        self.algorithm = algorithm
+        self.exclude = ContentStore.DEFAULT_EXCLUDE if exclude is None else exclude
+        self.include = ContentStore.DEFAULT_INCLUDE if include is None else include
+
+    def path(self, digest):
+        """
+        Retorna o caminho de um conteúdo no repositório.
+        """
+        return os.path.join(self.root, digest[:2], digest)
+
+    def contains(self, digest):
+        return os.path.isfile(self.path(digest))
+
+    def check(self, digest):
+        """
+        Confere se um conteúdo do repositório ainda corresponde ao seu hash. Um conteúdo corrompido
+        (alterado no lugar por alguma modpack) é removido, para ser baixado ou adicionado de novo.
+
+        :param digest: Hash do conteúdo.
+        :return: True se o conteúdo existe e está íntegro.
+        """
+        source = self.path(digest)
+        try:
+            if HashMap.hash_file(source, self.algorithm) == digest:
+                return True
+        except OSError:
+            return False
+        self.logger.warning(f"Store object {digest} does not match its hash, removing it")
+        try:
+            ContentStore.remove(source)
+        except OSError as e:
+            self.logger.warning(f"Could not remove {source} from the store: {e}")
+        return False
+
+    @staticmethod
+    def protect(file_path):
+        """
+        Tira a permissão de escrita de um conteúdo. A permissão vale para todos os hardlinks, então
+        uma escrita no lugar falha em vez de alterar o arquivo em todas as modpacks.
+        """
+        mode = stat.S_IMODE(os.stat(file_path).st_mode)
+        if mode & ContentStore.WRITE_BITS:
+            os.chmod(file_path, mode & ~ContentStore.WRITE_BITS)
+
+    @staticmethod
+    def release(file_path):
+        """
+        Prepara um arquivo que pode estar ligado ao repositório para ser removido ou substituído.
+
+        No Windows um arquivo somente leitura não pode ser apagado nem ser o destino de os.replace,
+        então a escrita é liberada (para todos os links, até o próximo protect). Nos outros sistemas
+        isso depende só da permissão da pasta e nada muda.
+        """
+        if os.name == 'nt' and os.path.isfile(file_path) and not os.access(file_path, os.W_OK):
+            os.chmod(file_path, stat.S_IREAD | stat.S_IWRITE)
+
+    @staticmethod
+    def remove(file_path):
+        """
+        Remove um arquivo, mesmo que seja um conteúdo protegido do repositório.
+        """
+        ContentStore.release(file_path)
+        os.remove(file_path)
+
+    @staticmethod
+    def remove_tree(path, ignore_errors=False):
+        """
+        shutil.rmtree que também remove conteúdos protegidos do repositório.
+        """
+        def retry(function, failed_path, _):
+            ContentStore.release(failed_path)
+            function(failed_path)
+
+        try:
+            shutil.rmtree(path, onerror=retry)
+        except OSError:
+            if not ignore_errors:
+                raise
+
+    def accepts(self, file_path):
+        """
+        Verifica se um arquivo pode ser ligado ao repositório.
+        """
+        name = os.path.basename(file_path).lower()
+        return (any(fnmatch.fnmatch(name, pattern) for pattern in self.include)
+                and not any(fnmatch.fnmatch(name, pattern) for pattern in self.exclude))
+
+    def _clone(self, source, destination, allow_copy):
+        """
+        Cria destination com o conteúdo de source: hardlink ou, se permitido, cópia.
+
+        Reflinks não são usados: um conteúdo compartilhado só por reflinks tem um único link e seria
+        removido pelo próximo prune.
+
+        :return: True se o destino foi criado.
+        """
+        try:
+            os.link(source, destination)
+            return True
+        except OSError:
+            pass
+        if allow_copy:
+            shutil.copy2(source, destination)
+            return True
+        return False
+
+    def link(self, digest, destination):
+        """
+        Materializa um conteúdo do repositório em um caminho, substituindo-o atomicamente.
+
+        :param digest: Hash do conteúdo.
+        :param destination: Caminho do arquivo na modpack.
+        :return: True se o arquivo foi criado a partir do repositório.
+        """
+        source = self.path(digest)
+        if not os.path.isfile(source):
+            return False
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        temp_path = f"{destination}.{uuid.uuid4().hex[:8]}{HashMap.PART_SUFFIX}"
+        try:
+            self._clone(source, temp_path, allow_copy=True)
+            ContentStore.protect(temp_path)
+            ContentStore.release(destination)
+            os.replace(temp_path, destination)
+        except OSError as e:
+            self.logger.warning(f"Could not link {destination} from the store: {e}")
+            if os.path.exists(temp_path):
+                ContentStore.remove(temp_path)
+            return False
+        return True
+
+    def add(self, file_path, digest):
+        """
+        Coloca um arquivo no repositório. Se o conteúdo já estiver lá, o arquivo passa a
+        compartilhar o conteúdo do repositório e a cópia duplicada é liberada.
+
+        :param file_path: Caminho do arquivo na modpack.
+        :param digest: Hash do conteúdo do arquivo (no algoritmo do repositório).
+        :return: True se o arquivo foi adicionado ou ligado ao repositório.
+        """
+        if not self.accepts(file_path):
+            return False
+        target = self.path(digest)
+        try:
+            if os.path.isfile(target):
+                if os.path.samefile(file_path, target):
+                    ContentStore.protect(target)
+                    return True
+                if self.check(digest):
+                    return self.link(digest, file_path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            # Sem hardlink a cópia só dobraria o espaço usado
+            if not self._clone(file_path, target, allow_copy=False):
+                return False
+            ContentStore.protect(target)
+            return True
+        except OSError as e:
+            self.logger.warning(f"Could not add {file_path} to the store: {e}")
+            return False
+
+    def prune(self):
+        """
+        Remove do repositório os conteúdos que nenhuma modpack usa mais (sem outros hardlinks).
+
+        :return: Quantidade de bytes liberados.
+        """
+        freed = 0
+        if not os.path.isdir(self.root):
+            return freed
+        for root, dirs, files in os.walk(self.root, topdown=False):
+            for file in files:
+                file_path = os.path.join(root, file)
+                stat_result = os.stat(file_path)
+                if stat_result.st_nlink == 1:
+                    ContentStore.remove(file_path)
+                    freed += stat_result.st_size
+            if root != self.root and not os.listdir(root):
+                os.rmdir(root)
+        return freed
@@ -0,0 +1,221 @@
+import os, math, mmap, struct
+from itertools import accumulate
+from src.tools import Digest
+
+class Delta:
+    """
+    Transferência delta no estilo do rsync para arquivos grandes modificados.
+
+    Quem tem a versão antiga gera a assinatura (um checksum fraco rolante e um hash forte por bloco).
+    Quem tem a versão nova percorre o arquivo byte a byte com o checksum rolante e gera um delta
+    com cópias de blocos da versão antiga e apenas os trechos novos. O delta é aplicado sobre a
+    versão antiga gravando em um arquivo temporário.
+
+    Formato do delta: MAGIC, seguido das operações
+    b"C" + índice do bloco (uint32) + quantidade de blocos (uint32): copia blocos da versão antiga;
+    b"D" + tamanho (uint64) + bytes: dados novos;
+    b"E": fim do delta.
+    """
+
+    MAGIC = b"SVD1"
+    MODULUS = 1 << 16
+    BLOCK_SIZE = 64 * 1024  # Tamanho padrão dos blocos da assinatura
+    MIN_SIZE = 1024 * 1024  # Abaixo disso o arquivo inteiro é transferido
+    MAX_LITERAL_RATIO = 0.5  # Acima disso o delta não compensa o processamento
+    # Janelas seguidas sem nenhum bloco em comum antes de desistir: a busca byte a byte é lenta em
+    # Python e arquivos recomprimidos (ex.: .xnb) raramente voltam a casar depois de um trecho novo
+    MAX_UNMATCHED_BLOCKS = 16
+
+    @staticmethod
+    def weak_checksum(block):
+        """
+        Calcula o checksum fraco (estilo Adler-32 do rsync) de um bloco.
+
+        :param block: Os bytes do bloco.
+        :return: Tupla (a, b) com as duas somas de 16 bits.
+        """
+        # sum(accumulate(x)) = soma de (L - i) * x[i], feita em C
+        return sum(block) % Delta.MODULUS, sum(accumulate(block)) % Delta.MODULUS
+
+    @staticmethod
+    def _strong(block, algorithm):
+        hasher = Digest.new(algorithm)
+        hasher.update(block)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def signature(path, block_size=BLOCK_SIZE, algorithm=Digest.MD5):
+        """
+        Gera a assinatura de blocos de um arquivo.
+
+        :param path: Caminho do arquivo (versão antiga).
+        :param block_size: Tamanho dos blocos em bytes.
+        :param algorithm: Algoritmo do hash forte dos blocos.
+        :return: Dicionário JSON com algoritmo, tamanho dos blocos, tamanho do arquivo e [[fraco, forte], ...].
+        """
+        blocks = []
+        with open(path, 'rb') as file:
+            for block in iter(lambda: file.read(block_size), b""):
+                a, b = Delta.weak_checksum(block)
+                blocks.append([(b << 16) | a, Delta._strong(block, algorithm)])
+        return {
+            "algorithm": algorithm,
+            "block_size": block_size,
+            "size": os.path.getsize(path),
+            "blocks": blocks
+        }
+
+    @staticmethod
+    def write_delta(path, signature, out, algorithm=Digest.DEFAULT, max_literal_ratio=MAX_LITERAL_RATIO, max_unmatched_blocks=MAX_UNMATCHED_BLOCKS):
+        """
+        Gera o delta de um arquivo em relação à assinatura da versão antiga.
+
+        :param path: Caminho do arquivo (versão nova).
+        :param signature: Assinatura da versão antiga, de Delta.signature.
+        :param out: Objeto de arquivo binário onde o delta é gravado.
+        :param algorithm: Algoritmo do hash do arquivo novo retornado para verificação.
+        :param max_literal_ratio: Fração máxima de dados novos antes de desistir do delta.
+        :param max_unmatched_blocks: Tamanho máximo, em blocos, de um trecho novo contínuo antes de
+            desistir do delta (0 = sem limite).
+        :return: O hash do arquivo novo, ou None se o delta não compensar.
+        """
+        block_size = signature["block_size"]
+        strong_algorithm = signature.get("algorithm", Digest.MD5)
+        blocks = signature["blocks"]
+        tail_size = signature["size"] - (len(blocks) - 1) * block_size if blocks else 0
+
+        # Índice fraco -> forte -> bloco; um último bloco menor só pode casar no fim do arquivo
+        table = {}
+        full_blocks = len(blocks) if tail_size == block_size else len(blocks) - 1
+        for index in range(max(full_blocks, 0)):
+            weak, strong = blocks[index]
+            table.setdefault(weak, {}).setdefault(strong, index)
+
+        size = os.path.getsize(path)
+        max_literal = size * max_literal_ratio
+        max_unmatched = max_unmatched_blocks * block_size if max_unmatched_blocks else size
+        hasher = Digest.new(algorithm)
+        literal_total = 0
+        pending_copy = None  # [primeiro bloco, quantidade]
+
+        def flush_copy():
+            nonlocal pending_copy
+            if pending_copy:
+                out.write(b"C" + struct.pack(">II", *pending_copy))
+                pending_copy = None
+
+        def copy(index):
+            nonlocal pending_copy
+            if pending_copy and pending_copy[0] + pending_copy[1] == index:
+                pending_copy[1] += 1
+                return
+            flush_copy()
+            pending_copy = [index, 1]
+
+        def literal(data):
+            nonlocal literal_total
+            if not data:
+                return
+            flush_copy()
+            literal_total += len(data)
+            out.write(b"D" + struct.pack(">Q", len(data)))
+            out.write(data)
+
+        out.write(Delta.MAGIC)
+        if size == 0:
+            out.write(b"E")
+            return hasher.hexdigest()
+
+        M = Delta.MODULUS
+        last = size - block_size  # Última posição em que uma janela inteira cabe no arquivo
+        find = table.get
+        with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            hasher.update(data)
+            pos = 0
+            literal_start = 0
+            a = b = None
+            while pos <= last:
+                if a is None:
+                    a, b = Delta.weak_checksum(data[pos:pos + block_size])
+                    # Posição a partir da qual o trecho novo passa dos limites (recalculada a cada bloco casado)
+                    stop = min(literal_start + max_unmatched, math.floor(literal_start + max_literal - literal_total) + 1)
+                candidates = find((b << 16) | a)
+                if candidates:
+                    index = candidates.get(Delta._strong(data[pos:pos + block_size], strong_algorithm))
+                    if index is not None:
+                        literal(data[literal_start:pos])
+                        copy(index)
+                        pos += block_size
+                        literal_start = pos
+                        a = None
+                        continue
+                if pos >= stop:
+                    return None
+                if pos < last:
+                    # Desliza a janela um byte: remove o primeiro e inclui o próximo
+                    removed = data[pos]
+                    a = (a - removed + data[pos + block_size]) % M
+                    b = (b - block_size * removed + a) % M
+                pos += 1
+
+            rest = data[pos:size]
+            if blocks and tail_size != block_size and len(rest) == tail_size and Delta._strong(rest, strong_algorithm) == blocks[-1][1]:
+                literal(data[literal_start:pos])
+                copy(len(blocks) - 1)
+            else:
+                literal(data[literal_start:size])
+        if literal_total > max_literal:
+            return None
+        flush_copy()
+        out.write(b"E")
+        return hasher.hexdigest()
+
+    @staticmethod
+    def apply(basis_path, delta, out, block_size, hasher=None):
+        """
+        Reconstrói o arquivo novo a partir da versão antiga e do delta.
+
+        :param basis_path: Caminho da versão antiga do arquivo.
+        :param delta: Objeto de arquivo binário com o delta.
+        :param out: Objeto de arquivo binário onde o arquivo novo é gravado.
+        :param block_size: Tamanho dos blocos usado na assinatura.
+        :param hasher: Objeto de hash (Digest.new) atualizado com o conteúdo gravado, ou None.
+        """
+        def read_header(size):
+            header = delta.read(size)
+            if len(header) != size:
+                raise ValueError("Truncated delta")
+            return header
+
+        def write(chunk):
+            out.write(chunk)
+            if hasher:
+                hasher.update(chunk)
+
+        if delta.read(len(Delta.MAGIC)) != Delta.MAGIC:
+            raise ValueError("Invalid delta header")
+        with open(basis_path, 'rb') as basis:
+            while True:
+                op = delta.read(1)
+                if op == b"E":
+                    return
+                if op == b"C":
+                    index, count = struct.unpack(">II", read_header(8))
+                    basis.seek(index * block_size)
+                    remaining = count * block_size
+                    while remaining:
+                        chunk = basis.read(min(remaining, block_size))
+                        if not chunk:
+                            break  # Último bloco da versão antiga é menor
+                        write(chunk)
+                        remaining -= len(chunk)
+                elif op == b"D":
+                    (remaining,) = struct.unpack(">Q", read_header(8))
+                    while remaining:
+                        chunk = delta.read(min(remaining, block_size))
+                        if not chunk:
+                            raise ValueError("Truncated delta")
+                        write(chunk)
+                        remaining -= len(chunk)
+                else:
+                    raise ValueError("Truncated delta" if not op else f"Invalid delta operation: {op!r}")
@@ -0,0 +1,170 @@
+import re, logging
+
+class DependencyReport:
+    """
+    Resultado da verificação de dependências de um conjunto de mods, indexado pelo nome da pasta do mod.
+    """
+
+    def __init__(self):
+        self.missing = {}  # {pasta: [UniqueID das dependências obrigatórias ausentes]}
+        self.outdated = {}  # {pasta: [(UniqueID, versão mínima, versão instalada)]}
+        self.cycles = []  # Listas de pastas que dependem umas das outras em ciclo
+        self.in_cycle = set()
+
+    def problems(self, folder):
+        """
+        Lista os problemas de dependência de um mod.
+
+        :param folder: O nome da pasta do mod.
+        :return: Lista de mensagens; vazia se as dependências do mod estão completas.
+        """
+        problems = [f"missing {unique_id}" for unique_id in self.missing.get(folder, [])]
+        problems += [f"{unique_id} {installed} is older than {minimum}" for unique_id, minimum, installed in self.outdated.get(folder, [])]
+        if folder in self.in_cycle:
+            problems.append("circular dependency")
+        return problems
+
+    def is_complete(self, folder):
+        return not (folder in self.missing or folder in self.outdated or folder in self.in_cycle)
+
+
+class DependencyResolver:
+    """
+    Verifica as dependências de todos os mods de uma modpack de uma só vez.
+
+    Um índice de UniqueID (sem diferenciar maiúsculas) é montado uma vez por verificação, então
+    cada dependência é resolvida em O(1). O resultado fica guardado até o conjunto de mods mudar.
+    """
+
+    VERSION_PATTERN = re.compile(r"^(\d+(?:\.\d+)*)(?:-([0-9A-Za-z.-]+))?(?:\+.*)?$")
+
+    def __init__(self):
+        self.logger = logging.getLogger('DependencyResolver')
+        self._signature = None
+        self._report = None
+
+    @staticmethod
+    def parse_version(version):
+        """
+        Interpreta uma versão semântica (ex.: "1.2.0-beta.1") para comparação.
+
+        :param version: A versão em texto.
+        :return: Uma chave comparável, ou None se a versão não puder ser interpretada.
+        """
+        if not isinstance(version, str):
+            return None
+        match = DependencyResolver.VERSION_PATTERN.match(version.strip())
+        if not match:
+            return None
+        numbers = [int(part) for part in match.group(1).split(".")]
+        numbers += [0] * (3 - len(numbers))
+        # Versões de pré-lançamento vêm antes da versão final
+        prerelease = match.group(2)
+        return (tuple(numbers), 0 if prerelease else 1, prerelease or "")
+
+    @staticmethod
+    def signature(mods):
+        """
+        Monta a assinatura do conjunto de mods: muda sempre que um mod entra, sai ou muda de versão ou dependências.
+        """
+        return tuple(sorted(
+            (mod.parent_folder_name, mod.unique_id, str(mod.version),
+             tuple((str(dependency.get("UniqueID")), str(dependency.get("MinimumVersion")), bool(dependency.get("IsRequired", False)))
+                   for dependency in mod.dependencies))
+            for mod in mods))
+
+    def resolve(self, mods):
+        """
+        Verifica as dependências dos mods: obrigatórias ausentes, versões abaixo de MinimumVersion e ciclos.
+
+        :param mods: Lista de objetos Mod (os mods habilitados da modpack).
+        :return: Um DependencyReport, reaproveitado enquanto o conjunto de mods não mudar.
+        """
+        signature = DependencyResolver.signature(mods)
+        if signature == self._signature:
+            return self._report
+
+        report = DependencyReport()
+        index = {}
+        for mod in mods:
+            if mod.unique_id:
+                index.setdefault(mod.unique_id.lower(), mod)
+
+        graph = {}
+        for mod in mods:
+            folder = mod.parent_folder_name
+            edges = graph.setdefault(folder, [])
+            for dependency in mod.dependencies:
+                unique_id = dependency.get("UniqueID")
+                if not unique_id:
+                    continue
+                target = index.get(unique_id.lower())
+                if target is None:
+                    if dependency.get("IsRequired", False):
+                        report.missing.setdefault(folder, []).append(unique_id)
+                    continue
+                edges.append(target.parent_folder_name)
+                minimum = dependency.get("MinimumVersion")
+                required_version = DependencyResolver.parse_version(minimum)
+                installed_version = DependencyResolver.parse_version(target.version)
+                if required_version and installed_version and installed_version < required_version:
+                    report.outdated.setdefault(folder, []).append((unique_id, minimum, target.version))
+
+        report.cycles = DependencyResolver.find_cycles(graph)
+        report.in_cycle = {folder for cycle in report.cycles for folder in cycle}
+
+        self._signature = signature
+        self._report = report
+        return report
+
+    @staticmethod
+    def find_cycles(graph):
+        """
+        Encontra os ciclos de um grafo de dependências (componentes fortemente conexos, algoritmo de Tarjan iterativo).
+
+        :param graph: Dicionário {nó: [nós dos quais ele depende]}.
+        :return: Lista de ciclos, cada um uma lista de nós.
+        """
+        index_of = {}
+        lowlink = {}
+        stack = []
+        on_stack = set()
+        cycles = []
+        counter = 0
+
+        for root in graph:
+            if root in index_of:
+                continue
+            work = [(root, iter(graph[root]))]
+            index_of[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is not None:
+                    if child not in index_of:
+                        index_of[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(graph.get(child, []))))
+                    elif child in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[child])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in graph.get(node, []):
+                        cycles.append(component[::-1])
+        return cycles
@@ -0,0 +1,80 @@
+import hashlib
+
+try:
+    import blake3
+except ImportError:  # Dependência opcional
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:  # Dependência opcional
+    xxhash = None
+
+class Digest:
+    """
+    Registro dos algoritmos de hash usados para detectar mudanças nos arquivos das modpacks.
+
+    O MD5 é o algoritmo do formato legado do hashmap.json e está sempre disponível.
+    BLAKE3 e xxh3 só são oferecidos quando os pacotes opcionais estão instalados.
+    """
+
+    MD5 = "md5"
+    SHA256 = "sha256"
+    BLAKE3 = "blake3"
+    XXH3 = "xxh3_128"
+
+    DEFAULT = MD5  # Algoritmo implícito de hashmaps sem cabeçalho
+    PREFERENCE = [XXH3, BLAKE3, MD5, SHA256]  # Do mais rápido para o mais lento
+
+    @staticmethod
+    def available():
+        """
+        Lista os algoritmos suportados nesta instalação, em ordem de preferência.
+
+        :return: Lista com os nomes dos algoritmos disponíveis.
+        """
+        algorithms = []
+        for algorithm in Digest.PREFERENCE:
+            if algorithm == Digest.XXH3 and xxhash is None:
+                continue
+            if algorithm == Digest.BLAKE3 and blake3 is None:
+                continue
+            algorithms.append(algorithm)
+        return algorithms
+
+    @staticmethod
+    def is_available(algorithm):
+        """
+        Verifica se um algoritmo pode ser usado nesta instalação.
+
+        :param algorithm: Nome do algoritmo.
+        :return: True se o algoritmo estiver disponível.
+        """
+        return algorithm in Digest.available()
+
+    @staticmethod
+    def preferred():
+        """
+        Retorna o algoritmo mais rápido disponível.
+
+        :return: Nome do algoritmo.
+        """
+        return Digest.available()[0]
+
+    @staticmethod
+    def new(algorithm=DEFAULT):
+        """
+        Cria um objeto de hash incremental com os métodos update() e hexdigest().
+
+        :param algorithm: Nome do algoritmo.
+        :return: O objeto de hash.
+        """
+        if algorithm == Digest.MD5:
+            return hashlib.md5()
+        if algorithm == Digest.SHA256:
+            return hashlib.sha256()
+        if algorithm == Digest.BLAKE3 and blake3 is not None:
+            return blake3.blake3()
+        if algorithm == Digest.XXH3 and xxhash is not None:
+            return xxhash.xxh3_128()
+        raise ValueError(f"Unsupported digest algorithm: {algorithm}")
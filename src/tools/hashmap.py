@@ -3,64 +3,128 @@ import hashlib
 import json
 import time
 import logging
+import concurrent.futures
 from tqdm import tqdm
+from src.tools import Digest
 
-def count_files(directory):
-    count = 0
-    for root, dirs, files in os.walk(directory):
-        count += len(files)
-    return count
-
-def calculate_file_hash(file_path):
-    block_size = 65536  # 64 KB blocks
-    hasher = hashlib.sha256()
-
-    with file_path.open('rb') as file:
-        for block in iter(lambda: file.read(block_size), b''):
-            hasher.update(block)
-
-    return hasher.hexdigest()
+def calculate_file_hash(file_path, algorithm=Digest.SHA256):
+    return HashMap.hash_file(file_path, algorithm)
 
 class HashMap:
     """
     Classe para criar e comparar mapas de hashes de arquivos e diretórios.
     """
 
-    def __init__(self, directory, load_existing=False, show_progress=True):
+    HASHMAP_FILE_NAME = "hashmap.json"
+    CACHE_FILE_NAME = "hashmap.cache.json"  # Cache persistente de hashes indexado por stat
+    WATCH_MARKER_FILE_NAME = ".svmm-watch"  # Marcador usado pelo Watcher para esperar os eventos em trânsito
+    CATALOG_FILE_NAME = "modcatalog.sqlite"  # Catálogo local dos manifestos dos mods (ver ModCatalog)
+    # Arquivos internos que nunca entram no hashmap
+    IGNORED_FILES = {CACHE_FILE_NAME, WATCH_MARKER_FILE_NAME, CATALOG_FILE_NAME, CATALOG_FILE_NAME + "-journal"}
+    PART_SUFFIX = ".svmm-part"  # Sufixo dos downloads em andamento, também fora do hashmap
+    PART_META_SUFFIX = PART_SUFFIX + ".json"  # Hash esperado de um download parcial, para retomada
+    FORMAT_VERSION = 2  # Versão do hashmap.json com cabeçalho de algoritmo
+    RACY_WINDOW_NS = 2_000_000_000  # Arquivos modificados há menos de 2s não são cacheados
+    CHUNK_SIZE = 1024 * 1024  # Blocos grandes deixam o hashlib liberar o GIL durante o update
+    LARGE_FILE_THRESHOLD = 8 * 1024 * 1024  # Arquivos a partir deste tamanho vão para o pool de processos
+
+    def __init__(self, directory, load_existing=False, show_progress=True, workers=1, large_file_threshold=None, algorithm=None, files=None, persist=True):
         """
         Inicializa um novo objeto HashMap para um diretório específico.
 
         :param directory: O caminho absoluto para o diretório a ser monitorado.
         :param load_existing: Define se deve carregar um hashmap existente de um arquivo JSON.
         :param show_progress: Define se deve exibir o progressbar durante a criação do hashmap.
+        :param workers: Número de workers usados para calcular os hashes (1 = sequencial, 0 = número de CPUs).
+        :param large_file_threshold: Tamanho em bytes a partir do qual o arquivo é calculado no pool de processos.
+        :param algorithm: Algoritmo de hash (ver Digest). Se omitido, usa o do arquivo carregado ou o MD5 legado.
+        :param files: Hashmap já conhecido {caminho relativo: hash}; quando informado, nada é lido do disco.
+        :param persist: Grava o hashmap.json e o cache de hashes depois de uma varredura; com False a
+            pasta não é alterada (ex.: simulações).
         """
         self.logger = logging.getLogger('HashMap')
         self.directory = directory
+        self.workers = workers if workers > 0 else (os.cpu_count() or 1)
+        self.large_file_threshold = large_file_threshold or HashMap.LARGE_FILE_THRESHOLD
+        self.requested_algorithm = algorithm
+        self.algorithm = algorithm or Digest.DEFAULT
         self.hashmap = {}
         self.parent_changes = set()  # Conjunto para armazenar as pastas pai que tiveram mudanças
+        self.tree = None  # Árvore de Merkle {pasta relativa: hash}, '' é a raiz
+        self._children = None  # {pasta relativa: {nome: (tipo, hash)}}, tipo 'd' ou 'f'
         self.elapsed_time = None
         self.show_progress = show_progress
-        self.hashmap_file_path = os.path.join(directory, "hashmap.json")  # Caminho para o arquivo de hashmap
+        self.persist = persist
+        # Hashmaps montados a partir de files podem não ter pasta associada
+        self.hashmap_file_path = os.path.join(directory, HashMap.HASHMAP_FILE_NAME) if directory else None  # Caminho para o arquivo de hashmap
+        self.cache_file_path = os.path.join(directory, HashMap.CACHE_FILE_NAME) if directory else None  # Caminho para o cache de hashes
+        self.reused_hashes = 0
+        self._scan_cache = None  # Estado da varredura incremental (ver begin_scan)
+        self._new_cache = None
+        self._racy_limit = None
+        self._process_pool = None  # Pool de processos dos arquivos grandes, mantido durante a varredura
 
-        if load_existing:
+        if files is not None:
+            self.hashmap = dict(files)
+        elif load_existing:
             self.load_from_file(self.hashmap_file_path)
         else:
             self.hashmap = self.create_hashmap()
-            self.save_to_file(self.hashmap_file_path)
+            if persist:
+                self.save_to_file(self.hashmap_file_path)
     
     @staticmethod
-    def hash_file(file_path):
+    def hash_file(file_path, algorithm=Digest.DEFAULT):
         """
-        Calcula o hash MD5 de um arquivo.
+        Calcula o hash de um arquivo.
 
         :param file_path: Caminho absoluto para o arquivo.
-        :return: O valor de hash MD5 em formato hexadecimal.
+        :param algorithm: Algoritmo de hash (ver Digest), MD5 por padrão.
+        :return: O valor de hash em formato hexadecimal.
         """
-        hash_md5 = hashlib.md5()
+        hasher = Digest.new(algorithm)
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+            for chunk in iter(lambda: f.read(HashMap.CHUNK_SIZE), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+    @staticmethod
+    def is_ignored(relative_path):
+        """
+        Verifica se um arquivo é interno do gerenciador e não deve entrar no hashmap.
+
+        :param relative_path: Caminho relativo à pasta da modpack, com '/' como separador.
+        :return: True se o arquivo deve ser ignorado.
+        """
+        return (relative_path in HashMap.IGNORED_FILES
+                or relative_path.endswith(HashMap.PART_SUFFIX)
+                or relative_path.endswith(HashMap.PART_META_SUFFIX))
+
+    @staticmethod
+    def parse_document(document):
+        """
+        Interpreta um hashmap no formato versionado ou no formato legado (dicionário plano de MD5).
+
+        :param document: O conteúdo JSON do hashmap.
+        :return: Uma tupla (algoritmo, {caminho relativo: hash}).
+        """
+        if isinstance(document, dict) and isinstance(document.get("files"), dict) and "algorithm" in document:
+            return document["algorithm"], document["files"]
+        return Digest.DEFAULT, document or {}
+
+    def to_document(self):
+        """
+        Monta o conteúdo versionado do hashmap.json.
+
+        O próprio hashmap.json fica de fora, senão seu conteúdo mudaria a cada gravação.
+
+        :return: Um dicionário com versão, algoritmo e hashes dos arquivos.
+        """
+        return {
+            "version": HashMap.FORMAT_VERSION,
+            "algorithm": self.algorithm,
+            "files": {key: value for key, value in self.hashmap.items() if key != HashMap.HASHMAP_FILE_NAME}
+        }
     
     def hash_files(self, files):
         """
@@ -77,72 +141,343 @@ class HashMap:
                         hash_md5.update(chunk)
         return hash_md5.hexdigest()
 
-    def hash_directory(self, dir_path, dir_hash):
+    def hash_directory(self, children):
         """
-        Calcula um hash que incorpora o hash do diretório e seus arquivos.
+        Calcula o hash de um nó da árvore de Merkle a partir dos hashes dos seus filhos.
 
-        :param dir_path: Caminho absoluto para o diretório.
-        :param dir_hash: Hash do diretório (sem considerar os arquivos nele).
-        :return: O valor de hash MD5 em formato hexadecimal.
+        :param children: Dicionário {nome: (tipo, hash)} com tipo 'd' (pasta) ou 'f' (arquivo).
+        :return: O valor de hash do diretório em formato hexadecimal.
         """
-        files = [os.path.join(dir_path, file) for file in os.listdir(dir_path)]
-        files.sort()  # Ordenar os arquivos para garantir consistência
-        files_hash = HashMap.hash_files(files)
-        combined_hash = dir_hash + files_hash
-        return hashlib.md5(combined_hash.encode()).hexdigest()
+        hasher = Digest.new(self.algorithm)
+        for name in sorted(children):  # Ordenar os filhos para garantir consistência
+            kind, digest = children[name]
+            hasher.update(f"{kind}:{name}:{digest}\n".encode("utf-8"))
+        return hasher.hexdigest()
 
-    def create_hashmap(self):
-        start_time = time.time()
+    def build_tree(self):
+        """
+        Monta a árvore de Merkle das pastas a partir do hashmap de arquivos, sem acessar o disco.
+
+        O hash de cada pasta depende apenas dos nomes e hashes dos filhos diretos, então
+        uma mudança em um arquivo altera somente os hashes das pastas acima dele.
+        """
+        children = {"": {}}
+        for relative_path, file_hash in self.hashmap.items():
+            parent, _, name = relative_path.rpartition("/")
+            children.setdefault(parent, {})[name] = ("f", file_hash)
+            # Registra a cadeia de pastas até a raiz
+            while parent:
+                grandparent, _, dir_name = parent.rpartition("/")
+                siblings = children.setdefault(grandparent, {})
+                if dir_name in siblings:
+                    break
+                siblings[dir_name] = ("d", None)
+                parent = grandparent
+
+        # Calcula das pastas mais profundas para a raiz
+        tree = {}
+        for directory in sorted(children, key=lambda d: d.count("/") + (1 if d else 0), reverse=True):
+            entries = children[directory]
+            for name, (kind, _) in entries.items():
+                if kind == "d":
+                    entries[name] = ("d", tree[f"{directory}/{name}" if directory else name])
+            tree[directory] = self.hash_directory(entries)
+
+        self._children = children
+        self.tree = tree
+
+    def children(self, path=""):
+        """
+        Retorna um nó da árvore de Merkle com os hashes dos filhos diretos.
+
+        O formato é o mesmo respondido pelo endpoint getModpackHashTree do servidor.
+
+        :param path: Caminho relativo da pasta ('' para a raiz).
+        :return: {"algorithm", "hash", "dirs": {nome: hash}, "files": {nome: hash}} ou None se a pasta não existir.
+        """
+        if self.tree is None:
+            self.build_tree()
+        if path not in self.tree:
+            return None
+        entries = self._children[path]
+        return {
+            "algorithm": self.algorithm,
+            "hash": self.tree[path],
+            "dirs": {name: digest for name, (kind, digest) in entries.items() if kind == "d"},
+            "files": {name: digest for name, (kind, digest) in entries.items() if kind == "f"}
+        }
+
+    @staticmethod
+    def stat_key(stat_result):
+        """
+        Monta a chave de validação do cache a partir do resultado de os.stat.
+
+        :param stat_result: Resultado de os.stat para o arquivo.
+        :return: Lista [tamanho, mtime_ns, inode] usada para validar o cache.
+        """
+        return [stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino]
+
+    def load_cache(self):
+        """
+        Carrega o cache persistente de hashes do disco.
+
+        :return: Um dicionário {caminho relativo: [tamanho, mtime_ns, inode, hash]}.
+        """
+        try:
+            with open(self.cache_file_path, "r") as f:
+                cache = json.load(f)
+            # Hashes de outro algoritmo não servem para este hashmap
+            if isinstance(cache, dict) and cache.get("algorithm") == self.algorithm:
+                return cache.get("files", {})
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            self.logger.warning(f"Invalid hash cache {self.cache_file_path}, ignoring it: {e}")
+        return {}
+
+    def save_cache(self, cache):
+        """
+        Salva o cache persistente de hashes no disco.
+
+        :param cache: Dicionário {caminho relativo: [tamanho, mtime_ns, inode, hash]}.
+        """
+        try:
+            with open(self.cache_file_path, "w") as f:
+                json.dump({"algorithm": self.algorithm, "files": cache}, f)
+        except OSError as e:
+            self.logger.warning(f"Could not save hash cache {self.cache_file_path}: {e}")
+
+    def hash_pending(self, pending, progress_bar):
+        """
+        Calcula os hashes de uma lista de arquivos, em paralelo quando há mais de um worker.
+
+        Arquivos pequenos vão para um pool de threads (o custo é dominado por I/O e syscalls);
+        arquivos grandes vão para um pool de processos para usar todos os núcleos.
+
+        :param pending: Lista de tuplas (caminho relativo, caminho absoluto, tamanho).
+        :param progress_bar: Barra de progresso atualizada a cada arquivo concluído.
+        :return: Um dicionário {caminho relativo: hash}.
+        """
+        results = {}
+        if self.workers <= 1 or len(pending) < 2:
+            for relative_path, file_path, _ in pending:
+                results[relative_path] = HashMap.hash_file(file_path, self.algorithm)
+                progress_bar.update(1)
+            return results
 
-        total_files = count_files(self.directory)
-        progress_bar = tqdm(total=total_files, disable=not self.show_progress)
+        # Fora de uma varredura (ver begin_scan) o pool de processos vale só para esta chamada
+        large = [entry for entry in pending if entry[2] >= self.large_file_threshold]
+        process_pool = self._process_pool
+        temporary_pool = None
+        if process_pool is None and len(large) > 1:
+            process_pool = temporary_pool = self._create_process_pool(min(self.workers, len(large)))
 
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.workers) as thread_pool:
+            try:
+                futures = {}
+                for relative_path, file_path, size in pending:
+                    pool = process_pool if process_pool and size >= self.large_file_threshold else thread_pool
+                    futures[pool.submit(HashMap.hash_file, file_path, self.algorithm)] = relative_path
+                for future in concurrent.futures.as_completed(futures):
+                    results[futures[future]] = future.result()
+                    progress_bar.update(1)
+            finally:
+                if temporary_pool:
+                    temporary_pool.shutdown()
+        return results
+
+    def _create_process_pool(self, max_workers):
+        """
+        Cria o pool de processos dos arquivos grandes; os processos só sobem no primeiro arquivo enviado.
+
+        :return: O pool, ou None se o sistema não permitir (os arquivos grandes vão para as threads).
+        """
+        try:
+            return concurrent.futures.ProcessPoolExecutor(max_workers=max_workers)
+        except (OSError, NotImplementedError) as e:
+            self.logger.warning(f"Process pool unavailable, hashing large files on threads: {e}")
+            return None
+
+    def begin_scan(self):
+        """
+        Inicia uma varredura incremental: carrega o cache persistente de hashes e cria o pool de
+        processos compartilhado pelas chamadas de scan(). Use scan() quantas vezes precisar e
+        finalize com end_scan().
+        """
+        if self.workers > 1 and self._process_pool is None:
+            self._process_pool = self._create_process_pool(self.workers)
+        self._scan_cache = self.load_cache()
+        self._new_cache = {}
+        self._racy_limit = time.time_ns() - HashMap.RACY_WINDOW_NS
+        self.reused_hashes = 0
+
+    def scan(self, subpath="", recursive=True):
+        """
+        Calcula os hashes dos arquivos abaixo de uma pasta, reaproveitando o cache persistente.
+
+        :param subpath: Pasta relativa à raiz, com '/' como separador ('' para a raiz).
+        :param recursive: Se False, considera apenas os arquivos diretamente dentro da pasta.
+        :return: Um dicionário {caminho relativo: hash}.
+        """
+        base = os.path.join(self.directory, subpath.replace("/", os.path.sep)) if subpath else self.directory
+        keys = {}
+        pending = []
         hashmap = {}
-        for root, dirs, files in os.walk(self.directory):
+
+        for root, dirs, files in os.walk(base):
+            if not recursive:
+                dirs[:] = []
             for file in files:
                 file_path = os.path.join(root, file)
-                file_hash = HashMap.hash_file(file_path)
                 relative_path = os.path.relpath(file_path, self.directory).replace("\\", "/")
-                hashmap[relative_path] = file_hash
-                progress_bar.update(1)
+                if HashMap.is_ignored(relative_path):
+                    continue
 
+                # Reaproveita o hash se tamanho, mtime e inode não mudaram
+                key = HashMap.stat_key(os.stat(file_path))
+                keys[relative_path] = key
+                cached = self._scan_cache.get(relative_path)
+                if cached is not None and cached[:3] == key:
+                    hashmap[relative_path] = cached[3]
+                    self.reused_hashes += 1
+                else:
+                    hashmap[relative_path] = None
+                    pending.append((relative_path, file_path, key[0]))
+
+        progress_bar = tqdm(total=len(pending), disable=not self.show_progress)
+        hashmap.update(self.hash_pending(pending, progress_bar))
         progress_bar.close()
 
+        for relative_path, key in keys.items():
+            # Arquivos alterados muito recentemente podem mudar sem alterar o mtime
+            if key[1] < self._racy_limit:
+                self._new_cache[relative_path] = key + [hashmap[relative_path]]
+        return hashmap
+
+    def end_scan(self):
+        """
+        Finaliza uma varredura incremental, gravando o cache apenas com os arquivos vistos.
+        """
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+        if self.persist:
+            self.save_cache(self._new_cache)
+        self._scan_cache = self._new_cache = None
+        self.tree = None
+
+    def remember(self, digests):
+        """
+        Registra no cache persistente hashes já conhecidos de arquivos da pasta (por exemplo, arquivos
+        baixados e conferidos ou trocados por links do repositório), para não recalculá-los na próxima varredura.
+
+        :param digests: Dicionário {caminho relativo: hash}.
+        """
+        if not digests:
+            return
+        cache = self.load_cache()
+        racy_limit = time.time_ns() - HashMap.RACY_WINDOW_NS
+        for relative_path, digest in digests.items():
+            try:
+                key = HashMap.stat_key(os.stat(os.path.join(self.directory, relative_path.replace("/", os.path.sep))))
+            except OSError:
+                cache.pop(relative_path, None)
+                continue
+            if key[1] < racy_limit:
+                cache[relative_path] = key + [digest]
+            else:
+                cache.pop(relative_path, None)
+        self.save_cache(cache)
+
+    def create_hashmap(self):
+        start_time = time.time()
+
+        self.begin_scan()
+        hashmap = self.scan()
+        self.end_scan()
+
         end_time = time.time()
         self.elapsed_time = end_time - start_time
-        self.logger.info(f"Elapsed time: {self.elapsed_time:.2f} seconds")
+        self.logger.info(f"Elapsed time: {self.elapsed_time:.2f} seconds ({self.reused_hashes} cached hashes reused, {len(hashmap) - self.reused_hashes} hashed with {self.workers} workers)")
         return hashmap
 
-    def compare(self, other_hashmap):
+    def diff_tree(self, fetch_children, path=""):
         """
-        Compara dois mapas de hashes e retorna as diferenças encontradas.
+        Compara esta árvore de Merkle com outra, descendo apenas nas pastas cujo hash difere.
 
-        :param other_hashmap: Outra instância da classe HashMap a ser comparada.
-        :return: Um dicionário contendo as diferenças encontradas nos hashes.
+        :param fetch_children: Função que recebe um caminho relativo de pasta e retorna o nó
+            remoto no formato de children() (ou None se a pasta não existir do outro lado).
+        :param path: Pasta a partir da qual comparar ('' para a raiz).
+        :return: Um dicionário {caminho relativo: (hash local, hash remoto)}, com None do lado ausente.
         """
+        if self.tree is None:
+            self.build_tree()
         differences = {}
+        self.parent_changes = set()
 
-        # Primeiro, verifica as pastas pai que tiveram mudanças
-        for parent_folder in self.parent_changes:
-            if parent_folder not in other_hashmap.parent_changes:
-                continue
+        remote_root = fetch_children(path)
+        if remote_root is not None and remote_root.get("hash") == self.tree.get(path):
+            return differences
+
+        pending = [(path, remote_root)]
+        while pending:
+            current, remote = pending.pop()
+            self.parent_changes.add(current)
+            remote = remote or {"dirs": {}, "files": {}}
+            local = self.children(current) or {"dirs": {}, "files": {}}
+            prefix = f"{current}/" if current else ""
+
+            for name in local["files"].keys() | remote["files"].keys():
+                local_hash = local["files"].get(name)
+                remote_hash = remote["files"].get(name)
+                if local_hash != remote_hash:
+                    differences[prefix + name] = (local_hash, remote_hash)
+
+            for name in local["dirs"].keys() | remote["dirs"].keys():
+                local_hash = local["dirs"].get(name)
+                remote_hash = remote["dirs"].get(name)
+                if local_hash == remote_hash:
+                    continue
+                if remote_hash is None:
+                    # Pasta só existe localmente: todos os arquivos abaixo dela diferem
+                    subtree = prefix + name + "/"
+                    for key, file_hash in self.hashmap.items():
+                        if key.startswith(subtree):
+                            differences[key] = (file_hash, None)
+                            self.parent_changes.add(key.rpartition("/")[0])
+                else:
+                    pending.append((prefix + name, fetch_children(prefix + name)))
+
+        return differences
+
+    @staticmethod
+    def diff_maps(local_map, remote_map):
+        """
+        Compara dois hashmaps planos arquivo a arquivo.
 
-            if self.hashmap[parent_folder] != other_hashmap.hashmap[parent_folder]:
-                differences[parent_folder] = (
-                    self.hashmap[parent_folder], other_hashmap.hashmap[parent_folder]
-                )
-
-            # Agora, verifique os filhos dessa pasta
-            for key in self.hashmap.keys():
-                if key.startswith(parent_folder + os.path.sep):
-                    if key in other_hashmap.hashmap:
-                        if self.hashmap[key] != other_hashmap.hashmap[key]:
-                            differences[key] = (
-                                self.hashmap[key], other_hashmap.hashmap[key]
-                            )
-        
+        :param local_map: Dicionário {caminho relativo: hash} local.
+        :param remote_map: Dicionário {caminho relativo: hash} remoto.
+        :return: Um dicionário {caminho relativo: (hash local, hash remoto)}, com None do lado ausente.
+        """
+        differences = {}
+        for key in local_map.keys() | remote_map.keys():
+            local_hash = local_map.get(key)
+            remote_hash = remote_map.get(key)
+            if local_hash != remote_hash:
+                differences[key] = (local_hash, remote_hash)
         return differences
 
+    def compare(self, other_hashmap):
+        """
+        Compara dois mapas de hashes e retorna as diferenças encontradas.
+
+        Apenas as pastas cujo hash de Merkle difere são visitadas; elas ficam registradas em parent_changes.
+
+        :param other_hashmap: Outra instância da classe HashMap a ser comparada.
+        :return: Um dicionário contendo as diferenças encontradas nos hashes.
+        """
+        return self.diff_tree(other_hashmap.children)
+
     def save_to_file(self, file_path):
         """
         Salva o hashmap em um arquivo JSON.
@@ -150,7 +485,7 @@ class HashMap:
         :param file_path: O caminho absoluto para o arquivo JSON a ser criado.
         """
         with open(file_path, "w") as f:
-            json.dump(self.hashmap, f, indent=4)
+            json.dump(self.to_document(), f, indent=4, sort_keys=True)
 
     def load_from_file(self, file_path):
         """
@@ -160,13 +495,22 @@ class HashMap:
         """
         try:
             with open(file_path, "r") as f:
-                self.hashmap = json.load(f)
+                algorithm, hashmap = HashMap.parse_document(json.load(f))
         except FileNotFoundError:
             self.logger.info(f"File {file_path} not found. Creating a new hashmap.")
             self.hashmap = self.create_hashmap()
+            return
+
+        if self.requested_algorithm and algorithm != self.requested_algorithm:
+            self.logger.info(f"Hashmap {file_path} uses {algorithm}, rebuilding with {self.requested_algorithm}.")
+            self.hashmap = self.create_hashmap()
+        else:
+            self.algorithm = algorithm
+            self.hashmap = hashmap
     
     def load_from_json(self, json:json):
         """
-        Carrega um hashmap existente de uma variavel JSON.
+        Carrega um hashmap existente de uma variavel JSON (formato versionado ou legado).
         """
-        self.hashmap = json
\ No newline at end of file
+        self.algorithm, self.hashmap = HashMap.parse_document(json)
+        self.tree = None
\ No newline at end of file
@@ -3,11 +3,11 @@ import json , re
 
 class CustomJSONDecoder(json.JSONDecoder):
     """
-    Uma classe personalizada que estende json.JSONDecoder para fornecer decodificação JSON com modificações específicas.
+    Decodificador JSON que aceita comentários (// e /* */) e vírgulas sobrando, como os manifestos do SMAPI.
     """
     def decode(self, s, _w=json.decoder.WHITESPACE.match):
         """
-        Decodifica uma string JSON com a remoção de vírgulas inválidas.
+        Decodifica uma string JSON tolerante.
         
         Args:
             s (str): A string JSON para decodificar.
@@ -15,34 +15,50 @@ class CustomJSONDecoder(json.JSONDecoder):
         Returns:
             dict: O objeto Python correspondente aos dados JSON decodificados.
         """
-        s = self._remove_comments(s)
-        s = self._remove_invalid_commas(s)
-        return super().decode(s, _w)
-    
-    def _remove_comments(self, s):
+        try:
+            # JSON estrito (a maioria dos arquivos) não precisa passar pelo tokenizador
+            return super().decode(s, _w)
+        except json.JSONDecodeError:
+            return super().decode(JasonAutoFix.strip(s), _w)
+
+class JasonAutoFix:
+    # Strings vêm primeiro na alternância para que vírgulas e barras dentro delas nunca sejam tocadas.
+    # As repetições não se aninham, então cada trecho é lido uma vez (tempo linear, sem retrocesso).
+    STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"?'
+    COMMENT = r'//[^\n]*|/\*[^*]*(?:\*+[^*/][^*]*)*(?:\*+/|\Z)'
+    TOKEN_PATTERN = re.compile(f'({STRING})|({COMMENT})|,(?=(?:\\s|{COMMENT})*[\\]}}])')
+
+    @staticmethod
+    def _replace_token(match):
+        string, comment = match.group(1), match.group(2)
+        if string is not None:
+            return string
+        if comment is not None:
+            # Mantém as quebras de linha para que os erros apontem a linha certa
+            return '\n' * comment.count('\n') or ' '
+        return ''  # Vírgula seguida apenas de espaços e comentários antes de } ou ]
+
+    @staticmethod
+    def strip(s):
         """
-        Remove comentários do formato /* ... */ de uma string JSON.
-        
+        Remove comentários (// e /* */) e vírgulas sobrando antes de } ou ] de um texto JSON, em uma única
+        passada que respeita strings.
+
         Args:
-            s (str): A string JSON contendo comentários.
-        
+            s (str): O texto JSON tolerante (como os manifestos do SMAPI).
+
         Returns:
-            str: A string JSON com comentários removidos.
+            str: O texto em JSON estrito.
         """
-        return re.sub(r'/\*.*?\*/', '', s, flags=re.DOTALL)
-    
-    def _remove_invalid_commas(self, s):
-        # Remove espaços desnecessários após vírgulas
-        s = re.sub(r',\s+', ',', s)
-        # Coloca as vírgulas após chaves e colchetes na próxima linha
-        s = re.sub(r',(?=\s*[\}\]])', ',\n', s)
-        # Remove vírgulas extras dentro de objetos
-        s = re.sub(r',(\s*\})', r'\1', s)
-        # Remove vírgulas extras após o último elemento
-        s = re.sub(r',(\s*[\}\]])', r'\1', s)
-        return s
+        return JasonAutoFix.TOKEN_PATTERN.sub(JasonAutoFix._replace_token, s)
+
+    @staticmethod
+    def loads(s, **kwargs):
+        """
+        Decodifica um texto JSON tolerante (comentários e vírgulas sobrando).
+        """
+        return json.loads(s, cls=CustomJSONDecoder, **kwargs)
 
-class JasonAutoFix:
     @staticmethod
     def load(filepath, **kwargs):
         if 'encoding' not in kwargs:
@@ -0,0 +1,135 @@
+import os, json, logging, sqlite3, time
+from contextlib import closing
+from src.tools import JasonAutoFix, HashMap
+
+class ModCatalog:
+    """
+    Catálogo SQLite com os dados dos manifest.json dos mods de uma modpack.
+
+    Cada mod é relido apenas quando o mtime (ou o tamanho) do seu manifest.json muda; nas demais
+    listagens basta um stat por pasta e uma única consulta, em vez de abrir e decodificar todos os
+    manifestos. O arquivo fica na pasta da modpack e não entra no hashmap (ver HashMap.IGNORED_FILES).
+    """
+
+    FILE_NAME = HashMap.CATALOG_FILE_NAME
+    SCHEMA_VERSION = 1
+    # Campos do manifest.json guardados no catálogo: (chave no manifesto, coluna, valor padrão)
+    FIELDS = [
+        ("Name", "name", ""),
+        ("Author", "author", ""),
+        ("Version", "version", ""),
+        ("Description", "description", ""),
+        ("UniqueID", "unique_id", ""),
+        ("EntryDll", "entry_dll", ""),
+        ("MinimumApiVersion", "minimum_api_version", ""),
+        ("UpdateKeys", "update_keys", []),
+        ("Dependencies", "dependencies", []),
+    ]
+    JSON_COLUMNS = {"update_keys", "dependencies"}
+
+    def __init__(self, directory):
+        """
+        :param directory: A pasta da modpack, onde o catálogo é gravado.
+        """
+        self.logger = logging.getLogger('ModCatalog')
+        self.path = os.path.join(directory, ModCatalog.FILE_NAME)
+        with self._connect() as connection:
+            self._create_schema(connection)
+
+    def _connect(self):
+        # Uma conexão por operação: o catálogo é usado tanto pela interface quanto pelas threads de sincronização
+        return closing(sqlite3.connect(self.path, timeout=10))
+
+    @staticmethod
+    def _create_schema(connection):
+        version = connection.execute("PRAGMA user_version").fetchone()[0]
+        if version == ModCatalog.SCHEMA_VERSION:
+            return
+        columns = ", ".join(f"{column} TEXT" for _, column, _ in ModCatalog.FIELDS)
+        with connection:
+            connection.execute("DROP TABLE IF EXISTS mods")
+            connection.execute(f"""
+                CREATE TABLE mods (
+                    folder TEXT NOT NULL,
+                    enabled INTEGER NOT NULL,
+                    manifest_mtime INTEGER,
+                    manifest_size INTEGER,
+                    {columns},
+                    PRIMARY KEY (enabled, folder)
+                )""")
+            connection.execute("CREATE INDEX mods_unique_id ON mods (unique_id COLLATE NOCASE)")
+            connection.execute(f"PRAGMA user_version = {ModCatalog.SCHEMA_VERSION}")
+
+    @staticmethod
+    def _manifest_stat(mods_path, folder):
+        try:
+            stat_result = os.stat(os.path.join(mods_path, folder, 'manifest.json'))
+        except OSError:
+            return None, None
+        return stat_result.st_mtime_ns, stat_result.st_size
+
+    @staticmethod
+    def _to_row(manifest_data):
+        row = []
+        for key, column, default in ModCatalog.FIELDS:
+            value = manifest_data.get(key, default)
+            row.append(json.dumps(value) if column in ModCatalog.JSON_COLUMNS else value)
+        return row
+
+    @staticmethod
+    def _to_manifest(row):
+        manifest_data = {}
+        for (key, column, default), value in zip(ModCatalog.FIELDS, row):
+            if value is None:
+                value = default
+            elif column in ModCatalog.JSON_COLUMNS:
+                value = json.loads(value)
+            manifest_data[key] = value
+        return manifest_data
+
+    def list_mods(self, mods_path, enabled):
+        """
+        Lista os mods de uma pasta, relendo apenas os manifestos que mudaram desde a última listagem.
+
+        :param mods_path: A pasta dos mods (mods_enabled ou mods_disabled).
+        :param enabled: Se a pasta é a dos mods habilitados.
+        :return: Lista de tuplas (nome da pasta, dados do manifesto no formato do manifest.json) ordenada
+            pelo nome da pasta; mods sem manifest.json vêm com os valores padrão.
+        """
+        folders = os.listdir(mods_path) if os.path.exists(mods_path) else []
+        flag = 1 if enabled else 0
+        column_names = ", ".join(column for _, column, _ in ModCatalog.FIELDS)
+        with self._connect() as connection:
+            known = {folder: (mtime, size) for folder, mtime, size in connection.execute(
+                "SELECT folder, manifest_mtime, manifest_size FROM mods WHERE enabled = ?", (flag,))}
+            stale = []
+            for folder in folders:
+                key = ModCatalog._manifest_stat(mods_path, folder)
+                if known.get(folder) != key:
+                    stale.append((folder, key))
+            removed = [(flag, folder) for folder in set(known) - set(folders)]
+
+            if stale or removed:
+                racy_limit = time.time_ns() - HashMap.RACY_WINDOW_NS
+                rows = []
+                for folder, (mtime, size) in stale:
+                    manifest_data = JasonAutoFix.load(os.path.join(mods_path, folder, 'manifest.json')) if mtime is not None else {}
+                    # Manifesto alterado agora pode mudar de novo sem alterar o mtime: fica para ser relido
+                    if mtime is not None and mtime >= racy_limit:
+                        mtime = None
+                    rows.append([folder, flag, mtime, size] + ModCatalog._to_row(manifest_data))
+                placeholders = ", ".join("?" * (4 + len(ModCatalog.FIELDS)))
+                with connection:
+                    connection.executemany("DELETE FROM mods WHERE enabled = ? AND folder = ?", removed)
+                    connection.executemany(f"INSERT OR REPLACE INTO mods (folder, enabled, manifest_mtime, manifest_size, {column_names}) VALUES ({placeholders})", rows)
+                self.logger.debug(f"Catalog of {mods_path}: {len(stale)} manifests read, {len(removed)} mods removed")
+
+            return [(folder, ModCatalog._to_manifest(row)) for folder, *row in connection.execute(
+                f"SELECT folder, {column_names} FROM mods WHERE enabled = ? ORDER BY folder", (flag,))]
+
+    def clear(self):
+        """
+        Esvazia o catálogo; a próxima listagem relê todos os manifestos.
+        """
+        with self._connect() as connection, connection:
+            connection.execute("DELETE FROM mods")
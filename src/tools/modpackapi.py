@@ -1,6 +1,8 @@
 import requests
-from src.tools import JasonAutoFix
-import logging
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.tools import JasonAutoFix, Digest, HashMap, Delta, Compression, TokenBucket, ThrottledReader, ContentStore, MultipartBody
+import logging, os, json, tempfile, zipfile
 class ModpackApi:
     """
     Uma classe que oferece métodos para interagir com uma API de modpacks.
@@ -11,14 +13,132 @@ class ModpackApi:
     :param base_url: A URL base da API.
     """
     
-    def __init__(self, base_url):
+    RETRY_STATUS = (429, 500, 502, 503, 504)  # Respostas transitórias que valem nova tentativa
+    UNSUPPORTED_STATUS = (404, 405, 501)  # Respostas de servidores sem um endpoint opcional
+    ENCODING_REJECTED_STATUS = (400, 411, 413, 415)  # Respostas (além de 5xx) de servidores que não entendem Content-Encoding
+    SPOOL_SIZE = 8 * 1024 * 1024  # Corpo comprimido mantido em memória antes de ir para o disco
+    CHUNK_SIZE = 256 * 1024  # Memória máxima por download em andamento
+    
+    def __init__(self, base_url, max_connections=20, retries=3, backoff_factor=0.5, timeout=(5, 60), compression=None, bucket=None):
         """
         Inicializa uma nova instância da classe ModpackApi.
         
+        Todas as requisições usam uma única requests.Session com keep-alive, cujo pool de conexões
+        acompanha o número de transferências simultâneas.
+        
         :param base_url: A URL base da API.
+        :param max_connections: Tamanho do pool de conexões reaproveitadas.
+        :param retries: Número de novas tentativas em erros de conexão e respostas transitórias.
+        :param backoff_factor: Fator do intervalo exponencial entre as tentativas, em segundos.
+        :param timeout: Tupla (conexão, leitura) de timeouts em segundos.
+        :param compression: Política de compressão das transferências (Compression); None usa a padrão.
+        :param bucket: Limite global de banda (TokenBucket) dos uploads e downloads; None não limita.
         """
         self.base_url = base_url
         self.logger = logging.getLogger(f'Sync-Api')
+        self.compression = compression if compression is not None else Compression()
+        self.bucket = bucket if bucket is not None else TokenBucket()
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=ModpackApi.RETRY_STATUS,
+            allowed_methods=None,  # Uploads e remoções são idempotentes nesta API
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections, max_retries=retry)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.bulk_delete_supported = True
+        self.delta_supported = True
+
+    def close(self):
+        """
+        Fecha as conexões mantidas pelo pool.
+        """
+        self.session.close()
+
+    def _post_files(self, url, files, headers, data=None, file_name=None, size=None):
+        """
+        Envia um POST multipart, comprimindo o corpo com a política de compressão quando compensa.
+        O corpo é lido dos arquivos em blocos durante o envio (ver MultipartBody), sem ser montado na memória.
+        
+        :param url: A URL do endpoint.
+        :param files: Os arquivos do multipart, como em requests.
+        :param headers: Os cabeçalhos da requisição.
+        :param data: Os campos de formulário, como em requests.
+        :param file_name: Nome do arquivo enviado, usado para decidir se comprime.
+        :param size: Tamanho do arquivo enviado, se conhecido.
+        :return: A resposta do servidor.
+        """
+        raw_body = MultipartBody(files, data)
+        raw_length = len(raw_body)
+        prepared = self.session.prepare_request(requests.Request('POST', url, headers=headers))
+        prepared.headers['Content-Type'] = raw_body.content_type
+        
+        def send(body, length, encoding=None):
+            if encoding:
+                prepared.headers['Content-Encoding'] = encoding
+            else:
+                prepared.headers.pop('Content-Encoding', None)
+            prepared.headers['Content-Length'] = str(length)
+            body.seek(0)
+            # Com limite de banda o corpo é lido aos poucos, consumindo tokens do balde
+            prepared.body = ThrottledReader(body, self.bucket) if self.bucket.limited else body
+            return self.session.send(prepared, timeout=self.timeout)
+        
+        encoding = self.compression.choose(file_name, size) if file_name else None
+        if encoding is None:
+            return send(raw_body, raw_length)
+        # O corpo comprimido vai para um arquivo temporário: a requisição não fica com duas cópias na memória
+        with tempfile.SpooledTemporaryFile(max_size=ModpackApi.SPOOL_SIZE) as body:
+            compressor = self.compression.compressor(encoding)
+            raw_body.seek(0)
+            for chunk in iter(lambda: raw_body.read(ModpackApi.CHUNK_SIZE), b""):
+                body.write(compressor.compress(chunk))
+            body.write(compressor.flush())
+            length = body.tell()
+            if length > raw_length * Compression.MIN_RATIO:
+                return send(raw_body, raw_length)
+            try:
+                response = send(body, length, encoding)
+            except requests.RequestException as e:
+                # Alguns servidores derrubam a conexão em vez de responder a um Content-Encoding desconhecido
+                failure = f'error {e}'
+            else:
+                if 200 <= response.status_code < 300:
+                    return response
+                # 401 e 403 não têm relação com a compressão: reenviar só repetiria a recusa
+                if response.status_code not in ModpackApi.ENCODING_REJECTED_STATUS and response.status_code < 500:
+                    return response
+                failure = f'status {response.status_code}'
+        raw_response = send(raw_body, raw_length)
+        if 200 <= raw_response.status_code < 300:
+            self.logger.info(f'Compressed upload failed with {failure} but raw bytes were accepted, disabling upload compression')
+            self.compression.upload_enabled = False
+        return raw_response
+    
+    def _iter_content(self, response):
+        """
+        Itera o corpo de uma resposta em blocos, decodificando o Content-Encoding (zstd ou gzip).
+        
+        :param response: Resposta obtida com stream=True.
+        :return: Gerador com os blocos decodificados.
+        """
+        decoder = Compression.decoder(response.headers.get('Content-Encoding'))
+        for chunk in response.raw.stream(ModpackApi.CHUNK_SIZE, decode_content=False):
+            self.bucket.consume(len(chunk))
+            if decoder:
+                chunk = decoder.decompress(chunk)
+            if chunk:
+                yield chunk
+        if decoder:
+            tail = decoder.flush()
+            if tail:
+                yield tail
 
     def create_modpack_directory(self, uuid, token):
         """
@@ -29,7 +149,7 @@ class ModpackApi:
         :return: Um dicionário contendo a resposta da API.
         """
         url = f"{self.base_url}/createModpackDirectory/{uuid}/{token}"
-        response = requests.post(url)
+        response = self.session.post(url, timeout=self.timeout)
         self.logger.debug(f'Creating directory for the modpack (UUID: {uuid}, Token: {token})')
         self.logger.debug(f'Request status: {response.status_code}')
         return {'status': response.status_code , 'json':response.json(), 'response':response}
@@ -50,8 +170,12 @@ class ModpackApi:
         headers = {"token": f"{token}"}
         # Cria um dicionário de arquivos para enviar na requisição
         files = {"file": file}
-        # Envia a requisição POST para a API de upload
-        response = requests.post(url, files=files, headers=headers)
+        try:
+            size = os.fstat(file.fileno()).st_size
+        except (AttributeError, OSError):
+            size = None
+        # Envia a requisição POST para a API de upload, comprimida quando o formato do arquivo permite
+        response = self._post_files(url, files, headers, file_name=remoteDirfile, size=size)
         self.logger.debug(f'Uploading a file to the modpack (UUID: {uuid}, Token: {token})')
         self.logger.debug(f'Remote file path: {remoteDirfile}')
         self.logger.debug(f'Request status: {response.status_code}')
@@ -68,7 +192,7 @@ class ModpackApi:
         
         :param uuid: O UUID da modpack.
         :param token: O token de autenticação.
-        :param zip_file_path: O caminho para o arquivo ZIP a ser enviado.
+        :param zip_file_path: O caminho para o arquivo ZIP a ser enviado, ou um arquivo já aberto.
         :return: Um dicionário contendo a resposta da API.
         """
         # Constrói a URL de upload com base no UUID
@@ -76,12 +200,12 @@ class ModpackApi:
         # Define os cabeçalhos da requisição
         headers = {"token": f"{token}"}
         # Lê o conteúdo do arquivo ZIP
-        with open(zip_file_path, "rb") as zip_file:
+        with (open(zip_file_path, "rb") if isinstance(zip_file_path, (str, os.PathLike)) else zip_file_path) as zip_file:
             # Cria um dicionário de arquivos para enviar na requisição
-            files = {"file": zip_file}
+            files = {"file": ("batch.zip", zip_file, "application/zip")}
             # Envia a requisição POST para a API de upload e descompactação
-            response = requests.post(url, files=files, headers=headers)
-            self.logger.debug(f'Checking ownership (UUID: {uuid}, Token: {token})')
+            response = self._post_files(url, files, headers, file_name="batch.zip")
+            self.logger.debug(f'Uploading zip to the modpack (UUID: {uuid}, Token: {token})')
             self.logger.debug(f'Request status: {response.status_code}')
 
         try:
@@ -90,6 +214,27 @@ class ModpackApi:
             json = {}
         return {'status': response.status_code, 'json': json, 'response': response}
     
+    def upload_files_batch(self, uuid, token, entries, spool_size=8 * 1024 * 1024):
+        """
+        Envia vários arquivos pequenos em uma única requisição, compactados em um ZIP
+        que o servidor descompacta na pasta da modpack (endpoint uploadAndUnzip).
+        
+        O ZIP é montado em um arquivo temporário que só vai para o disco se passar de spool_size.
+        
+        :param uuid: O UUID da modpack.
+        :param token: O token de autenticação.
+        :param entries: Lista de tuplas (caminho local, caminho relativo na modpack com '/').
+        :param spool_size: Tamanho máximo do ZIP mantido em memória, em bytes.
+        :return: Um dicionário contendo a resposta da API.
+        """
+        with tempfile.SpooledTemporaryFile(max_size=spool_size) as spool:
+            with zipfile.ZipFile(spool, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                for local_path, remote_path in entries:
+                    archive.write(local_path, remote_path)
+            spool.seek(0)
+            self.logger.debug(f'Uploading batch of {len(entries)} files (UUID: {uuid})')
+            return self.upload_modpack_zip(uuid, token, spool)
+    
     def get_modpack_info(self, uuid):
         """
         Obtém informações sobre uma modpack com base no UUID.
@@ -98,20 +243,47 @@ class ModpackApi:
         :return: Um dicionário contendo as informações da modpack.
         """
         url = f"{self.base_url}/getModpackInfo/{uuid}"
-        response = requests.get(url)
+        response = self.session.get(url, timeout=self.timeout)
         return {'status': response.status_code , 'json':response.json(), 'response':response}
     
-    def get_modpack_hash_map(self, uuid):
+    def get_modpack_hash_map(self, uuid, algorithms=None):
         """
         Obtém o mapa de hash de uma modpack com base no UUID.
 
+        Servidores que suportam o formato versionado respondem com {"version", "algorithm", "files"}
+        usando o primeiro algoritmo da lista que conhecem; servidores antigos ignoram o parâmetro
+        e respondem com o dicionário plano de MD5.
+
         :param uuid: O UUID da modpack.
+        :param algorithms: Lista de algoritmos aceitos pelo cliente, em ordem de preferência.
         :return: Um dicionário contendo as informações do mapa de hash da modpack.
         """
         url = f"{self.base_url}/getModpackHashMap/{uuid}"
-        response = requests.get(url)
+        params = {"algorithms": ",".join(algorithms)} if algorithms else None
+        response = self.session.get(url, params=params, timeout=self.timeout)
         return {'status': response.status_code , 'json':response.json(), 'response':response}
 
+    def get_modpack_hash_tree(self, uuid, path="", algorithms=None):
+        """
+        Obtém um nó da árvore de Merkle de uma modpack: o hash da pasta e os hashes dos filhos diretos.
+
+        A resposta tem o formato {"algorithm", "hash", "dirs": {nome: hash}, "files": {nome: hash}}.
+        Servidores sem suporte à árvore respondem 404 e o cliente deve usar get_modpack_hash_map.
+
+        :param uuid: O UUID da modpack.
+        :param path: O caminho relativo da pasta ('' para a raiz).
+        :param algorithms: Lista de algoritmos aceitos pelo cliente, em ordem de preferência.
+        :return: Um dicionário contendo a resposta da API.
+        """
+        url = f"{self.base_url}/getModpackHashTree/{uuid}/{path}"
+        params = {"algorithms": ",".join(algorithms)} if algorithms else None
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        try:
+            json = response.json()
+        except:
+            json = None
+        return {'status': response.status_code, 'json': json, 'response': response}
+
     def download_modpack_file(self, uuid, file_path):
         """
         Faz o download de um arquivo da pasta da modpack.
@@ -121,13 +293,260 @@ class ModpackApi:
         :return: O conteúdo do arquivo baixado (bytes) ou None em caso de erro.
         """
         url = f"{self.base_url}/getModpackFile/{uuid}/{file_path}"
-        response = requests.get(url)
+        response = self.session.get(url, timeout=self.timeout)
         
         if response.status_code == 200:
             return {'status': response.status_code , 'content':response.content, 'response':response}
         else:
             return {'status': response.status_code , 'content':None, 'response':response}
         
+    def download_modpack_file_to(self, uuid, file_path, destination, algorithm=None, expected_digest=None):
+        """
+        Faz o download de um arquivo da pasta da modpack direto para o disco, em blocos.
+        
+        O conteúdo é gravado em um arquivo temporário na mesma pasta do destino, com o hash calculado
+        durante a escrita, e só então renomeado atomicamente para o destino. A memória usada fica
+        limitada a CHUNK_SIZE independente do tamanho do arquivo.
+        
+        Quando expected_digest é informado o download pode ser retomado: o arquivo parcial e o hash
+        esperado sobrevivem a falhas e reinícios, e a próxima chamada pede apenas o restante com um
+        cabeçalho Range. Se o hash remoto mudou desde então, o parcial é descartado.
+        
+        :param uuid: O UUID da modpack.
+        :param file_path: O caminho do arquivo na modpack.
+        :param destination: O caminho local onde o arquivo deve ser gravado.
+        :param algorithm: Algoritmo de hash (ver Digest) calculado durante a escrita, ou None.
+        :param expected_digest: Hash do arquivo no hashmap remoto; habilita a retomada e a conferência.
+        :return: Um dicionário com o status, o hash do conteúdo recebido (ou None) e a resposta. Se o hash
+            não confere com expected_digest, o destino não é alterado.
+        """
+        url = f"{self.base_url}/getModpackFile/{uuid}/{file_path}"
+        part_path = f"{destination}{HashMap.PART_SUFFIX}"
+        meta_path = f"{destination}{HashMap.PART_META_SUFFIX}"
+        resumable = expected_digest is not None
+        hasher = Digest.new(algorithm) if algorithm else None
+        
+        offset = self._resume_offset(part_path, meta_path, expected_digest, algorithm) if resumable else 0
+        if offset:
+            # O Range vale para a representação pedida: a retomada pede os bytes sem compressão
+            headers = {"Range": f"bytes={offset}-", "Accept-Encoding": Compression.IDENTITY}
+        else:
+            headers = {"Accept-Encoding": self.compression.accept_encoding()}
+        
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            if offset and response.status_code == 416:
+                # O parcial não corresponde mais ao arquivo remoto: recomeça do zero
+                self._discard_part(part_path, meta_path)
+                return self.download_modpack_file_to(uuid, file_path, destination, algorithm, expected_digest)
+            if response.status_code not in (200, 206):
+                return {'status': response.status_code, 'digest': None, 'response': response}
+            
+            if response.status_code == 206:
+                self.logger.debug(f'Resuming {file_path} at byte {offset}')
+                if hasher:
+                    # Recalcula o hash do trecho já baixado para continuar a partir dele
+                    with open(part_path, 'rb') as part_file:
+                        for chunk in iter(lambda: part_file.read(HashMap.CHUNK_SIZE), b""):
+                            hasher.update(chunk)
+                mode = 'ab'
+            else:
+                # Servidor ignorou o Range (ou não havia parcial): grava o arquivo inteiro
+                mode = 'wb'
+            
+            os.makedirs(os.path.dirname(destination), exist_ok=True)
+            if resumable and mode == 'wb':
+                with open(meta_path, 'w') as meta_file:
+                    json.dump({'algorithm': algorithm, 'digest': expected_digest}, meta_file)
+            try:
+                with open(part_path, mode) as part_file:
+                    for chunk in self._iter_content(response):
+                        part_file.write(chunk)
+                        if hasher:
+                            hasher.update(chunk)
+                digest = hasher.hexdigest() if hasher else None
+                if digest is not None and expected_digest is not None and digest != expected_digest:
+                    # Conteúdo corrompido: o destino fica como estava e o parcial não serve para retomar
+                    self._discard_part(part_path, meta_path)
+                    return {'status': 200, 'digest': digest, 'response': response}
+                ContentStore.release(destination)
+                os.replace(part_path, destination)
+            except BaseException:
+                # Downloads retomáveis mantêm o parcial para a próxima tentativa
+                if not resumable:
+                    self._discard_part(part_path, meta_path)
+                raise
+            if resumable and os.path.exists(meta_path):
+                os.remove(meta_path)
+        
+        self.logger.debug(f'Downloaded {file_path} to {destination}')
+        return {'status': 200, 'digest': digest, 'response': response}
+    
+    def _resume_offset(self, part_path, meta_path, expected_digest, algorithm):
+        """
+        Calcula de onde um download parcial pode ser retomado.
+        
+        :return: O tamanho do parcial válido, ou 0 se não houver parcial reaproveitável.
+        """
+        if not os.path.exists(part_path):
+            return 0
+        try:
+            with open(meta_path, 'r') as meta_file:
+                meta = json.load(meta_file)
+        except (OSError, ValueError):
+            meta = {}
+        if meta.get('digest') != expected_digest or meta.get('algorithm') != algorithm:
+            self._discard_part(part_path, meta_path)
+            return 0
+        return os.path.getsize(part_path)
+    
+    @staticmethod
+    def _discard_part(part_path, meta_path):
+        """
+        Remove um download parcial e seus metadados.
+        """
+        for path in (part_path, meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+        
+    def file_exists(self, uuid, file_path):
+        """
+        Verifica se um arquivo existe no servidor, pedindo apenas o primeiro byte dele.
+        
+        :param uuid: O UUID da modpack.
+        :param file_path: O caminho do arquivo na modpack.
+        :return: True se o servidor respondeu com o conteúdo do arquivo.
+        """
+        url = f"{self.base_url}/getModpackFile/{uuid}/{file_path}"
+        headers = {"Range": "bytes=0-0", "Accept-Encoding": Compression.IDENTITY}
+        with self.session.get(url, headers=headers, stream=True, timeout=self.timeout) as response:
+            return response.status_code in (200, 206)
+    
+    def get_file_signature(self, uuid, file_path, block_size=Delta.BLOCK_SIZE):
+        """
+        Obtém a assinatura de blocos (ver Delta.signature) da versão de um arquivo no servidor.
+        
+        :param uuid: O UUID da modpack.
+        :param file_path: O caminho do arquivo na modpack.
+        :param block_size: Tamanho dos blocos em bytes.
+        :return: Um dicionário contendo o status e a assinatura em JSON.
+        """
+        url = f"{self.base_url}/getModpackFileSignature/{uuid}/{file_path}"
+        response = self.session.get(url, params={"block_size": block_size}, timeout=self.timeout)
+        self.logger.debug(f'Signature of {file_path} (UUID: {uuid}), status: {response.status_code}')
+        try:
+            json = response.json()
+        except:
+            json = {}
+        return {'status': response.status_code, 'json': json, 'response': response}
+    
+    def upload_file_delta(self, uuid, token, remoteDirfile, local_path, algorithm=Digest.DEFAULT, block_size=Delta.BLOCK_SIZE, spool_size=8 * 1024 * 1024):
+        """
+        Envia apenas as diferenças de um arquivo modificado em relação à versão que está no servidor.
+        O servidor reconstrói o arquivo e confere o hash informado antes de substituí-lo.
+        
+        :param uuid: O UUID da modpack.
+        :param token: O token de autenticação.
+        :param remoteDirfile: O caminho do arquivo relativo à pasta da modpack.
+        :param local_path: O caminho local da versão nova do arquivo.
+        :param algorithm: Algoritmo do hash enviado para verificação.
+        :param block_size: Tamanho dos blocos da assinatura.
+        :param spool_size: Tamanho máximo do delta mantido em memória, em bytes.
+        :return: Um dicionário contendo a resposta da API, ou None se o delta não se aplica
+                 (servidor sem suporte, arquivo ausente no servidor ou poucas partes em comum);
+                 nesse caso o arquivo deve ser enviado inteiro.
+        """
+        if not self.delta_supported:
+            return None
+        res = self.get_file_signature(uuid, remoteDirfile, block_size)
+        # Um 404 pode ser a falta do endpoint ou do arquivo: só desativa o delta se o arquivo existe
+        if res['status'] in (405, 501) or (res['status'] == 404 and self.file_exists(uuid, remoteDirfile)):
+            self.logger.info('Server has no delta endpoints, sending whole files')
+            self.delta_supported = False
+            return None
+        if res['status'] != 200 or "blocks" not in res['json']:
+            return None
+        
+        with tempfile.SpooledTemporaryFile(max_size=spool_size) as spool:
+            digest = Delta.write_delta(local_path, res['json'], spool, algorithm)
+            if digest is None:
+                return None
+            delta_size = spool.tell()
+            spool.seek(0)
+            url = f"{self.base_url}/uploadFileDelta/{uuid}/{remoteDirfile}"
+            data = {"algorithm": algorithm, "digest": digest, "block_size": res['json']["block_size"]}
+            response = self._post_files(url, {"file": ("delta.bin", spool, "application/octet-stream")}, {"token": f"{token}"}, data, "delta.bin", delta_size)
+        self.logger.debug(f'Uploaded delta of {remoteDirfile} ({delta_size} of {os.path.getsize(local_path)} bytes), status: {response.status_code}')
+        if response.status_code in (405, 501):
+            self.delta_supported = False
+            return None
+        if response.status_code not in (200, 201):
+            return None
+        try:
+            json = response.json()
+        except:
+            json = {}
+        return {'status': response.status_code, 'json': json, 'response': response}
+    
+    def download_modpack_file_delta(self, uuid, file_path, destination, algorithm, expected_digest, block_size=Delta.BLOCK_SIZE, spool_size=8 * 1024 * 1024):
+        """
+        Atualiza um arquivo local baixando apenas as diferenças em relação à versão do servidor.
+        
+        A assinatura do arquivo local é enviada ao servidor, que responde com o delta. O arquivo novo
+        é reconstruído em um parcial ao lado do destino, conferido com o hash esperado e só então
+        renomeado atomicamente para o destino.
+        
+        :param uuid: O UUID da modpack.
+        :param file_path: O caminho do arquivo na modpack.
+        :param destination: O caminho local do arquivo, usado também como versão antiga.
+        :param algorithm: Algoritmo de hash (ver Digest) do hashmap remoto.
+        :param expected_digest: Hash do arquivo no hashmap remoto.
+        :param block_size: Tamanho dos blocos da assinatura.
+        :param spool_size: Tamanho máximo do delta mantido em memória, em bytes.
+        :return: Um dicionário com o status, o hash do conteúdo gravado e a resposta, ou None se
+                 o delta não se aplica; nesse caso o arquivo deve ser baixado inteiro.
+        """
+        if not self.delta_supported or not os.path.isfile(destination):
+            return None
+        url = f"{self.base_url}/getModpackFileDelta/{uuid}/{file_path}"
+        part_path = f"{destination}{HashMap.PART_SUFFIX}"
+        signature = Delta.signature(destination, block_size)
+        
+        with tempfile.SpooledTemporaryFile(max_size=spool_size) as spool:
+            headers = {"Accept-Encoding": self.compression.accept_encoding()}
+            with self.session.post(url, json=signature, headers=headers, stream=True, timeout=self.timeout) as response:
+                # O arquivo está no hashmap remoto, então um 404 aqui é a falta do endpoint
+                if response.status_code in ModpackApi.UNSUPPORTED_STATUS:
+                    self.logger.info('Server has no delta endpoints, downloading whole files')
+                    self.delta_supported = False
+                    return None
+                if response.status_code != 200:
+                    return None
+                for chunk in self._iter_content(response):
+                    spool.write(chunk)
+            delta_size = spool.tell()
+            spool.seek(0)
+            
+            hasher = Digest.new(algorithm)
+            try:
+                with open(part_path, 'wb') as part_file:
+                    Delta.apply(destination, spool, part_file, block_size, hasher)
+            except BaseException as e:
+                self._discard_part(part_path, f"{destination}{HashMap.PART_META_SUFFIX}")
+                if isinstance(e, ValueError):
+                    self.logger.warning(f'Invalid delta for {file_path}: {e}')
+                    return None
+                raise
+        
+        digest = hasher.hexdigest()
+        if digest != expected_digest:
+            self.logger.warning(f'Delta of {file_path} does not match the remote hash, downloading the whole file')
+            self._discard_part(part_path, f"{destination}{HashMap.PART_META_SUFFIX}")
+            return None
+        ContentStore.release(destination)
+        os.replace(part_path, destination)
+        self.logger.debug(f'Patched {file_path} with a {delta_size} bytes delta')
+        return {'status': 200, 'digest': digest, 'response': response}
+    
     def remove_modpack_file(self, uuid, file_path):
         """
         Remove um arquivo da pasta da modpack.
@@ -137,9 +556,62 @@ class ModpackApi:
         :return: Um dicionário contendo a resposta da API.
         """
         url = f"{self.base_url}/removeModpackFile/{uuid}/{file_path}"
-        response = requests.delete(url)
+        response = self.session.delete(url, timeout=self.timeout)
         return {'status': response.status_code, 'json': response.json(), 'response': response}
 
+    def remove_modpack_files(self, uuid, token, file_paths):
+        """
+        Remove vários arquivos da pasta da modpack com uma única requisição.
+        
+        Se o servidor não tiver o endpoint de remoção em lote, remove os arquivos um a um.
+        
+        :param uuid: O UUID da modpack.
+        :param token: O token de autenticação.
+        :param file_paths: Lista de caminhos dos arquivos a serem removidos.
+        :return: Um dicionário contendo a resposta da API (a última, no modo arquivo a arquivo).
+        """
+        if self.bulk_delete_supported:
+            url = f"{self.base_url}/removeModpackFiles/{uuid}"
+            response = self.session.post(url, json={"paths": list(file_paths)}, headers={"token": f"{token}"}, timeout=self.timeout)
+            self.logger.debug(f'Removing {len(file_paths)} files (UUID: {uuid}), status: {response.status_code}')
+            if response.status_code not in ModpackApi.UNSUPPORTED_STATUS:
+                try:
+                    json = response.json()
+                except:
+                    json = {}
+                return {'status': response.status_code, 'json': json, 'response': response}
+            self.logger.info('Server has no bulk delete endpoint, falling back to per-file deletes')
+            self.bulk_delete_supported = False
+        
+        res = {'status': 200, 'json': {}, 'response': None}
+        for file_path in file_paths:
+            res = self.remove_modpack_file(uuid, file_path)
+        return res
+
+    def remove_modpack_directory(self, uuid, token, directory, file_paths):
+        """
+        Remove uma pasta inteira da modpack com uma única requisição.
+        
+        Se o servidor não tiver o endpoint, remove os arquivos informados com remove_modpack_files.
+        
+        :param uuid: O UUID da modpack.
+        :param token: O token de autenticação.
+        :param directory: O caminho relativo da pasta a ser removida.
+        :param file_paths: Os arquivos remotos contidos na pasta, usados no fallback.
+        :return: Um dicionário contendo a resposta da API.
+        """
+        if self.bulk_delete_supported:
+            url = f"{self.base_url}/removeModpackDirectory/{uuid}/{directory}"
+            response = self.session.delete(url, headers={"token": f"{token}"}, timeout=self.timeout)
+            self.logger.debug(f'Removing directory {directory} (UUID: {uuid}), status: {response.status_code}')
+            if response.status_code not in ModpackApi.UNSUPPORTED_STATUS:
+                try:
+                    json = response.json()
+                except:
+                    json = {}
+                return {'status': response.status_code, 'json': json, 'response': response}
+        return self.remove_modpack_files(uuid, token, file_paths)
+
     def delete_modpack(self, uuid):
         """
         Remove completamente uma modpack, incluindo todos os arquivos e pastas.
@@ -148,7 +620,7 @@ class ModpackApi:
         :return: Um dicionário contendo a resposta da API.
         """
         url = f"{self.base_url}/removeModpack/{uuid}"
-        response = requests.delete(url)
+        response = self.session.delete(url, timeout=self.timeout)
         return {'status': response.status_code, 'json': response.json(), 'response': response}
 
     def is_owner(self, uuid, token):
@@ -161,7 +633,7 @@ class ModpackApi:
         """
         url = f"{self.base_url}/isOwner/{uuid}"
         try:
-            response = requests.post(url, json={"token": token}, timeout=(3, 3))
+            response = self.session.post(url, json={"token": token}, timeout=(3, 3))
             if response.json()['code'] == -1:
                 return True
             if response.status_code == 200:
@@ -0,0 +1,96 @@
+import io, os, binascii
+from urllib3.fields import RequestField
+
+class MultipartBody(io.RawIOBase):
+    """
+    Corpo multipart/form-data lido em blocos direto dos arquivos enviados, sem montar a requisição
+    inteira na memória: só os cabeçalhos de cada parte ficam em bytes.
+
+    O tamanho total é conhecido de antemão (Content-Length) e o corpo suporta seek, para que novas
+    tentativas possam reenviá-lo.
+    """
+
+    def __init__(self, files, data=None):
+        """
+        :param files: Os arquivos do multipart, como em requests: {campo: arquivo} ou
+                      {campo: (nome, arquivo[, content type])}. Cada arquivo é lido da posição atual até o fim.
+        :param data: Os campos de formulário, como em requests.
+        """
+        self.boundary = binascii.hexlify(os.urandom(16)).decode('ascii')
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.parts = []  # (bytes ou arquivo aberto, posição inicial, tamanho)
+        for name, value in (data or {}).items():
+            field = RequestField(name=name, data=value)
+            field.make_multipart()
+            value = value if isinstance(value, bytes) else str(value).encode('utf-8')
+            self._add_bytes(self._header(field) + value + b"\r\n")
+        for name, value in files.items():
+            if isinstance(value, (tuple, list)):
+                file_name, file, content_type = (tuple(value) + (None,))[:3]
+            else:
+                file, content_type = value, None
+                # Como em requests: o nome do arquivo aberto, se houver, ou o nome do campo
+                path = getattr(file, 'name', None)
+                file_name = os.path.basename(path) if isinstance(path, str) and not path.startswith('<') else name
+            field = RequestField(name=name, data=b"", filename=file_name)
+            field.make_multipart(content_type=content_type)
+            self._add_bytes(self._header(field))
+            if isinstance(file, (bytes, bytearray)):
+                self._add_bytes(bytes(file))
+            else:
+                start = file.tell()
+                self.parts.append((file, start, file.seek(0, io.SEEK_END) - start))
+            self._add_bytes(b"\r\n")
+        self._add_bytes(f"--{self.boundary}--\r\n".encode('ascii'))
+        self.length = sum(size for _, _, size in self.parts)
+        self.position = 0
+
+    def _header(self, field):
+        return f"--{self.boundary}\r\n".encode('ascii') + field.render_headers().encode('utf-8')
+
+    def _add_bytes(self, data):
+        self.parts.append((data, 0, len(data)))
+
+    def __len__(self):
+        return self.length
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        written = 0
+        offset = 0
+        for source, start, size in self.parts:
+            if written == len(buffer):
+                break
+            if self.position + written >= offset + size:
+                offset += size
+                continue
+            skip = self.position + written - offset
+            count = min(size - skip, len(buffer) - written)
+            if isinstance(source, bytes):
+                data = source[skip:skip + count]
+            else:
+                source.seek(start + skip)
+                data = source.read(count)
+                if len(data) != count:
+                    raise OSError("File changed while it was being uploaded")
+            buffer[written:written + count] = data
+            written += count
+            offset += size
+        self.position += written
+        return written
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.length
+        self.position = max(0, min(offset, self.length))
+        return self.position
+
+    def tell(self):
+        return self.position
@@ -0,0 +1,72 @@
+import threading, time, math
+
+class ProgressBridge:
+    """
+    Repassa o progresso das transferências para um pyqtSignal a partir de qualquer thread ou event loop.
+
+    As atualizações são somadas sob um lock e as emissões são limitadas a uma a cada "interval"
+    segundos, para que centenas de transferências terminando juntas não inundem a fila de eventos
+    da interface. O sinal do Qt entrega o dicionário na thread da janela (conexão enfileirada).
+    """
+
+    def __init__(self, signal, step, total=0, interval=0.1):
+        """
+        :param signal: O pyqtSignal(dict) da modpack (uploadSignal ou downloadSignal).
+        :param step: A etapa informada em "step".
+        :param total: Quantidade inicial de itens.
+        :param interval: Intervalo mínimo entre emissões, em segundos.
+        """
+        self.signal = signal
+        self.step = step
+        self.total = total
+        self.done = 0
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.last_emit = 0.0
+        self.last_progress = 0
+
+    def add_total(self, count):
+        """
+        Aumenta a quantidade de itens esperados.
+        """
+        with self.lock:
+            self.total += count
+
+    def advance(self, count=1):
+        """
+        Marca itens como concluídos e emite o progresso se o intervalo já passou.
+        """
+        with self.lock:
+            self.done += count
+            now = time.monotonic()
+            if now - self.last_emit < self.interval and self.done < self.total:
+                return
+            self.last_emit = now
+            payload = self._payload()
+        self.signal.emit(payload)
+
+    def update(self, count=1):
+        """
+        Mesmo que advance, para ser usado no lugar de uma barra do tqdm (ex.: HashMap.hash_pending).
+        """
+        self.advance(count)
+
+    def flush(self):
+        """
+        Emite o progresso atual imediatamente.
+        """
+        with self.lock:
+            self.last_emit = time.monotonic()
+            payload = self._payload()
+        self.signal.emit(payload)
+
+    def _payload(self):
+        progress = math.floor(self.done / self.total * 100) if self.total else 0
+        # O total pode crescer durante a transferência; a barra nunca volta
+        self.last_progress = max(self.last_progress, min(progress, 100))
+        return {
+            "runing": 1,
+            "progress": self.last_progress,
+            "step": self.step,
+            "done": False
+        }
@@ -0,0 +1,127 @@
+import logging
+from src.tools import Digest, HashMap
+
+class RemoteIndex:
+    """
+    Visão dos hashes remotos de uma modpack, usada para comparar a pasta local com o servidor.
+
+    Quando o servidor suporta a árvore de Merkle (getModpackHashTree), os nós são buscados sob
+    demanda e apenas as pastas que diferem são percorridas. Caso contrário, o hashmap completo
+    (getModpackHashMap) é baixado uma vez e comparado arquivo a arquivo.
+    """
+
+    def __init__(self, api, uuid, algorithm, root=None, files=None):
+        """
+        Inicializa o índice remoto. Prefira RemoteIndex.open, que negocia o formato com o servidor.
+
+        :param api: Instância de ModpackApi.
+        :param uuid: O UUID da modpack.
+        :param algorithm: Algoritmo de hash usado pelo servidor.
+        :param root: Nó raiz da árvore de Merkle remota (modo árvore).
+        :param files: Hashmap remoto completo {caminho relativo: hash} (modo plano).
+        """
+        self.logger = logging.getLogger('RemoteIndex')
+        self.api = api
+        self.uuid = uuid
+        self.algorithm = algorithm
+        self.files = files
+        self.nodes = {"": root} if root is not None else {}
+
+    @property
+    def uses_tree(self):
+        return self.files is None
+
+    @classmethod
+    def open(cls, api, uuid, remote_root=None, hash_json=None):
+        """
+        Negocia com o servidor o formato dos hashes remotos.
+
+        :param api: Instância de ModpackApi.
+        :param uuid: O UUID da modpack.
+        :param remote_root: Nó raiz de getModpackHashTree já obtido, se houver.
+        :param hash_json: Resposta de getModpackHashMap já obtida, se houver.
+        :return: Uma instância de RemoteIndex.
+        """
+        logger = logging.getLogger('RemoteIndex')
+        if hash_json is None:
+            if remote_root is None:
+                res = api.get_modpack_hash_tree(uuid, "", Digest.available())
+                if res['status'] == 200:
+                    remote_root = res['json']
+            if remote_root and Digest.is_available(remote_root.get('algorithm', Digest.DEFAULT)):
+                return cls(api, uuid, remote_root.get('algorithm', Digest.DEFAULT), root=remote_root)
+
+            res = api.get_modpack_hash_map(uuid, Digest.available())
+            hash_json = res['json'] if res['status'] == 200 else {}
+
+        algorithm, files = HashMap.parse_document(hash_json)
+        if not Digest.is_available(algorithm):
+            # O servidor escolheu um algoritmo que não temos: pede o formato legado (MD5)
+            logger.warning(f"Server answered with unsupported digest '{algorithm}', falling back to {Digest.DEFAULT}")
+            res = api.get_modpack_hash_map(uuid)
+            algorithm, files = HashMap.parse_document(res['json'] if res['status'] == 200 else {})
+        return cls(api, uuid, algorithm, files=files)
+
+    def node(self, path):
+        """
+        Retorna um nó da árvore remota, buscando-o no servidor apenas uma vez.
+
+        :param path: Caminho relativo da pasta ('' para a raiz).
+        :return: O nó no formato de HashMap.children, ou None se a pasta não existir no servidor.
+        """
+        if path not in self.nodes:
+            res = self.api.get_modpack_hash_tree(self.uuid, path, [self.algorithm])
+            self.nodes[path] = res['json'] if res['status'] == 200 else None
+        return self.nodes[path]
+
+    def directory_names(self, path):
+        """
+        Lista as subpastas remotas diretas de uma pasta.
+
+        :param path: Caminho relativo da pasta ('' para a raiz).
+        :return: Conjunto com os nomes das subpastas.
+        """
+        if self.uses_tree:
+            node = self.node(path)
+            return set(node["dirs"]) if node else set()
+
+        prefix = f"{path}/" if path else ""
+        names = set()
+        for key in self.files:
+            if key.startswith(prefix) and "/" in key[len(prefix):]:
+                names.add(key[len(prefix):].split("/", 1)[0])
+        return names
+
+    def diff(self, path, local_files, recursive=True):
+        """
+        Compara os arquivos locais de uma pasta com os remotos.
+
+        :param path: Caminho relativo da pasta ('' para a raiz).
+        :param local_files: Hashes locais {caminho relativo: hash} dos arquivos abaixo da pasta.
+        :param recursive: Se False, compara apenas os arquivos diretamente dentro da pasta.
+        :return: Um dicionário {caminho relativo: (hash local, hash remoto)}, com None do lado ausente.
+        """
+        prefix = f"{path}/" if path else ""
+
+        if not self.uses_tree:
+            remote_files = {
+                key: value for key, value in self.files.items()
+                if key.startswith(prefix) and (recursive or "/" not in key[len(prefix):])
+            }
+            return HashMap.diff_maps(local_files, remote_files)
+
+        if not recursive:
+            node = self.node(path)
+            remote_files = {prefix + name: value for name, value in node["files"].items()} if node else {}
+            return HashMap.diff_maps(local_files, remote_files)
+
+        local = HashMap(None, algorithm=self.algorithm, files=local_files)
+        local_node = local.children(path)
+        # O hash da pasta já veio na listagem da pasta pai: se for igual, nem desce nela
+        parent, _, name = path.rpartition("/")
+        parent_node = self.nodes.get(parent) if path else None
+        if local_node and parent_node and parent_node["dirs"].get(name) == local_node["hash"]:
+            return {}
+        if parent_node and name not in parent_node["dirs"]:
+            self.nodes[path] = None  # Pasta nova: não existe no servidor
+        return local.diff_tree(self.node, path)
@@ -0,0 +1,343 @@
+import heapq, io, itertools, json, logging, os, threading, time
+import concurrent.futures
+
+class TokenBucket:
+    """
+    Limite global de banda (token bucket) compartilhado por todas as transferências.
+
+    Cada byte enviado ou recebido consome um token; os tokens são repostos a "rate" bytes por
+    segundo até a capacidade do balde. Com rate 0 não há limite.
+    """
+
+    def __init__(self, rate=0, burst=None):
+        """
+        :param rate: Limite em bytes por segundo (0 = ilimitado).
+        :param burst: Capacidade do balde em bytes (padrão: um segundo de transferência).
+        """
+        self.rate = rate
+        self.capacity = burst or max(rate, 64 * 1024)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    @property
+    def limited(self):
+        return self.rate > 0
+
+    def reserve(self, amount):
+        """
+        Consome tokens e informa quanto tempo esperar até que eles estejam disponíveis.
+
+        :param amount: Quantidade de bytes.
+        :return: Segundos de espera (0 se houver tokens).
+        """
+        if not self.rate:
+            return 0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= amount
+            return -self.tokens / self.rate if self.tokens < 0 else 0
+
+    def consume(self, amount):
+        """
+        Consome tokens, bloqueando a thread até que estejam disponíveis.
+        """
+        wait = self.reserve(amount)
+        if wait:
+            time.sleep(wait)
+
+
+class ThrottledReader(io.RawIOBase):
+    """
+    Envolve um arquivo aberto para que cada leitura consuma tokens de um TokenBucket.
+    Usado como corpo de uploads; suporta seek para que novas tentativas possam reenviar.
+    """
+
+    def __init__(self, file, bucket):
+        self.file = file
+        self.bucket = bucket
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def read(self, size=-1):
+        data = self.file.read(size)
+        self.bucket.consume(len(data))
+        return data
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self.file.seek(offset, whence)
+
+    def tell(self):
+        return self.file.tell()
+
+
+class AdaptiveConcurrency:
+    """
+    Limite de transferências simultâneas ajustado pelo desempenho medido (AIMD).
+
+    A cada janela de "limite" transferências concluídas, o limite cresce em 1 enquanto a vazão
+    continuar melhorando e diminui em 1 quando ela cai. Um erro (exceção, 429 ou 5xx) corta o
+    limite pela metade.
+    """
+
+    GAIN = 1.05  # Melhora mínima da vazão para abrir mais uma conexão
+    LOSS = 0.8  # Queda da vazão que fecha uma conexão
+
+    def __init__(self, maximum, minimum=1, initial=None):
+        """
+        :param maximum: Limite máximo (número de workers).
+        :param minimum: Limite mínimo.
+        :param initial: Limite inicial (padrão: metade do máximo).
+        """
+        self.maximum = maximum
+        self.minimum = minimum
+        self.limit = max(minimum, min(maximum, initial or maximum // 2))
+        self.active = 0
+        self.condition = threading.Condition()
+        self.last_throughput = None
+        self._reset_window()
+
+    def _reset_window(self):
+        self.window_bytes = 0
+        self.window_count = 0
+        self.window_start = time.monotonic()
+
+    def acquire(self):
+        """
+        Bloqueia até haver uma vaga dentro do limite atual.
+        """
+        with self.condition:
+            while self.active >= self.limit:
+                self.condition.wait()
+            self.active += 1
+
+    def release(self, transferred=None, error=False):
+        """
+        Libera uma vaga e registra o resultado da transferência.
+
+        :param transferred: Bytes transferidos, ou None se a vaga não foi usada.
+        :param error: Se a transferência falhou ou o servidor pediu para desacelerar.
+        """
+        with self.condition:
+            self.active -= 1
+            if error:
+                self.limit = max(self.minimum, self.limit // 2)
+                self.last_throughput = None
+                self._reset_window()
+            elif transferred is not None:
+                self.window_bytes += transferred
+                self.window_count += 1
+                if self.window_count >= self.limit:
+                    elapsed = max(time.monotonic() - self.window_start, 1e-6)
+                    throughput = self.window_bytes / elapsed
+                    if self.last_throughput is None or throughput >= self.last_throughput * AdaptiveConcurrency.GAIN:
+                        self.limit = min(self.maximum, self.limit + 1)
+                    elif throughput < self.last_throughput * AdaptiveConcurrency.LOSS:
+                        self.limit = max(self.minimum, self.limit - 1)
+                    self.last_throughput = throughput
+                    self._reset_window()
+            self.condition.notify_all()
+
+
+class TransferScheduler:
+    """
+    Executor de transferências com fila de prioridade e concorrência adaptativa.
+
+    Manifestos e DLLs saem primeiro, depois arquivos pequenos e por último os assets grandes.
+    submit() retorna um concurrent.futures.Future, então o executor substitui um ThreadPoolExecutor.
+    """
+
+    PRIORITY_CRITICAL = 0
+    PRIORITY_SMALL = 1
+    PRIORITY_LARGE = 2
+
+    SMALL_FILE_SIZE = 256 * 1024
+    CRITICAL_NAMES = {"manifest.json"}
+    CRITICAL_EXTENSIONS = {".dll"}
+    # Quando o tamanho não é conhecido (downloads), a extensão indica se o arquivo costuma ser pequeno
+    SMALL_EXTENSIONS = {".json", ".txt", ".xml", ".tmx", ".tsx", ".ini", ".md", ".yaml", ".yml", ".csv", ".config"}
+
+    def __init__(self, max_workers, adaptive=True):
+        """
+        :param max_workers: Número de threads (limite máximo de transferências simultâneas).
+        :param adaptive: Ajusta a concorrência pela vazão e pelos erros; se False, usa max_workers fixo.
+        """
+        self.concurrency = AdaptiveConcurrency(max_workers, initial=None if adaptive else max_workers)
+        self.adaptive = adaptive
+        self.queue = []
+        self.sequence = itertools.count()
+        self.condition = threading.Condition()
+        self.closed = False
+        self.threads = [threading.Thread(target=self._work, daemon=True) for _ in range(max_workers)]
+        for thread in self.threads:
+            thread.start()
+
+    @staticmethod
+    def priority(path, size=None):
+        """
+        Calcula a prioridade de uma transferência.
+
+        :param path: Caminho (ou nome) do arquivo.
+        :param size: Tamanho em bytes, se conhecido.
+        :return: PRIORITY_CRITICAL, PRIORITY_SMALL ou PRIORITY_LARGE.
+        """
+        name = os.path.basename(str(path)).lower()
+        extension = os.path.splitext(name)[1]
+        if name in TransferScheduler.CRITICAL_NAMES or extension in TransferScheduler.CRITICAL_EXTENSIONS:
+            return TransferScheduler.PRIORITY_CRITICAL
+        if size is None:
+            return TransferScheduler.PRIORITY_SMALL if extension in TransferScheduler.SMALL_EXTENSIONS else TransferScheduler.PRIORITY_LARGE
+        return TransferScheduler.PRIORITY_SMALL if size < TransferScheduler.SMALL_FILE_SIZE else TransferScheduler.PRIORITY_LARGE
+
+    def submit(self, fn, *args, priority=PRIORITY_LARGE, size=None, **kwargs):
+        """
+        Agenda uma transferência.
+
+        :param fn: Função que executa a transferência.
+        :param priority: Prioridade (menor sai primeiro).
+        :param size: Bytes transferidos, usados na medição de vazão; pode ser uma função chamada depois
+            da transferência (ex.: downloads, cujo tamanho só é conhecido no fim). None não entra na medição.
+        :return: Um concurrent.futures.Future com o resultado de fn.
+        """
+        future = concurrent.futures.Future()
+        with self.condition:
+            if self.closed:
+                raise RuntimeError("cannot schedule new transfers after shutdown")
+            heapq.heappush(self.queue, (priority, next(self.sequence), future, fn, args, kwargs, size))
+            self.condition.notify()
+        return future
+
+    @staticmethod
+    def _failed(result):
+        # Respostas que pedem para desacelerar contam como erro para o ajuste da concorrência
+        status = result.get('status') if isinstance(result, dict) else None
+        return isinstance(status, int) and (status == 429 or status >= 500)
+
+    def _work(self):
+        while True:
+            # A vaga é obtida antes de escolher o trabalho, para que a prioridade valha no momento da execução
+            self.concurrency.acquire()
+            with self.condition:
+                while not self.queue and not self.closed:
+                    self.condition.wait()
+                if not self.queue:
+                    self.concurrency.release()
+                    return
+                _, _, future, fn, args, kwargs, size = heapq.heappop(self.queue)
+            if not future.set_running_or_notify_cancel():
+                self.concurrency.release()
+                continue
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                self.concurrency.release(None, error=self.adaptive)
+                future.set_exception(e)
+            else:
+                # Com adaptive=False o resultado não é registrado e o limite fica fixo
+                measured = None
+                if self.adaptive:
+                    measured = size() if callable(size) else size
+                self.concurrency.release(measured, error=self.adaptive and TransferScheduler._failed(result))
+                future.set_result(result)
+
+    def shutdown(self, wait=True):
+        """
+        Encerra o executor depois de concluir as transferências já agendadas.
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        if wait:
+            for thread in self.threads:
+                thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown(wait=True)
+        return False
+
+
+class ThroughputHistory:
+    """
+    Vazão medida nas últimas sincronizações, usada para estimar a duração das próximas.
+
+    Guarda, por direção (upload ou download), médias móveis de bytes e de arquivos por segundo em
+    um JSON. Transferências curtas demais não entram, já que medem mais a latência do que a banda.
+    """
+
+    UPLOAD = "upload"
+    DOWNLOAD = "download"
+    WEIGHT = 0.5  # Peso da medição mais recente na média
+    MIN_SECONDS = 1.0
+
+    def __init__(self, path):
+        """
+        :param path: Caminho do arquivo JSON com o histórico.
+        """
+        self.logger = logging.getLogger('ThroughputHistory')
+        self.path = path
+
+    def load(self):
+        """
+        :return: Dicionário {direção: {"bytes_per_second", "files_per_second"}}.
+        """
+        try:
+            with open(self.path, 'r') as file:
+                history = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return history if isinstance(history, dict) else {}
+
+    def record(self, direction, transferred_bytes, files, seconds):
+        """
+        Registra o resultado de uma transferência.
+
+        :param direction: UPLOAD ou DOWNLOAD.
+        :param transferred_bytes: Bytes transferidos.
+        :param files: Número de arquivos transferidos (ou removidos).
+        :param seconds: Duração da transferência.
+        """
+        if seconds < ThroughputHistory.MIN_SECONDS or not files:
+            return
+        history = self.load()
+        measured = {"bytes_per_second": transferred_bytes / seconds, "files_per_second": files / seconds}
+        previous = history.get(direction) or {}
+        for key, value in measured.items():
+            if isinstance(previous.get(key), (int, float)):
+                measured[key] = ThroughputHistory.WEIGHT * value + (1 - ThroughputHistory.WEIGHT) * previous[key]
+        history[direction] = measured
+        try:
+            with open(self.path, 'w') as file:
+                json.dump(history, file)
+        except OSError as e:
+            self.logger.warning(f"Could not save throughput history: {e}")
+
+    def estimate(self, direction, transferred_bytes, files):
+        """
+        Estima a duração de uma transferência pela vazão medida anteriormente.
+
+        :return: Uma tupla (segundos, vazão em bytes por segundo); (None, None) sem medições anteriores.
+        """
+        measured = self.load().get(direction) or {}
+        if not files:
+            return 0.0, measured.get("bytes_per_second")
+        seconds = []
+        if measured.get("bytes_per_second"):
+            seconds.append(transferred_bytes / measured["bytes_per_second"])
+        if measured.get("files_per_second"):
+            # Muitos arquivos pequenos são limitados pelas requisições, não pela banda
+            seconds.append(files / measured["files_per_second"])
+        return (max(seconds) if seconds else None), measured.get("bytes_per_second")
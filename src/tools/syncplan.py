@@ -0,0 +1,180 @@
+from collections import namedtuple
+
+# Uma ação do plano: tipo, caminho relativo (com '/'), hashes dos dois lados e, em RMDIR remoto,
+# os arquivos removidos junto com a pasta
+SyncAction = namedtuple("SyncAction", ["kind", "path", "local_hash", "remote_hash", "contents"], defaults=(None, None, ()))
+
+class SyncPlan:
+    """
+    Plano de reconciliação entre a pasta local e o servidor, montado a partir de uma única
+    comparação (ver Modpack.compute_differences e RemoteIndex.diff).
+
+    O plano não acessa a rede nem lê arquivos: recebe o hashmap local, as diferenças e as pastas
+    existentes, e devolve ações tipadas que download_files e send_all_files apenas executam.
+    """
+
+    DOWNLOAD = "download"
+    UPLOAD = "upload"
+    DELETE = "delete"
+    KEEP = "keep"
+    MKDIR = "mkdir"
+    RMDIR = "rmdir"
+    KINDS = (DOWNLOAD, UPLOAD, DELETE, KEEP, MKDIR, RMDIR)
+
+    def __init__(self, actions=None):
+        """
+        :param actions: Lista de SyncAction, na ordem de execução.
+        """
+        self.actions = list(actions or [])
+
+    def __iter__(self):
+        return iter(self.actions)
+
+    def __len__(self):
+        return len(self.actions)
+
+    def of(self, kind):
+        """
+        Lista as ações de um tipo, na ordem do plano.
+        """
+        return [action for action in self.actions if action.kind == kind]
+
+    def paths(self, kind):
+        return [action.path for action in self.actions if action.kind == kind]
+
+    def counts(self):
+        """
+        :return: Dicionário {tipo: quantidade de ações}.
+        """
+        counts = dict.fromkeys(SyncPlan.KINDS, 0)
+        for action in self.actions:
+            counts[action.kind] += 1
+        return counts
+
+    def is_empty(self):
+        """
+        Verifica se o plano não transfere nem remove nada (só mantém arquivos).
+        """
+        return all(action.kind == SyncPlan.KEEP for action in self.actions)
+
+    def summary(self, sizes):
+        """
+        Resume o plano em um dicionário serializável em JSON (ex.: para uma simulação).
+
+        :param sizes: {caminho relativo: bytes} dos arquivos transferidos; None marca tamanho desconhecido.
+        :return: Quantidades por tipo de ação, total de bytes conhecidos a transferir e quantos
+            arquivos têm tamanho desconhecido. "delete" inclui os arquivos removidos junto com as pastas.
+        """
+        counts = self.counts()
+        transfers = [action.path for action in self.actions if action.kind in (SyncPlan.DOWNLOAD, SyncPlan.UPLOAD)]
+        known = [sizes.get(path) for path in transfers if sizes.get(path) is not None]
+        counts[SyncPlan.DELETE] += sum(len(action.contents) for action in self.of(SyncPlan.RMDIR))
+        counts.update({
+            "bytes": sum(known),
+            "unknown_size": len(transfers) - len(known),
+            "empty": self.is_empty(),
+        })
+        return counts
+
+    @staticmethod
+    def parents(relative_path):
+        """
+        Lista as pastas acima de um caminho relativo, da mais alta para a mais baixa.
+        """
+        parts = relative_path.split('/')
+        return ['/'.join(parts[:depth]) for depth in range(1, len(parts))]
+
+    @staticmethod
+    def for_download(local_files, differences, directories=(), required=(), protected=(), skipped=()):
+        """
+        Planeja a atualização da pasta local a partir do servidor.
+
+        :param local_files: Hashmap local {caminho relativo: hash}, a única varredura da pasta.
+        :param differences: {caminho relativo: (hash local, hash remoto)} da comparação com o servidor.
+        :param directories: Pastas relativas que existem localmente (inclusive as vazias).
+        :param required: Pastas que devem existir ao final (ex.: mods_enabled), mesmo vazias.
+        :param protected: Arquivos locais que nunca são removidos (ex.: modpack.json).
+        :param skipped: Nomes de arquivo, em minúsculas, que nunca são baixados (ex.: desktop.ini).
+        :return: Um SyncPlan com as remoções, as pastas a remover (mais fundas primeiro), as pastas a
+            criar e os downloads; os arquivos iguais nos dois lados ficam como KEEP.
+        """
+        protected = {path.lower() for path in protected}
+        skipped = {name.lower() for name in skipped}
+        deletes = []
+        downloads = []
+        keeps = []
+        remaining = []  # Arquivos que existirão na pasta depois do plano
+
+        for relative_path, local_hash in sorted(local_files.items()):
+            if relative_path not in differences:
+                keeps.append(SyncAction(SyncPlan.KEEP, relative_path, local_hash, local_hash))
+                remaining.append(relative_path)
+        for relative_path, (local_hash, remote_hash) in sorted(differences.items()):
+            name = relative_path.rsplit('/', 1)[-1].lower()
+            if remote_hash is None:
+                if local_hash is None:
+                    continue
+                if relative_path.lower() in protected:
+                    keeps.append(SyncAction(SyncPlan.KEEP, relative_path, local_hash, remote_hash))
+                    remaining.append(relative_path)
+                else:
+                    deletes.append(SyncAction(SyncPlan.DELETE, relative_path, local_hash, remote_hash))
+            elif name in skipped:
+                if local_hash is not None:
+                    keeps.append(SyncAction(SyncPlan.KEEP, relative_path, local_hash, remote_hash))
+                    remaining.append(relative_path)
+            else:
+                downloads.append(SyncAction(SyncPlan.DOWNLOAD, relative_path, local_hash, remote_hash))
+                remaining.append(relative_path)
+
+        existing = set(directories)
+        for relative_path in local_files:
+            existing.update(SyncPlan.parents(relative_path))
+        occupied = set()
+        for relative_path in remaining:
+            occupied.update(SyncPlan.parents(relative_path))
+        for directory in required:
+            occupied.update(SyncPlan.parents(directory) + [directory])
+
+        # Pastas mais fundas primeiro, para que a pasta pai já esteja vazia ao ser removida
+        rmdirs = [SyncAction(SyncPlan.RMDIR, directory)
+                  for directory in sorted(existing - occupied, key=lambda directory: (-directory.count('/'), directory))]
+        mkdirs = [SyncAction(SyncPlan.MKDIR, directory) for directory in sorted(occupied - existing)]
+        return SyncPlan(deletes + rmdirs + mkdirs + downloads + keeps)
+
+    @staticmethod
+    def for_upload(local_files, differences, directory_exists):
+        """
+        Planeja o envio das mudanças locais para o servidor.
+
+        :param local_files: Hashmap local {caminho relativo: hash} da parte comparada.
+        :param differences: {caminho relativo: (hash local, hash remoto)} da comparação com o servidor.
+        :param directory_exists: Função que diz se uma pasta relativa existe localmente.
+        :return: Um SyncPlan com os envios e as remoções remotas. Arquivos dentro de uma pasta que não
+            existe mais localmente são agrupados em um RMDIR da pasta mais alta removida, para que o
+            servidor apague a pasta com uma única chamada.
+        """
+        exists = {}
+        removed_directories = {}
+        deletes = []
+        uploads = []
+        for relative_path, (local_hash, remote_hash) in sorted(differences.items()):
+            if local_hash is not None:
+                uploads.append(SyncAction(SyncPlan.UPLOAD, relative_path, local_hash, remote_hash))
+                continue
+            missing = None
+            for candidate in SyncPlan.parents(relative_path):
+                if candidate not in exists:
+                    exists[candidate] = directory_exists(candidate)
+                if not exists[candidate]:
+                    missing = candidate
+                    break
+            if missing:
+                removed_directories.setdefault(missing, []).append(relative_path)
+            else:
+                deletes.append(SyncAction(SyncPlan.DELETE, relative_path, local_hash, remote_hash))
+
+        rmdirs = [SyncAction(SyncPlan.RMDIR, directory, contents=tuple(paths)) for directory, paths in removed_directories.items()]
+        keeps = [SyncAction(SyncPlan.KEEP, relative_path, local_hash, local_hash)
+                 for relative_path, local_hash in sorted(local_files.items()) if relative_path not in differences]
+        return SyncPlan(rmdirs + deletes + uploads + keeps)
@@ -0,0 +1,330 @@
+import os, logging, threading, time
+from tqdm import tqdm
+from src.tools import HashMap
+
+try:
+    from watchdog.observers import Observer
+except ImportError:  # Dependência opcional, sem ela a pasta é verificada periodicamente
+    Observer = None
+
+class Watcher:
+    """
+    Mantém o hashmap de uma pasta atualizado enquanto ela é alterada, para que a sincronização
+    não precise varrer a pasta inteira.
+
+    Usa o watchdog (inotify no Linux, ReadDirectoryChangesW no Windows) quando instalado; sem ele,
+    compara periodicamente o stat dos arquivos. Os eventos são acumulados e processados só depois
+    de "debounce" segundos sem novas mudanças, então rajadas como a instalação de um mod (muitos
+    arquivos movidos de uma vez) geram um único recálculo. A cada recálculo o hashmap.json e o cache
+    de hashes são gravados no disco.
+    """
+
+    IGNORED_EVENTS = {"opened", "closed_no_write"}  # Eventos de leitura não alteram o conteúdo
+    BARRIER_TIMEOUT = 2.0  # Tempo máximo de espera pelos eventos em trânsito antes de um snapshot
+
+    def __init__(self, directory, algorithm, workers=1, debounce=0.5, poll_interval=2.0):
+        """
+        :param directory: A pasta observada.
+        :param algorithm: Algoritmo de hash (ver Digest) do hashmap.
+        :param workers: Número de workers usados para calcular os hashes (ver HashMap).
+        :param debounce: Segundos sem novas mudanças antes de recalcular os hashes.
+        :param poll_interval: Intervalo em segundos entre as verificações quando o watchdog não está instalado.
+        """
+        self.logger = logging.getLogger('Watcher')
+        self.directory = directory
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.local = HashMap(directory, algorithm=algorithm, files={}, show_progress=False, workers=workers)
+        self.keys = {}  # {caminho relativo: chave de stat} dos arquivos já calculados
+        self.pending = set()  # Caminhos relativos (arquivos ou pastas) alterados desde o último recálculo
+        self.last_event = 0
+        self.lock = threading.RLock()  # Protege o hashmap e keys durante um recálculo
+        self.condition = threading.Condition()  # Protege pending
+        self.stopped = threading.Event()
+        self.marker_seen = threading.Event()
+        self.ready = threading.Event()  # Sinaliza o fim do cálculo inicial, feito na thread do watcher
+        self.built = False  # Se o hashmap inicial foi calculado (o cálculo pode falhar)
+        self.observer = None
+        self.thread = None
+
+    @staticmethod
+    def is_available():
+        """
+        Verifica se o watchdog está instalado (sem ele a pasta é verificada periodicamente).
+        """
+        return Observer is not None
+
+    @property
+    def algorithm(self):
+        return self.local.algorithm
+
+    def start(self):
+        """
+        Começa a observar a pasta. O hashmap inicial (reaproveitando o cache de hashes) é calculado na
+        thread do watcher, sem bloquear quem chamou; flush e snapshot esperam esse cálculo terminar.
+        """
+        if Observer is not None:
+            self.observer = Observer()
+            self.observer.schedule(self, self.directory, recursive=True)
+            self.observer.start()
+        else:
+            self.logger.info(f"watchdog is not installed, polling {self.directory} every {self.poll_interval}s")
+        self.thread = threading.Thread(target=self._run, name=f"Watcher-{os.path.basename(self.directory)}", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        Para de observar a pasta. Mudanças ainda pendentes são gravadas antes de sair.
+        """
+        self.stopped.set()
+        with self.condition:
+            self.condition.notify_all()
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join()
+            self.observer = None
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+        self.flush()
+
+    def dispatch(self, event):
+        """
+        Recebe os eventos do watchdog (o Watcher é o próprio handler do Observer).
+        """
+        if event.event_type in Watcher.IGNORED_EVENTS:
+            return
+        if event.is_directory and event.event_type == "modified":
+            # Só indica que um filho mudou, e o filho tem seu próprio evento
+            return
+        paths = [event.src_path, getattr(event, "dest_path", None)]
+        with self.condition:
+            for path in paths:
+                if not path:
+                    continue
+                relative_path = os.path.relpath(os.fsdecode(path), self.directory).replace("\\", "/")
+                if relative_path == ".":
+                    relative_path = ""
+                if relative_path == HashMap.WATCH_MARKER_FILE_NAME:
+                    self.marker_seen.set()
+                    continue
+                if relative_path.startswith("..") or HashMap.is_ignored(relative_path):
+                    continue
+                self.pending.add(relative_path)
+            self.last_event = time.monotonic()
+            self.condition.notify_all()
+
+    def _run(self):
+        # Eventos recebidos durante o cálculo inicial ficam em pending e são processados em seguida
+        try:
+            self._rebuild(self.local.algorithm)
+        except Exception:
+            self.logger.exception(f"Could not build the hashmap of {self.directory}")
+        finally:
+            self.ready.set()
+        while not self.stopped.is_set():
+            if self.observer is None:
+                self.stopped.wait(self.poll_interval)
+                self.poll()
+                continue
+            with self.condition:
+                while not self.pending and not self.stopped.is_set():
+                    self.condition.wait()
+                # Espera a rajada terminar: cada novo evento adia o recálculo
+                while not self.stopped.is_set():
+                    remaining = self.last_event + self.debounce - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+            self.flush()
+
+    def _walk(self, relative_dir):
+        """
+        Lista os arquivos abaixo de uma pasta com a chave de stat de cada um.
+
+        :return: Um dicionário {caminho relativo: (caminho absoluto, chave de stat)}.
+        """
+        base = os.path.join(self.directory, relative_dir.replace("/", os.path.sep)) if relative_dir else self.directory
+        entries = {}
+        for root, dirs, files in os.walk(base):
+            for file in files:
+                file_path = os.path.join(root, file)
+                relative_path = os.path.relpath(file_path, self.directory).replace("\\", "/")
+                if HashMap.is_ignored(relative_path):
+                    continue
+                try:
+                    entries[relative_path] = (file_path, HashMap.stat_key(os.stat(file_path)))
+                except OSError:  # Removido durante a listagem
+                    continue
+        return entries
+
+    def _remove(self, relative_path):
+        """
+        Remove do hashmap um arquivo ou todos os arquivos abaixo de uma pasta.
+
+        :return: Os caminhos removidos.
+        """
+        prefix = f"{relative_path}/" if relative_path else ""
+        removed = [key for key in self.keys if key == relative_path or key.startswith(prefix)]
+        for key in removed:
+            del self.keys[key]
+            self.local.hashmap.pop(key, None)
+        return removed
+
+    def _update(self, entries, cache=None):
+        """
+        Recalcula os hashes dos arquivos cuja chave de stat mudou.
+
+        :param entries: Dicionário {caminho relativo: (caminho absoluto, chave de stat)}.
+        :param cache: Cache persistente de hashes (ver HashMap.load_cache) a consultar antes de ler os arquivos.
+        :return: Dicionário {caminho relativo: hash} dos arquivos alterados.
+        """
+        pending = []
+        changed = {}
+        for relative_path, (file_path, key) in entries.items():
+            if self.keys.get(relative_path) == key:
+                continue
+            cached = cache.get(relative_path) if cache else None
+            if cached is not None and cached[:3] == key:
+                changed[relative_path] = cached[3]
+            else:
+                pending.append((relative_path, file_path, key[0]))
+        with tqdm(total=len(pending), disable=True) as progress_bar:
+            try:
+                changed.update(self.local.hash_pending(pending, progress_bar))
+            except OSError as e:
+                # Arquivo removido ou ainda bloqueado; um novo evento (ou a próxima verificação) o recalcula
+                self.logger.debug(f"Could not hash changed files, retrying them one by one: {e}")
+                for relative_path, file_path, _ in pending:
+                    try:
+                        changed[relative_path] = HashMap.hash_file(file_path, self.local.algorithm)
+                    except OSError:
+                        entries.pop(relative_path, None)
+        for relative_path in changed:
+            self.keys[relative_path] = entries[relative_path][1]
+        self.local.hashmap.update(changed)
+        return changed
+
+    def _refresh(self, relative_paths):
+        """
+        Atualiza o hashmap para uma lista de caminhos alterados (arquivos ou pastas).
+
+        :return: Uma tupla (True se algum arquivo além do hashmap.json mudou, {caminho relativo: hash} alterados).
+        """
+        changed = {}
+        removed = []
+        for relative_path in sorted(relative_paths):
+            absolute = os.path.join(self.directory, relative_path.replace("/", os.path.sep)) if relative_path else self.directory
+            if os.path.isdir(absolute):
+                # Pasta criada ou movida: seus arquivos não geram eventos próprios
+                entries = self._walk(relative_path)
+                prefix = f"{relative_path}/" if relative_path else ""
+                for key in [key for key in self.keys if key.startswith(prefix) and key not in entries]:
+                    removed += self._remove(key)
+                changed.update(self._update(entries))
+            elif os.path.isfile(absolute):
+                try:
+                    key = HashMap.stat_key(os.stat(absolute))
+                except OSError:
+                    continue
+                changed.update(self._update({relative_path: (absolute, key)}))
+            else:
+                removed += self._remove(relative_path)
+        return bool(set(changed) - {HashMap.HASHMAP_FILE_NAME} or set(removed) - {HashMap.HASHMAP_FILE_NAME}), changed
+
+    def _walk_file(self, relative_path):
+        file_path = os.path.join(self.directory, relative_path.replace("/", os.path.sep))
+        try:
+            return {relative_path: (file_path, HashMap.stat_key(os.stat(file_path)))}
+        except OSError:
+            return {}
+
+    def _persist(self, changed):
+        """
+        Grava o hashmap.json e o cache de hashes com as mudanças.
+        """
+        self.local.tree = None
+        self.local.save_to_file(self.local.hashmap_file_path)
+        # O próprio hashmap.json entra no mapa, como em uma varredura completa
+        entries = self._walk_file(HashMap.HASHMAP_FILE_NAME)
+        self._update(entries)
+        self.local.remember({key: value for key, value in changed.items() if key != HashMap.HASHMAP_FILE_NAME})
+
+    def _rebuild(self, algorithm):
+        """
+        Recalcula o hashmap inteiro, reaproveitando o cache persistente de hashes.
+        """
+        with self.lock:
+            self.local.algorithm = self.local.requested_algorithm = algorithm
+            self.keys = {}
+            self.local.hashmap = {}
+            entries = self._walk("")
+            changed = self._update(entries, self.local.load_cache())
+            self._persist(changed)
+            self.built = True
+            self.logger.info(f"Watching {self.directory} ({len(self.local.hashmap)} files)")
+
+    def _barrier(self):
+        """
+        Espera o observer entregar os eventos das mudanças já feitas no disco: os eventos chegam em
+        ordem, então quando o evento de um marcador recém-criado chega, os anteriores também chegaram.
+        """
+        marker_path = os.path.join(self.directory, HashMap.WATCH_MARKER_FILE_NAME)
+        self.marker_seen.clear()
+        try:
+            with open(marker_path, "w"):
+                pass
+            if not self.marker_seen.wait(Watcher.BARRIER_TIMEOUT):
+                self.logger.warning(f"Timed out waiting for file events of {self.directory}")
+            os.remove(marker_path)
+        except OSError as e:
+            self.logger.warning(f"Could not wait for file events of {self.directory}: {e}")
+
+    def flush(self):
+        """
+        Processa imediatamente as mudanças pendentes, sem esperar o debounce.
+        """
+        self.ready.wait()
+        with self.condition:
+            relative_paths, self.pending = self.pending, set()
+        if not relative_paths or not self.built:
+            # Sem o hashmap inicial não há base para aplicar as mudanças; o próximo snapshot recalcula tudo
+            return
+        with self.lock:
+            modified, changed = self._refresh(relative_paths)
+            if modified:
+                self._persist(changed)
+
+    def poll(self):
+        """
+        Compara o stat de todos os arquivos com o último estado conhecido (usado sem o watchdog).
+        """
+        entries = self._walk("")
+        with self.lock:
+            removed = [key for key in self.keys if key not in entries]
+            for key in removed:
+                self._remove(key)
+            changed = self._update(entries)
+            if set(changed) - {HashMap.HASHMAP_FILE_NAME} or set(removed) - {HashMap.HASHMAP_FILE_NAME}:
+                self._persist(changed)
+
+    def snapshot(self, algorithm=None):
+        """
+        Retorna o hashmap atual da pasta, processando antes as mudanças ainda pendentes.
+
+        :param algorithm: Algoritmo exigido; se for outro, o hashmap é recalculado com ele.
+        :return: Um dicionário {caminho relativo: hash}.
+        """
+        self.ready.wait()
+        if not self.built:
+            self._rebuild(algorithm or self.local.algorithm)
+        elif algorithm and algorithm != self.local.algorithm:
+            self.logger.info(f"Rebuilding watched hashmap with {algorithm}")
+            self._rebuild(algorithm)
+        if self.observer is None:
+            self.poll()
+        else:
+            self._barrier()
+            self.flush()
+        with self.lock:
+            return dict(self.local.hashmap)
@@ -19,7 +19,7 @@ from src.modpack import Modpack
 from src.infos import Infos
 from views.modpack_config import ModpackConfigWindow
 from views.config import Config as ConfigView
-from src.tools import (Converter, Resources)
+from src.tools import (Converter, Resources, ContentStore)
 
 class GameThread(QThread):
     finished = pyqtSignal()
@@ -202,7 +202,7 @@ class MenuView(QWidget):
             selected_item = selected_items[0]  # Use o primeiro item selecionado, se houver
             modpack:Modpack = self.modpacks_map[selected_item.data(Qt.ItemDataRole.UserRole)]  # Obtém o objeto Modpack associado ao item
             try:
-                shutil.rmtree(modpack.folder_path)
+                ContentStore.remove_tree(modpack.folder_path)
                 logging.info(f"Folder '{modpack.folder_path}' and its contents have been removed recursively.")
             except Exception as e:
                 logging.error(f"An error occurred while removing the folder: {e}")
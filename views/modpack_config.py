@@ -39,6 +39,9 @@ class ModpackConfigWindow(QDialog):
         super().__init__()
         self.modpack = modpack
         self.initUi()
+        # Enquanto a janela estiver aberta o hashmap acompanha as mudanças na pasta ([HASH] watch)
+        self.modpack.start_watcher()
+        self.finished.connect(self.modpack.stop_watcher)
 
     def button_size_rule(self, button:QPushButton):
         button.setMinimumWidth(180 * ModpackConfigWindow.BUTTON_SCALE)
@@ -238,7 +241,11 @@ class ModpackConfigWindow(QDialog):
             self.modpack.disable_mod(mod_name.replace(' - Incomplete',""))
     
     def update_mods_list(self):
-        all_mods = sorted(self.modpack.get_enabled_mods() + self.modpack.get_disabled_mods(), key=lambda mod: mod.name)
+        enabled_mods = self.modpack.get_enabled_mods()
+        all_mods = sorted(enabled_mods + self.modpack.get_disabled_mods(), key=lambda mod: mod.name)
+        enabled_names = {mod.parent_folder_name for mod in enabled_mods}
+        # Uma única verificação de dependências para a lista inteira
+        report = self.modpack.check_dependencies(enabled_mods)
         self.mods_list_widget.clear()
         
         for mod in all_mods:
@@ -246,9 +253,9 @@ class ModpackConfigWindow(QDialog):
             item.setData(Qt.ItemDataRole.UserRole, mod)
             item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
 
-            if mod.parent_folder_name in self.modpack.list_enabled_mods():
+            if mod.parent_folder_name in enabled_names:
                 item.setCheckState(Qt.CheckState.Checked)
-                dependencies_complete = self.modpack.mod_dependencies_complete(mod)
+                dependencies_complete = self.modpack.mod_dependencies_complete(mod, report)
                 if not dependencies_complete:
                     brush = QBrush(QColor.fromRgb(255, 200, 200))  # Criando um pincel com a cor de fundo vermelho claro
                     item.setText(f"{mod.parent_folder_name} - Incomplete")
@@ -292,30 +299,33 @@ class ModpackConfigWindow(QDialog):
                 QMessageBox.critical(self, "Erro", "A imagem selecionada não é válida.")
 
     def confirm_changes(self):
-        # Atualize os mods habilitados/desabilitados com base nas caixas de seleção
-        for row in range(self.mods_list_widget.count()):
-            item = self.mods_list_widget.item(row)
-            mod_name = item.text()
-            if item.checkState() == Qt.CheckState.Checked:
-                self.modpack.enable_mod(mod_name.replace(' - Incomplete',""))
-            else:
-                self.modpack.disable_mod(mod_name.replace(' - Incomplete',""))
-
-        # Atualize o nome e a imagem da modpack
-        new_name = self.name_edit.text()
-
-        if new_name != self.modpack.name:
-            self.modpack.rename_modpack(new_name)
+        # Atualize o nome e a imagem da modpack; se a gravação falhar, os valores anteriores voltam
+        previous_name, previous_image = self.modpack.name, self.modpack.image
         if self.image:
             self.modpack.image = self.image
-        
-        self.modpack.name = new_name
-        self.modpack.save()
+        self.modpack.name = self.name_edit.text()
+
+        # Atualize os mods habilitados/desabilitados com base nas caixas de seleção, gravando o modpack.json uma vez só
+        states = {}
+        for row in range(self.mods_list_widget.count()):
+            item = self.mods_list_widget.item(row)
+            states[item.text().replace(' - Incomplete',"")] = item.checkState() == Qt.CheckState.Checked
+        try:
+            if not self.modpack.set_enabled(states):
+                self.modpack.save()
+        except OSError as e:
+            self.modpack.name, self.modpack.image = previous_name, previous_image
+            QMessageBox.critical(self, "Erro", f"Não foi possível aplicar as mudanças nos mods: {e}")
+            self.update_mods_list()
+            return
 
         self.close()
 
     def enable_all_mods(self):
-        self.modpack.enable_all_mods()
+        try:
+            self.modpack.set_enabled(dict.fromkeys(self.modpack.list_disabled_mods(), True))
+        except OSError as e:
+            QMessageBox.critical(self, "Erro", f"Não foi possível habilitar os mods: {e}")
         self.update_mods_list()  # Atualiza a lista de mods
         
     def disable_all_mods(self):